@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+HOLE 파이프라인 벤치마크
+=======================
+example/ 구조들에 대해 전체 파이프라인을 반복 실행하여 단계별 시간을 측정하고,
+중앙값 / 백분위수를 보고하며 저장된 기준(baseline)과 비교하여 성능 저하를 검출
+
+- 측정은 run_full_analysis의 단계별 기록(hole_metrics)을 그대로 사용하므로
+  파이프라인 코드와 같은 구간을 잽니다:
+  hole (filter, axis, run, parse), plot (plot, profile),
+  pymol (surface, qpt, pdb, pml), render (layers, composite), finalize
+- 매 반복은 결과 캐시 없이 빈 작업 디렉토리에서 실행
+- 결과 / 기준은 JSON 파일 (구조 → 단계 → 반복별 시간 목록 + 실행 환경)
+
+사용 예시:
+---------
+python hole_benchmark.py                                  # example/*.pdb, 3회 반복
+python hole_benchmark.py example/opm_*.pdb --repeat 5 --save bench/baseline.json
+python hole_benchmark.py --baseline bench/baseline.json   # 기준 대비 비교 (저하 시 종료 코드 1)
+
+from hole_benchmark import run_benchmark, summarize, compare_to_baseline
+
+bench = run_benchmark(["example/opm_1bl8_gramicidin.pdb"], repeat=3)
+summary = summarize(bench)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from hole_runner import run_full_analysis, expand_batch_entries, resolve_radius_file
+
+# 기본 벤치마크 구조 (저장소에 포함된 예제 채널)
+DEFAULT_STRUCTURES = [str(Path(__file__).parent / "example" / "*.pdb")]
+
+# 보고할 백분위수
+PERCENTILES = (10, 90)
+
+# 기준 대비 중앙값이 TOLERANCE 비율 이상, MIN_DELTA 초 이상 늘어나면 성능 저하
+TOLERANCE = 0.10
+MIN_DELTA = 0.01
+
+
+def flatten_metrics(metrics, prefix=''):
+    """
+    run_full_analysis 'metrics' → {단계 이름: 벽시계 시간}
+
+    안쪽 단계는 'hole.filter', 'pymol.surface'처럼 바깥 단계 이름을 붙이고,
+    전체 합은 'total'로 기록합니다.
+    """
+    times = {}
+    for record in metrics:
+        name = f"{prefix}{record['stage']}"
+        times[name] = times.get(name, 0.0) + record['wall']
+        times.update(flatten_metrics(record['steps'], prefix=f"{name}."))
+    if not prefix:
+        times['total'] = sum(record['wall'] for record in metrics)
+    return times
+
+
+def environment_info():
+    """벤치마크 실행 환경 (기준 비교 시 다른 환경이면 경고)"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__
+    }
+
+
+def run_benchmark(structures=None, repeat=3, warmup=1, work_dir=None, **options):
+    """
+    구조별로 전체 파이프라인을 반복 실행하여 단계별 시간 수집
+
+    Parameters
+    ----------
+    structures : list, optional
+        PDB 경로 / glob 패턴 / YAML 항목 목록 (expand_batch_entries 형식, 기본: example/*.pdb)
+    repeat : int
+        구조별 측정 반복 수
+    warmup : int
+        측정 전 첫 구조로 실행할 횟수 (모듈 import, PyMOL 세션 준비 시간 제외)
+    work_dir : str, optional
+        실행 디렉토리 (기본: 임시 디렉토리, 끝나면 삭제)
+    **options
+        run_full_analysis 인자 (endrad, radius_file, surface_engine, render_engine ...)
+        cvect / cpoint는 CLI와 같이 기본 'auto'
+
+    Returns
+    -------
+    dict
+        - 'environment': dict - environment_info()
+        - 'repeat': int, 'options': dict
+        - 'structures': {구조 이름: {단계 이름: [반복별 시간 (초)]}}
+        - 'failures': {구조 이름: 실패한 반복 수}
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    options['cache'] = None
+    options.setdefault('cvect', 'auto')
+    options.setdefault('cpoint', 'auto')
+    temp_dir = None
+    if work_dir is None:
+        work_dir = temp_dir = tempfile.mkdtemp(prefix="hole_bench_")
+
+    entries = expand_batch_entries(structures or DEFAULT_STRUCTURES, work_dir=work_dir, **options)
+    bench = {
+        'environment': environment_info(),
+        'repeat': repeat,
+        'options': {key: value for key, value in options.items() if key != 'cache'},
+        'structures': {},
+        'failures': {}
+    }
+
+    def run_once(entry):
+        shutil.rmtree(entry['work_dir'], ignore_errors=True)
+        Path(entry['work_dir']).mkdir(parents=True, exist_ok=True)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return run_full_analysis(**entry)
+
+    try:
+        if entries and warmup:
+            print(f"준비 실행 {warmup}회: {entries[0]['output_prefix']}")
+            for _ in range(warmup):
+                run_once(entries[0])
+
+        for entry in entries:
+            name = entry['output_prefix']
+            samples = bench['structures'].setdefault(name, {})
+            for i in range(repeat):
+                result = run_once(entry)
+                if not result.get('success'):
+                    bench['failures'][name] = bench['failures'].get(name, 0) + 1
+                for stage, wall in flatten_metrics(result.get('metrics') or []).items():
+                    samples.setdefault(stage, []).append(round(wall, 6))
+            total = np.median(samples['total']) if samples.get('total') else float('nan')
+            status = "✓" if name not in bench['failures'] else f"✗ 실패 {bench['failures'][name]}회"
+            print(f"  {status} {name}: 중앙값 {total:.3f}s ({repeat}회)")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return bench
+
+
+def summarize(bench):
+    """
+    반복별 시간 → 통계
+
+    Returns
+    -------
+    dict
+        {구조 이름: {단계 이름: {'n', 'median', 'p10', 'p90', 'min', 'max'}}}
+    """
+    summary = {}
+    for name, samples in bench['structures'].items():
+        summary[name] = {}
+        for stage, times in samples.items():
+            times = np.asarray(times, dtype=float)
+            stats = {'n': len(times), 'median': float(np.median(times))}
+            for q in PERCENTILES:
+                stats[f"p{q}"] = float(np.percentile(times, q))
+            stats['min'], stats['max'] = float(times.min()), float(times.max())
+            summary[name][stage] = stats
+    return summary
+
+
+def compare_to_baseline(bench, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    """
+    구조 / 단계별 중앙값을 기준과 비교
+
+    Parameters
+    ----------
+    bench, baseline : dict
+        run_benchmark 결과 (baseline은 저장된 JSON)
+    tolerance : float
+        허용 증가 비율 (0.10 = 10%)
+    min_delta : float
+        허용 증가 시간 (초) - 짧은 단계의 측정 잡음 무시
+
+    Returns
+    -------
+    list of dict
+        'structure', 'stage', 'baseline', 'current' (중앙값, 초), 'ratio',
+        'status' ('regression' | 'improved' | 'ok' | 'new' | 'missing')
+    """
+    current, reference = summarize(bench), summarize(baseline)
+    rows = []
+    for name in sorted(set(current) | set(reference)):
+        stages = set(current.get(name, {})) | set(reference.get(name, {}))
+        for stage in sorted(stages):
+            now = current.get(name, {}).get(stage)
+            base = reference.get(name, {}).get(stage)
+            row = {'structure': name, 'stage': stage,
+                   'baseline': base['median'] if base else None,
+                   'current': now['median'] if now else None, 'ratio': None}
+            if base is None:
+                row['status'] = 'new'
+            elif now is None:
+                row['status'] = 'missing'
+            else:
+                delta = now['median'] - base['median']
+                row['ratio'] = now['median'] / base['median'] if base['median'] > 0 else None
+                if delta > max(min_delta, tolerance * base['median']):
+                    row['status'] = 'regression'
+                elif -delta > max(min_delta, tolerance * base['median']):
+                    row['status'] = 'improved'
+                else:
+                    row['status'] = 'ok'
+            rows.append(row)
+    return rows
+
+
+def print_summary(bench):
+    """구조 / 단계별 중앙값과 백분위수 표 출력"""
+    low, high = PERCENTILES
+    print(f"\n{'구조':<24} {'단계':<18} {'중앙값':>9} {f'p{low}':>9} {f'p{high}':>9} {'최대':>9}")
+    print("-" * 84)
+    for name, stages in summarize(bench).items():
+        for stage, stats in stages.items():
+            print(f"{name:<24} {stage:<18} {stats['median']:9.4f} {stats[f'p{low}']:9.4f} "
+                  f"{stats[f'p{high}']:9.4f} {stats['max']:9.4f}")
+
+
+def print_comparison(rows):
+    """기준 대비 변화 출력 (변화가 있는 단계만)"""
+    marks = {'regression': '✗ 저하', 'improved': '✓ 개선', 'new': '+ 새 단계', 'missing': '- 없음'}
+    changed = [row for row in rows if row['status'] != 'ok']
+    print(f"\n기준 대비: 저하 {sum(r['status'] == 'regression' for r in rows)}, "
+          f"개선 {sum(r['status'] == 'improved' for r in rows)}, "
+          f"변화 없음 {sum(r['status'] == 'ok' for r in rows)}")
+    for row in changed:
+        base = f"{row['baseline']:.4f}s" if row['baseline'] is not None else '-'
+        now = f"{row['current']:.4f}s" if row['current'] is not None else '-'
+        ratio = f" ({row['ratio']:.2f}배)" if row['ratio'] else ''
+        print(f"  {marks[row['status']]:<8} {row['structure']} {row['stage']}: {base} → {now}{ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='HOLE 파이프라인 단계별 벤치마크 (example/ 구조 반복 실행)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  # 기준 저장
+  python hole_benchmark.py --repeat 5 --save bench/baseline.json
+
+  # 변경 후 기준과 비교 (성능 저하가 있으면 종료 코드 1)
+  python hole_benchmark.py --repeat 5 --baseline bench/baseline.json
+
+  # 일부 구조만, PyMOL 없이 NumPy 표면 생성
+  python hole_benchmark.py "example/opm_*.pdb" --surface-engine numpy
+        """
+    )
+    parser.add_argument('structures', nargs='*', help='PDB 파일 경로 또는 glob 패턴 (기본: example/*.pdb)')
+    parser.add_argument('--repeat', '-n', type=int, default=3, help='구조별 반복 수 (기본: 3)')
+    parser.add_argument('--warmup', type=int, default=1, help='측정 전 준비 실행 수 (기본: 1)')
+    parser.add_argument('--endrad', type=float, default=5.0, help='채널 종료 반지름 (기본: 5.0)')
+    parser.add_argument('--radius-file', default=None, help='반지름 파일 (rad/ 기준, 기본: simple.rad)')
+    parser.add_argument('--surface-engine', choices=['sph_process', 'numpy'], default='sph_process',
+                        help='기공 표면 점 생성 엔진 (기본: sph_process)')
+    parser.add_argument('--render-engine', default='auto', help='PyMOL PNG 렌더링 엔진 (기본: auto)')
+    parser.add_argument('--save', metavar='JSON', help='측정 결과를 JSON 파일로 저장 (다음 비교의 기준)')
+    parser.add_argument('--baseline', metavar='JSON', help='비교할 기준 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f'성능 저하로 판단할 중앙값 증가 비율 (기본: {TOLERANCE})')
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA,
+                        help=f'성능 저하로 판단할 최소 증가 시간, 초 (기본: {MIN_DELTA})')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HOLE 파이프라인 벤치마크")
+    print("=" * 60)
+
+    start = time.time()
+    bench = run_benchmark(
+        args.structures or None,
+        repeat=max(1, args.repeat),
+        warmup=max(0, args.warmup),
+        endrad=args.endrad,
+        radius_file=resolve_radius_file(args.radius_file),
+        surface_engine=args.surface_engine,
+        render_engine=args.render_engine
+    )
+    if not bench['structures']:
+        print("✗ 벤치마크할 PDB 파일이 없습니다.")
+        sys.exit(1)
+    print(f"\n소요 시간: {time.time() - start:.1f}s")
+
+    print_summary(bench)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(bench, f, indent=1, ensure_ascii=False)
+        print(f"\n✓ 결과 저장: {args.save}")
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != bench['environment']:
+            print("\nWarning: 기준과 실행 환경이 다릅니다 (Python / CPU / 플랫폼) - 비교 결과에 주의하세요.")
+        if baseline.get('options') != bench['options']:
+            print("\nWarning: 기준과 실행 옵션이 다릅니다 (endrad / 엔진 ...) - 비교 결과에 주의하세요.")
+        rows = compare_to_baseline(bench, baseline, tolerance=args.tolerance, min_delta=args.min_delta)
+        print_comparison(rows)
+        regressions = sum(row['status'] == 'regression' for row in rows)
+
+    sys.exit(1 if regressions or bench['failures'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,17 +20,205 @@ if result['success']:
 
 import subprocess
 import os
+import sys
+import threading
 from pathlib import Path
-import re
+
+# scripts/ 디렉토리의 보조 모듈 (hole_output, hole_plot, hole_pymol)
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from hole_output import parse_hole_file, as_hole_output, save_profile, load_profile
+from hole_cache import ResultCache, hole_cache_key, derive_key, DEFAULT_MAX_BYTES as DEFAULT_CACHE_MAX_BYTES
+from hole_render import (render_layer_images, composite_layers, save_image, RENDER_ENGINES,
+                         IMAGE_FORMATS, PNG_COMPRESS_LEVEL, IMAGE_QUALITY)
+from hole_lod import lod_settings, normalize_lod, LOD_PRESETS
+from hole_pdb import AtomTable, read_pdb, selection_mask, write_pdb
+from hole_metrics import measure, run_process, record_outputs, format_metrics, write_metrics_jsonl
+from hole_manifest import RunManifest, stage_key, hash_file
 
 # HOLE 프로그램 경로 설정
 HOLE_EXE = os.path.expanduser("~/MODEL/hole2/exe/hole")
 HOLE_RAD = os.path.expanduser("~/MODEL/hole2/rad/simple.rad")
+HOLE_RAD_DIR = os.path.expanduser("~/MODEL/hole2/rad")
+
+# 기본 무시 잔기 목록 (물, 용매, 이온)
+DEFAULT_IGNORE_RESIDUES = ['HOH', 'SOL', 'NA', 'K', 'CL', 'CA', 'MG']
+
+
+def build_hole_input(coord_file, radius_file, endrad, sph_name=None, source_name=None,
+                     ignore_residues=None, cvect=None, cpoint=None, additional_cards=None,
+                     sample=None):
+    """
+    HOLE 입력 카드 문자열 생성
+
+    Parameters
+    ----------
+    coord_file : str
+        HOLE이 읽을 (필터링된) PDB 파일 경로
+    radius_file : str
+        반지름 파일 경로
+    endrad : float
+        채널 종료 반지름 (Angstrom)
+    sph_name : str, optional
+        구 중심 PDB 파일 이름 (None이면 sphpdb 카드 생략)
+    source_name : str, optional
+        주석에 기록할 원본 PDB 파일 이름
+    ignore_residues : list of str, optional
+        IGNORE 카드로 추가할 잔기 (None이면 기본 목록)
+    cvect, cpoint : list of float, optional
+        채널 방향 벡터 / 시작점
+    additional_cards : dict, optional
+        추가 HOLE 입력 카드
+    sample : float, optional
+        채널 축 방향 샘플링 간격 (Angstrom, None이면 HOLE 기본값 0.25)
+
+    Returns
+    -------
+    str
+        HOLE 입력 파일 내용
+    """
+    input_content = "! HOLE input file generated by Python\n"
+    input_content += f"! Analysis of: {source_name or Path(coord_file).name}\n"
+    input_content += f"coord {coord_file}\n"
+    input_content += f"radius {radius_file}\n"
+    if sph_name:
+        input_content += f"sphpdb {sph_name}\n"
+    input_content += f"endrad {endrad}\n"
+    if sample:
+        input_content += f"sample {sample}\n"
+
+    # cvect (채널 방향 벡터) 추가
+    if cvect:
+        input_content += f"CVECT {cvect[0]:.4f} {cvect[1]:.4f} {cvect[2]:.4f}\n"
+
+    # cpoint (채널 시작점) 추가
+    if cpoint:
+        input_content += f"CPOINT {cpoint[0]:.4f} {cpoint[1]:.4f} {cpoint[2]:.4f}\n"
+
+    # 기본 무시 잔기 목록 (yml 설정 또는 기본값)
+    if ignore_residues is None:
+        ignore_residues = DEFAULT_IGNORE_RESIDUES
+
+    # 무시할 잔기 추가
+    for residue in ignore_residues:
+        input_content += f"IGNORE {residue}\n"
+
+    # 추가 카드 삽입
+    if additional_cards:
+        for key, value in additional_cards.items():
+            input_content += f"{key} {value}\n"
+
+    return input_content
+
+
+def _hole_remove_set(ignore_residues):
+    """
+    PDB 필터링 규칙 생성
+
+    Returns
+    -------
+    tuple
+        (제거할 잔기 이름 set, HETATM 전체 제거 여부)
+    """
+    # 제거할 원자/잔기 목록 (기본값 + yml 설정에서 지정한 ignore 목록)
+    # ignore_residues에 YAML의 ignore 목록이 들어옵니다
+    if ignore_residues is None:
+        ignore_residues = DEFAULT_IGNORE_RESIDUES
+
+    remove_set = set(['DUM'])  # 기본적으로 DUM은 항상 제거
+    remove_all_hetatm = False  # HETATM 전체 제거 플래그
+
+    # HETATM 특수 키워드 확인
+    if 'HETATM' in ignore_residues:
+        remove_all_hetatm = True
+    remove_set.update(r for r in ignore_residues if r != 'HETATM')
+
+    return remove_set, remove_all_hetatm
+
+
+def _write_filtered_pdb(pdb_path, pdb_copy, ignore_residues, atom_table=None):
+    """
+    PDB를 한 번 읽어 원자 테이블로 변환 후 선택 마스크를 적용하여 한 번의 쓰기로 저장
+
+    Returns
+    -------
+    tuple
+        (AtomTable, 유지할 원자 마스크 (N,))
+    """
+    remove_set, remove_all_hetatm = _hole_remove_set(ignore_residues)
+
+    with measure('filter'):
+        if atom_table is None:
+            atom_table = read_pdb(pdb_path)
+        keep, hetatm_count, removed_types = selection_mask(atom_table, remove_set, remove_all_hetatm)
+        write_pdb(atom_table, pdb_copy, keep)
+
+    # 제거 정보 출력
+    if remove_all_hetatm and hetatm_count > 0:
+        print(f"  Warning: 모든 HETATM 라인 제거됨 ({hetatm_count}개)")
+    if removed_types:
+        print(f"  Warning: {len(removed_types)}종 원자/잔기 제거됨: {', '.join(sorted(removed_types))}")
+
+    return atom_table, keep[atom_table.atom_index]
+
+
+def resolve_channel_axis(atom_table, atom_mask, cvect, cpoint, endrad=None):
+    """
+    'auto'로 지정된 채널 방향 / 시작점을 원자 좌표에서 탐지 (hole_axis.py)
+
+    cvect만 지정된 경우 그 축 위에서 시작점만 찾고,
+    cpoint만 지정된 경우 그 점을 중심으로 축을 찾습니다.
+    터널을 찾지 못하면 Z축 / HOLE 기본 시작점을 사용합니다.
+
+    Parameters
+    ----------
+    atom_table : AtomTable
+        입력 PDB 원자 테이블
+    atom_mask : np.ndarray
+        탐지에 사용할 원자 마스크 (무시할 잔기 제거)
+    cvect, cpoint : list of float, 'auto' or None
+        사용자 지정 값
+    endrad : float, optional
+        HOLE 종료 반지름 (시작점을 endrad보다 좁은 기공 구간에 두기 위해 사용)
+
+    Returns
+    -------
+    tuple
+        (cvect, cpoint, 탐지 결과 dict 또는 None)
+    """
+    if cvect != 'auto' and cpoint != 'auto':
+        return cvect, cpoint, None
+
+    from hole_axis import detect_channel_axis
+
+    with measure('axis'):
+        detection = detect_channel_axis(
+            atom_table.coords[atom_mask],
+            chains=atom_table.chain[atom_mask],
+            residues=atom_table.resname[atom_mask],
+            membrane=atom_table.coords[atom_table.resname == 'DUM'],
+            candidates=[cvect] if cvect not in ('auto', None) else None,
+            centre=cpoint if cpoint not in ('auto', None) else None,
+            endrad=endrad
+        )
+
+    if detection['success']:
+        print(f"  채널 축 자동 탐지 ({detection['method']}/{detection['anchor']}): "
+              f"CVECT {detection['cvect']}, CPOINT {detection['cpoint']} "
+              f"(터널 {detection['tunnel_length']:.0f} Å)")
+    else:
+        print("  Warning: 채널 축을 찾지 못해 Z축 / HOLE 기본 시작점을 사용합니다.")
+
+    if cvect == 'auto':
+        cvect = detection['cvect']
+    if cpoint == 'auto':
+        cpoint = detection['cpoint']
+    return cvect, cpoint, detection
 
 
 def run_hole(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
              radius_file=None, additional_cards=None, ignore_residues=None,
-             cvect=None, cpoint=None):
+             cvect=None, cpoint=None, cache=None, atom_table=None, sample=None):
     """
     HOLE 프로그램을 실행하는 함수
 
@@ -50,6 +238,14 @@ def run_hole(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
         다른 옵션: amberuni.rad, bondi.rad, hardcore.rad, xplor.rad
     additional_cards : dict, optional
         추가 HOLE 입력 카드 (예: {'cvect': '0 0 1'})
+    cvect, cpoint : list of float or 'auto', optional
+        채널 방향 벡터 / 시작점 - 'auto'이면 원자 좌표에서 자동 탐지 (resolve_channel_axis)
+    cache : ResultCache, optional
+        결과 캐시 (hole_cache.ResultCache) - 같은 좌표/입력 카드면 HOLE 실행 생략
+    atom_table : AtomTable, optional
+        이미 읽은 pdb_file의 원자 테이블 (hole_pdb.read_pdb) - None이면 새로 읽음
+    sample : float, optional
+        채널 축 방향 샘플링 간격 (Angstrom, 기본값: HOLE 기본 0.25)
 
     Returns
     -------
@@ -61,6 +257,12 @@ def run_hole(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
         - 'input_file': str - 입력 파일 경로
         - 'stderr': str - 표준 에러 출력
         - 'min_radius': float - 최소 기공 반지름 (성공 시)
+        - 'hole_output': HoleOutput - 파싱된 출력 (성공 시)
+        - 'atom_table': AtomTable - 입력 PDB 원자 테이블 (이후 단계에서 재사용)
+        - 'cvect', 'cpoint': list of float - HOLE에 전달한 채널 방향 / 시작점
+        - 'axis_detection': dict - 자동 탐지 결과 (hole_axis.detect_channel_axis, 'auto' 사용 시)
+        - 'cache_key': str - 캐시 키 (cache 사용 시)
+        - 'cache_hit': bool - 캐시에서 복원 여부
 
     Examples
     --------
@@ -93,86 +295,57 @@ def run_hole(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
     sph_file = work_path / f"{output_prefix}.sph"
     pdb_copy = work_path / f"{output_prefix}.pdb"
 
-    # HOLE 입력 카드 작성
-    input_content = f"""! HOLE input file generated by Python
-! Analysis of: {pdb_path.name}
-coord {pdb_copy}
-radius {radius_file}
-sphpdb {sph_file.name}
-endrad {endrad}
-"""
-
-    # cvect (채널 방향 벡터) 추가
-    if cvect:
-        input_content += f"CVECT {cvect[0]:.4f} {cvect[1]:.4f} {cvect[2]:.4f}\n"
-
-    # cpoint (채널 시작점) 추가
-    if cpoint:
-        input_content += f"CPOINT {cpoint[0]:.4f} {cpoint[1]:.4f} {cpoint[2]:.4f}\n"
-
-    # 기본 무시 잔기 목록 (yml 설정 또는 기본값)
-    if ignore_residues is None:
-        ignore_residues = ['HOH', 'SOL', 'NA', 'K', 'CL', 'CA', 'MG']
+    # 입력 PDB 파일 복사 및 불필요한 원자 제거
+    atom_table, atom_mask = _write_filtered_pdb(pdb_path, pdb_copy, ignore_residues, atom_table)
 
-    # 무시할 잔기 추가
-    for residue in ignore_residues:
-        input_content += f"IGNORE {residue}\n"
+    # 채널 축 / 시작점 자동 탐지 (필터링된 원자 좌표 사용)
+    cvect, cpoint, axis_detection = resolve_channel_axis(atom_table, atom_mask,
+                                                         cvect, cpoint, endrad=endrad)
 
-    # 추가 카드 삽입
-    if additional_cards:
-        for key, value in additional_cards.items():
-            input_content += f"{key} {value}\n"
+    # HOLE 입력 카드 작성
+    input_content = build_hole_input(
+        pdb_copy, radius_file, endrad,
+        sph_name=sph_file.name,
+        source_name=pdb_path.name,
+        ignore_residues=ignore_residues,
+        cvect=cvect,
+        cpoint=cpoint,
+        additional_cards=additional_cards,
+        sample=sample
+    )
 
     with open(input_file, 'w') as f:
         f.write(input_content)
 
-    # 입력 PDB 파일 복사 및 불필요한 원자 제거
-    import shutil
-
-    # 제거할 원자/잔기 목록 (기본값 + yml 설정에서 지정한 ignore 목록)
-    # ignore_residues에 YAML의 ignore 목록이 들어옵니다
-    remove_set = set(['DUM'])  # 기본적으로 DUM은 항상 제거
-    remove_all_hetatm = False  # HETATM 전체 제거 플래그
-
-    if ignore_residues:
-        # HETATM 특수 키워드 확인
-        if 'HETATM' in ignore_residues:
-            remove_all_hetatm = True
-            ignore_residues = [r for r in ignore_residues if r != 'HETATM']
-        remove_set.update(ignore_residues)
-
-    removed_types = set()
-    hetatm_count = 0
-    with open(pdb_path, 'r') as f_in, open(pdb_copy, 'w') as f_out:
-        for line in f_in:
-            # HETATM 전체 제거 옵션이 활성화된 경우
-            if remove_all_hetatm:
-                # HETATM 라인과 관련 헤더 라인도 제거
-                if line.startswith(('HETATM', 'HET', 'HETNAM', 'FORMUL', 'HETSYN')):
-                    hetatm_count += 1
-                    continue
-
-            # ATOM 또는 HETATM 라인에서 특정 원자 제거
-            if line.startswith(('ATOM', 'HETATM')):
-                atom_name = line[12:16].strip()
-                res_name = line[17:20].strip()
-                # 제거할 원자/잔기 스킵 (residue name만 체크)
-                # atom_name은 CA(알파 탄소) 등 단백질 구조 원자와 충돌할 수 있으므로 제외
-                if res_name in remove_set:
-                    removed_types.add(res_name)
-                    continue
-            f_out.write(line)
-
-    # 제거 정보 출력
-    if remove_all_hetatm and hetatm_count > 0:
-        print(f"  Warning: 모든 HETATM 라인 제거됨 ({hetatm_count}개)")
-    if removed_types:
-        print(f"  Warning: {len(removed_types)}종 원자/잔기 제거됨: {', '.join(sorted(removed_types))}")
+    # 캐시 확인 (필터링된 좌표 + 입력 카드 해시)
+    cache_key = None
+    if cache is not None:
+        cache_key = hole_cache_key(pdb_copy, input_content, radius_file)
+        restored = cache.restore(cache_key, {'output': output_file, 'sph': sph_file})
+        if restored and 'output' in restored['files']:
+            print(f"  캐시 적중: HOLE 실행 건너뜀 (key {cache_key[:12]})")
+            hole_output = parse_hole_file(output_file)
+            return {
+                'success': True,
+                'output_file': str(output_file),
+                'sph_file': str(sph_file),
+                'pdb_file': str(pdb_copy),
+                'input_file': str(input_file),
+                'stderr': '',
+                'min_radius': hole_output.min_radius,
+                'hole_output': hole_output,
+                'atom_table': atom_table,
+                'cvect': cvect,
+                'cpoint': cpoint,
+                'axis_detection': axis_detection,
+                'cache_key': cache_key,
+                'cache_hit': True
+            }
 
     # HOLE 실행
     try:
-        with open(input_file, 'r') as inp, open(output_file, 'w') as out:
-            result = subprocess.run(
+        with open(input_file, 'r') as inp, open(output_file, 'w') as out, measure('run'):
+            result = run_process(
                 [HOLE_EXE],
                 stdin=inp,
                 stdout=out,
@@ -184,14 +357,18 @@ endrad {endrad}
 
         success = result.returncode == 0
 
-        # 최소 반지름 추출
+        # 출력 파일 파싱 (한 번만 - 이후 단계는 hole_output을 재사용)
+        hole_output = None
         min_radius = None
         if success and output_file.exists():
-            with open(output_file, 'r') as f:
-                content = f.read()
-                match = re.search(r'Minimum radius found:\s+([\d.]+)', content)
-                if match:
-                    min_radius = float(match.group(1))
+            with measure('parse'):
+                hole_output = parse_hole_file(output_file)
+            min_radius = hole_output.min_radius
+
+            # 정상 완료된 결과만 캐시에 등록
+            if cache is not None and hole_output.completed and len(hole_output) > 0:
+                cache.store(cache_key, {'output': output_file, 'sph': sph_file},
+                            meta={'pdb_file': str(pdb_path)})
 
         return {
             'success': success,
@@ -200,7 +377,14 @@ endrad {endrad}
             'pdb_file': str(pdb_copy),
             'input_file': str(input_file),
             'stderr': result.stderr,
-            'min_radius': min_radius
+            'min_radius': min_radius,
+            'hole_output': hole_output,
+            'atom_table': atom_table,
+            'cvect': cvect,
+            'cpoint': cpoint,
+            'axis_detection': axis_detection,
+            'cache_key': cache_key,
+            'cache_hit': False
         }
 
     except subprocess.TimeoutExpired:
@@ -209,22 +393,417 @@ endrad {endrad}
         return {'success': False, 'error': str(e)}
 
 
+def _run_hole_start(index, output_prefix, start_path, input_content, cvect, cpoint):
+    """
+    다중 시작점 워커: 후보 (cvect, cpoint) 하나로 HOLE 실행 후 경로 점수 계산
+
+    _run_hole_frame과 같이 후보마다 별도 디렉토리(start_path)에서 실행합니다
+    (sr_gseed_tempfile 충돌 방지). 점수는 run_hole_multistart에서 공통 기준 축으로 계산합니다.
+    """
+    from hole_surface import read_sph_spheres
+
+    input_file = start_path / f"{output_prefix}.inp"
+    output_file = start_path / f"{output_prefix}_out.txt"
+    sph_file = start_path / f"{output_prefix}.sph"
+
+    with open(input_file, 'w') as f:
+        f.write(input_content)
+
+    start = {'index': index, 'success': False, 'cvect': cvect, 'cpoint': cpoint,
+             'input_file': input_file, 'output_file': output_file, 'sph_file': sph_file}
+    try:
+        with open(input_file, 'r') as inp, open(output_file, 'w') as out:
+            proc = run_process(
+                [HOLE_EXE],
+                stdin=inp,
+                stdout=out,
+                stderr=subprocess.PIPE,
+                cwd=start_path,
+                text=True,
+                timeout=120
+            )
+
+        parsed = parse_hole_file(output_file) if proc.returncode == 0 else None
+        if parsed is not None and len(parsed) > 0 and sph_file.exists():
+            centres, radii = read_sph_spheres(sph_file)
+            start.update({
+                'success': True,
+                'channel_coord': parsed.channel_coord,
+                'centres': centres,
+                'radii': radii,
+                'min_radius': parsed.min_radius
+            })
+        else:
+            start['error'] = proc.stderr or 'No profile data in HOLE output'
+    except subprocess.TimeoutExpired:
+        start['error'] = 'Timeout (>120s)'
+    except Exception as e:
+        start['error'] = str(e)
+
+    return start
+
+
+def run_hole_multistart(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
+                        radius_file=None, additional_cards=None, ignore_residues=None,
+                        cvect=None, cpoint=None, n_starts=8, max_workers=None,
+                        cache=None, atom_table=None, keep_files=False, sample=None):
+    """
+    여러 시작점 / 축 후보로 HOLE을 동시에 실행하고 가장 좋은 경로만 남기는 run_hole
+
+    기준 축/시작점(지정값 또는 자동 탐지) 주변에 시작점 격자와 축 기울기 후보를 만들어
+    (hole_multistart.start_candidates) 후보마다 {work_dir}/multistart/{prefix}_sNN/ 에서
+    HOLE을 동시에 실행합니다. 경로 길이 / 중심성 / 연속성 점수가 가장 높은 후보의
+    .inp, _out.txt, .sph만 작업 디렉토리로 옮기므로 출력 파일 구성은 run_hole과 같습니다.
+
+    Parameters
+    ----------
+    pdb_file, output_prefix, endrad, work_dir, radius_file, additional_cards,
+    ignore_residues, cvect, cpoint, cache, atom_table, sample
+        run_hole과 동일
+    n_starts : int
+        후보 수 (첫 후보는 기준 축/시작점 그대로)
+    max_workers : int, optional
+        동시 실행 HOLE 프로세스 수 (기본: min(n_starts, CPU 코어 수))
+    keep_files : bool
+        후보별 임시 디렉토리 유지 여부 (기본: 삭제)
+
+    Returns
+    -------
+    dict
+        run_hole 결과와 같은 키 ('cvect', 'cpoint'는 선택된 후보) 및
+        - 'multistart': list of dict - 후보별 'index', 'cvect', 'cpoint', 'success',
+          'min_radius', 'path_length', 'centrality', 'continuity', 'score', 'error'
+        - 'best_start': int - 선택된 후보 번호
+
+    Examples
+    --------
+    >>> result = run_hole_multistart("rcsb_7k3g_out.pdb", endrad=15.0, n_starts=12)
+    >>> [s['score'] for s in result['multistart']]
+    """
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+    from hole_multistart import start_candidates, score_path, select_best
+
+    work_path = Path(work_dir).resolve()
+    work_path.mkdir(parents=True, exist_ok=True)
+
+    pdb_path = Path(pdb_file).resolve()
+    if not pdb_path.exists():
+        return {'success': False, 'error': f'PDB file not found: {pdb_path}'}
+
+    if radius_file is None:
+        radius_file = HOLE_RAD
+    else:
+        radius_file = os.path.expanduser(radius_file)
+
+    input_file = work_path / f"{output_prefix}.inp"
+    output_file = work_path / f"{output_prefix}_out.txt"
+    sph_file = work_path / f"{output_prefix}.sph"
+    pdb_copy = work_path / f"{output_prefix}.pdb"
+
+    # 필터링된 PDB는 한 번만 기록하고 모든 후보가 공유
+    atom_table, atom_mask = _write_filtered_pdb(pdb_path, pdb_copy, ignore_residues, atom_table)
+    cvect, cpoint, axis_detection = resolve_channel_axis(atom_table, atom_mask,
+                                                         cvect, cpoint, endrad=endrad)
+
+    # 기준 축/시작점이 없으면 Z축 / 필터링된 원자 중심 (HOLE 기본 시작점 대신)
+    base_cvect = list(cvect) if cvect else [0.0, 0.0, 1.0]
+    if cpoint:
+        base_cpoint = list(cpoint)
+    else:
+        centre = atom_table.coords[atom_mask].mean(axis=0)
+        base_cpoint = [round(float(x), 4) for x in centre]
+
+    def input_for(start_cvect, start_cpoint):
+        return build_hole_input(
+            pdb_copy, radius_file, endrad,
+            sph_name=sph_file.name,
+            source_name=pdb_path.name,
+            ignore_residues=ignore_residues,
+            cvect=start_cvect,
+            cpoint=start_cpoint,
+            additional_cards=additional_cards,
+            sample=sample
+        )
+
+    result = {
+        'success': True,
+        'output_file': str(output_file),
+        'sph_file': str(sph_file),
+        'pdb_file': str(pdb_copy),
+        'input_file': str(input_file),
+        'stderr': '',
+        'atom_table': atom_table,
+        'axis_detection': axis_detection,
+        'cache_key': None,
+        'cache_hit': False
+    }
+
+    # 캐시 확인 (기준 입력 카드 + 후보 수로 파생한 키, 선택된 후보는 메타데이터로 복원)
+    if cache is not None:
+        base_key = hole_cache_key(pdb_copy, input_for(base_cvect, base_cpoint), radius_file)
+        result['cache_key'] = derive_key(base_key, 'multistart', n_starts)
+        restored = cache.restore(result['cache_key'], {'output': output_file, 'sph': sph_file})
+        if restored and 'output' in restored['files']:
+            print(f"  캐시 적중: 다중 시작점 HOLE 실행 건너뜀 (key {result['cache_key'][:12]})")
+            meta = restored['meta']
+            with open(input_file, 'w') as f:
+                f.write(input_for(meta['cvect'], meta['cpoint']))
+            hole_output = parse_hole_file(output_file)
+            result.update({
+                'min_radius': hole_output.min_radius,
+                'hole_output': hole_output,
+                'cvect': meta['cvect'],
+                'cpoint': meta['cpoint'],
+                'multistart': meta.get('multistart', []),
+                'best_start': meta.get('best_start'),
+                'cache_hit': True
+            })
+            return result
+
+    candidates = start_candidates(base_cvect, base_cpoint, n_starts)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(candidates)))
+
+    print(f"  다중 시작점 HOLE: 후보 {len(candidates)}개, 병렬 작업 수 {max_workers}")
+
+    starts_path = work_path / "multistart"
+    jobs = []
+    for index, (start_cvect, start_cpoint) in enumerate(candidates):
+        start_path = starts_path / f"{output_prefix}_s{index:02d}"
+        start_path.mkdir(parents=True, exist_ok=True)
+        jobs.append((index, output_prefix, start_path,
+                     input_for(start_cvect, start_cpoint), start_cvect, start_cpoint))
+
+    # HOLE은 외부 프로세스이므로 스레드 풀로 동시에 실행
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        starts = list(pool.map(lambda job: _run_hole_start(*job), jobs))
+
+    # 모든 후보를 같은 기준 축/시작점으로 점수화
+    scores = [score_path(start['channel_coord'], start['centres'], start['radii'], base_cvect, base_cpoint)
+              if start['success'] else None for start in starts]
+    best = select_best(scores)
+
+    summary = []
+    for start, score in zip(starts, scores):
+        row = {key: start.get(key) for key in ('index', 'cvect', 'cpoint', 'success', 'min_radius', 'error')}
+        row.update(score or {'path_length': 0.0, 'centrality': 0.0, 'continuity': 0.0, 'score': 0.0})
+        summary.append(row)
+        mark = "✓" if start['success'] else "✗"
+        print(f"    {mark} s{start['index']:02d}: 점수 {row['score']:.3f} "
+              f"(경로 {row['path_length']:.1f} Å, 중심성 {row['centrality']:.2f}, "
+              f"연속성 {row['continuity']:.2f})" + ("  ← 선택" if start['index'] == best else ""))
+
+    try:
+        if best is None:
+            errors = [start.get('error') for start in starts if start.get('error')]
+            result.update({'success': False, 'multistart': summary,
+                           'error': errors[0] if errors else 'No candidate produced a HOLE profile'})
+            return result
+
+        # 최적 후보의 입력/출력만 작업 디렉토리로 이동 (파일 이름은 run_hole과 동일)
+        chosen = starts[best]
+        shutil.move(str(chosen['input_file']), input_file)
+        shutil.move(str(chosen['output_file']), output_file)
+        shutil.move(str(chosen['sph_file']), sph_file)
+    finally:
+        if not keep_files:
+            for job in jobs:
+                shutil.rmtree(job[2], ignore_errors=True)
+            try:
+                starts_path.rmdir()
+            except OSError:
+                pass
+
+    hole_output = parse_hole_file(output_file)
+    result.update({
+        'min_radius': hole_output.min_radius,
+        'hole_output': hole_output,
+        'cvect': chosen['cvect'],
+        'cpoint': chosen['cpoint'],
+        'multistart': summary,
+        'best_start': best
+    })
+
+    if cache is not None and hole_output.completed:
+        cache.store(result['cache_key'], {'output': output_file, 'sph': sph_file},
+                    meta={'pdb_file': str(pdb_path), 'cvect': chosen['cvect'],
+                          'cpoint': chosen['cpoint'], 'best_start': best, 'multistart': summary})
+
+    return result
+
+
+def run_hole_adaptive(pdb_file, output_prefix="hole", endrad=5.0, work_dir=".",
+                      radius_file=None, additional_cards=None, ignore_residues=None,
+                      cvect=None, cpoint=None, sample=None, max_endrad=None, multistart=0,
+                      cache=None, atom_table=None, keep_files=False):
+    """
+    endrad / sample을 프로파일에 맞춰 정하는 run_hole
+
+    1. 큰 sample (COARSE_SAMPLE)과 주어진 endrad(보수적인 값)로 전체 경로 탐색
+       (multistart가 2 이상이면 run_hole_multistart로 축/시작점 선택)
+    2. 경로 양 끝이 단백질 입구에 도달하지 않았으면 (endrad에 걸려 잘림)
+       endrad를 ENDRAD_GROWTH배로 늘려 같은 축/시작점으로 다시 실행 (max_endrad까지)
+    3. 최소 반경 구 중심에서 작은 sample과 endrad = 최소 반경 + 여유로 좁은 구간만 다시 실행
+    4. 전체 경로 프로파일의 좁은 구간을 정밀화 결과로 교체 (hole_adaptive.merge_profiles)
+
+    입구가 처음부터 열려 있으면 HOLE 2회로 끝나며, 각 실행은 결과 캐시를 그대로 사용합니다.
+    작업 디렉토리의 .inp, _out.txt, .sph는 전체 경로 실행 결과이고, 병합된 프로파일은
+    'hole_output'으로 반환되어 그래프 / 프로파일 배열에 사용됩니다.
+
+    Parameters
+    ----------
+    pdb_file, output_prefix, work_dir, radius_file, additional_cards,
+    ignore_residues, cvect, cpoint, cache, atom_table
+        run_hole과 동일
+    endrad : float
+        첫 실행 endrad (Angstrom) - 좁은 채널 기준의 보수적인 값
+    sample : float, optional
+        좁은 구간 정밀화 샘플링 간격 (기본: FINE_SAMPLE)
+    max_endrad : float, optional
+        endrad 상한 (기본: MAX_ENDRAD)
+    multistart : int
+        첫 실행의 시작점/축 후보 수 (2 이상이면 run_hole_multistart 사용)
+    keep_files : bool
+        정밀화 실행 디렉토리({work_dir}/refine/) 유지 여부 (기본: 삭제)
+
+    Returns
+    -------
+    dict
+        run_hole 결과 (전체 경로 실행 파일, 병합된 'hole_output' / 'min_radius',
+        첫 실행의 'multistart' / 'best_start' / 'axis_detection') 및
+        - 'endrad': float - 최종 endrad
+        - 'adaptive': dict - 'passes' (실행별 단계, endrad, sample, 점 수, 입구 도달 여부),
+          'converged' (양쪽 입구 도달 여부), 'refine_range' (정밀화한 채널 좌표 범위)
+
+    Examples
+    --------
+    >>> result = run_hole_adaptive("rcsb_6uz3_piezo1_out.pdb", endrad=5.0)
+    >>> result['endrad'], result['adaptive']['converged']
+    (20.0, True)
+    """
+    import shutil
+    from hole_adaptive import (COARSE_SAMPLE, FINE_SAMPLE, ENDRAD_GROWTH, MAX_ENDRAD,
+                               protein_span, mouth_status, constriction_start, merge_profiles)
+    from hole_surface import read_sph_spheres
+
+    if max_endrad is None:
+        max_endrad = MAX_ENDRAD
+
+    options = dict(output_prefix=output_prefix, work_dir=work_dir, radius_file=radius_file,
+                   additional_cards=additional_cards, ignore_residues=ignore_residues, cache=cache)
+    passes = []
+
+    def record(stage, result, pass_endrad, pass_sample):
+        hole_output = result.get('hole_output')
+        passes.append({'stage': stage, 'endrad': pass_endrad, 'sample': pass_sample,
+                       'points': len(hole_output) if hole_output is not None else 0,
+                       'cache_hit': bool(result.get('cache_hit'))})
+        return result.get('success') and hole_output is not None and len(hole_output) > 0
+
+    # 1. 큰 sample / 보수적인 endrad로 전체 경로 탐색
+    print(f"  적응형 HOLE: endrad {endrad} Å, sample {COARSE_SAMPLE} Å로 첫 실행")
+    if multistart and multistart > 1:
+        result = run_hole_multistart(pdb_file, endrad=endrad, cvect=cvect, cpoint=cpoint,
+                                     n_starts=multistart, atom_table=atom_table,
+                                     sample=COARSE_SAMPLE, keep_files=keep_files, **options)
+    else:
+        result = run_hole(pdb_file, endrad=endrad, cvect=cvect, cpoint=cpoint,
+                          atom_table=atom_table, sample=COARSE_SAMPLE, **options)
+    if not record('coarse', result, endrad, COARSE_SAMPLE):
+        return result
+
+    # 이후 실행은 첫 실행의 축/시작점과 원자 테이블을 그대로 사용
+    cvect, cpoint, atom_table = result['cvect'], result['cpoint'], result['atom_table']
+    # 축/시작점 선택 기록은 첫 실행에만 있으므로 최종 결과로 옮김
+    selection = {key: result[key] for key in ('multistart', 'best_start', 'axis_detection') if key in result}
+    centres, radii = read_sph_spheres(result['sph_file'])
+
+    atom_mask = _atom_selection(atom_table, ignore_residues)[atom_table.atom_index]
+    span = protein_span(atom_table.coords[atom_mask], cvect or [0.0, 0.0, 1.0],
+                        cpoint or centres.mean(axis=0))
+
+    # 2. 입구에 도달할 때까지 endrad 확장
+    while True:
+        low, high = mouth_status(result['hole_output'].channel_coord, span)
+        passes[-1]['mouths'] = [low, high]
+        if (low and high) or endrad >= max_endrad:
+            break
+        endrad = min(max_endrad, endrad * ENDRAD_GROWTH)
+        sides = ', '.join(side for side, reached in (('아래', low), ('위', high)) if not reached)
+        print(f"  입구 미도달 ({sides}) → endrad {endrad} Å로 다시 실행")
+        # HOLE은 같은 이름의 .sph가 있으면 .sph.old로 남기므로 이전 실행 결과를 먼저 삭제
+        Path(result['sph_file']).unlink(missing_ok=True)
+        result = run_hole(pdb_file, endrad=endrad, cvect=cvect, cpoint=cpoint,
+                          atom_table=atom_table, sample=COARSE_SAMPLE, **options)
+        if not record('extend', result, endrad, COARSE_SAMPLE):
+            return result
+        centres, radii = read_sph_spheres(result['sph_file'])
+
+    converged = all(passes[-1]['mouths'])
+    if not converged:
+        print(f"  Warning: endrad 상한 {max_endrad} Å에서도 입구에 도달하지 못했습니다.")
+
+    # 3. 좁은 구간만 작은 sample로 정밀화 (별도 디렉토리 - 전체 경로 파일 유지)
+    coarse = result['hole_output']
+    fine_sample = sample or FINE_SAMPLE
+    start, fine_endrad = constriction_start(coarse, centres, radii)
+    fine = None
+    if start is not None:
+        print(f"  좁은 구간 정밀화: CPOINT {start}, endrad {fine_endrad} Å, sample {fine_sample} Å")
+        refine_path = Path(work_dir).resolve() / "refine"
+        refine = run_hole(pdb_file, output_prefix=output_prefix, endrad=fine_endrad,
+                          work_dir=refine_path, radius_file=radius_file,
+                          additional_cards=additional_cards, ignore_residues=ignore_residues,
+                          cvect=cvect, cpoint=start, cache=cache, atom_table=atom_table,
+                          sample=fine_sample)
+        if record('refine', refine, fine_endrad, fine_sample):
+            fine = refine['hole_output']
+            if result.get('cache_key') and refine.get('cache_key'):
+                result['cache_key'] = derive_key(result['cache_key'], 'adaptive', refine['cache_key'])
+                result['cache_hit'] = result.get('cache_hit') and refine.get('cache_hit')
+        else:
+            print("  Warning: 좁은 구간 정밀화 실패 - 전체 경로 프로파일만 사용합니다.")
+        if not keep_files:
+            shutil.rmtree(refine_path, ignore_errors=True)
+
+    # 4. 전체 경로 프로파일에 정밀화 구간 병합
+    merged = merge_profiles(coarse, fine)
+    result.update(selection)
+    result.update({
+        'hole_output': merged,
+        'min_radius': merged.min_radius,
+        'endrad': endrad,
+        'adaptive': {
+            'passes': passes,
+            'converged': converged,
+            'refine_range': [float(fine.channel_coord.min()), float(fine.channel_coord.max())]
+            if fine is not None else None
+        }
+    })
+    print(f"  ✓ 적응형 HOLE 완료: HOLE {len(passes)}회, 최종 endrad {endrad} Å, "
+          f"최소 반경 {merged.min_radius:.3f} Å")
+
+    return result
+
+
 def parse_hole_output(output_file):
     """
     HOLE 출력 파일에서 기공 반지름 프로파일 데이터 추출
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 텍스트 파일 경로
+    output_file : str or HoleOutput
+        HOLE 출력 텍스트 파일 경로 또는 파싱된 결과 (run_hole 결과의 'hole_output')
 
     Returns
     -------
     list of dict
-        각 위치의 기공 정보:
+        각 위치의 기공 정보 (채널 좌표 순):
         - 'position': float - 채널 축을 따른 위치 (Å)
         - 'radius': float - 기공 반지름 (Å)
-        - 'x', 'y', 'z': float - 3D 좌표
+        - 'x', 'y', 'z': float - 출력 2~4열 (radius, cen_line_D, sum{s/area})
         - 'type': str - 'sampled' 또는 'mid-point'
 
     Examples
@@ -234,28 +813,18 @@ def parse_hole_output(output_file):
     >>> radii = [d['radius'] for d in data]
     """
 
-    data = []
-
-    with open(output_file, 'r') as f:
-        content = f.read()
+    parsed = as_hole_output(output_file)
 
-    # 데이터 라인 파싱 (예: "15.98775  3.69806  18.14801  4.34396  (sampled)")
-    pattern = r'(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+\((sampled|mid-point)\)'
-
-    for match in re.finditer(pattern, content):
-        position = float(match.group(1))
-        x = float(match.group(2))
-        y = float(match.group(3))
-        z = float(match.group(4))
-        point_type = match.group(5)
-
-        # 반지름 계산 (position이 실제로는 반지름일 수 있음 - HOLE 출력 형식에 따라 조정 필요)
+    data = []
+    for position, radius, cen_line_d, sum_s_area, point_type in zip(
+            parsed.channel_coord.tolist(), parsed.radius.tolist(),
+            parsed.cen_line_d.tolist(), parsed.sum_s_area.tolist(), parsed.point_type):
         data.append({
             'position': position,
-            'x': x,
-            'y': y,
-            'z': z,
-            'radius': z,  # 실제 출력 형식 확인 필요
+            'x': radius,
+            'y': cen_line_d,
+            'z': sum_s_area,
+            'radius': radius,
             'type': point_type
         })
 
@@ -268,8 +837,8 @@ def get_minimum_radius(output_file):
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 파일 경로
+    output_file : str or HoleOutput
+        HOLE 출력 파일 경로 또는 파싱된 결과
 
     Returns
     -------
@@ -277,13 +846,7 @@ def get_minimum_radius(output_file):
         최소 반지름 (Angstrom), 찾지 못한 경우 None
     """
 
-    with open(output_file, 'r') as f:
-        content = f.read()
-
-    match = re.search(r'Minimum radius found:\s+([\d.]+)', content)
-    if match:
-        return float(match.group(1))
-    return None
+    return as_hole_output(output_file).min_radius
 
 
 def get_conductance(output_file):
@@ -292,8 +855,8 @@ def get_conductance(output_file):
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 파일 경로
+    output_file : str or HoleOutput
+        HOLE 출력 파일 경로 또는 파싱된 결과
 
     Returns
     -------
@@ -303,25 +866,23 @@ def get_conductance(output_file):
         - 'macroscopic_conductance': float (pS)
     """
 
-    with open(output_file, 'r') as f:
-        content = f.read()
-
-    # Geometric factor 추출
-    f_match = re.search(r'F=\s*sum\(ds/area\).*?is\s+([\d.]+)', content)
-    # Macroscopic conductance 추출
-    g_match = re.search(r'Gmacro=\s+([\d.]+)', content)
+    parsed = as_hole_output(output_file)
 
-    if f_match and g_match:
+    if parsed.geometric_factor is not None and parsed.conductance is not None:
         return {
-            'geometric_factor': float(f_match.group(1)),
-            'macroscopic_conductance': float(g_match.group(1))
+            'geometric_factor': parsed.geometric_factor,
+            'macroscopic_conductance': parsed.conductance
         }
     return None
 
 
 def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
                      work_dir="output", radius_file=None, ignore_residues=None,
-                     cvect=None, cpoint=None):
+                     cvect=None, cpoint=None, cache=None, render_engine="auto",
+                     surface_engine="sph_process", profile_format="npz", multistart=0,
+                     sample=None, adaptive=False, max_endrad=None, metrics_file=None, resume=True,
+                     pore_sidecar=False, lod=None, image_format="png", image_quality=IMAGE_QUALITY,
+                     png_compress_level=PNG_COMPRESS_LEVEL):
     """
     전체 HOLE 분석 파이프라인 실행
 
@@ -341,13 +902,110 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
         작업 디렉토리
     radius_file : str, optional
         반지름 파일 경로
+    cache : ResultCache, optional
+        결과 캐시 - 구조와 HOLE 파라미터가 같으면 HOLE/그래프/PyMOL 단계를
+        실행하지 않고 캐시된 결과 파일을 복사
+    render_engine : str
+        PyMOL PNG 렌더링 엔진 - 'auto' (pymol2 모듈이 있으면 프로세스 내 렌더링,
+        없으면 pymol 명령, pymol도 없거나 시간 초과면 NumPy 투영), 'inprocess', 'subprocess',
+        'projection' (PyMOL 없이 CA trace + 기공 표면 점 투영, hole_render.py 참고)
+    surface_engine : str
+        기공 표면 점 생성 엔진 - 'sph_process' (HOLE 실행 파일) 또는
+        'numpy' (hole_surface.py, 외부 실행 파일 불필요)
+    profile_format : str
+        프로파일 배열 파일 형식 - 'npz' (기본), 'parquet' (pyarrow), 'h5' (h5py)
+        {prefix}_profile.{format}에 구조/파라미터 메타데이터와 함께 비압축으로 저장
+    multistart : int
+        2 이상이면 시작점/축 후보 수만큼 HOLE을 동시에 실행하여 최적 경로 선택
+        (run_hole_multistart), 0 또는 1이면 한 번 실행 (run_hole)
+    sample : float, optional
+        HOLE 샘플링 간격 (Angstrom) - adaptive이면 좁은 구간 정밀화 간격
+    adaptive : bool
+        endrad를 보수적인 시작값으로 사용하여 입구에 도달할 때까지 늘리고
+        좁은 구간만 작은 sample로 정밀화 (run_hole_adaptive)
+    max_endrad : float, optional
+        adaptive의 endrad 상한 (기본: hole_adaptive.MAX_ENDRAD)
+    metrics_file : str, optional
+        단계별 측정 기록을 추가할 JSON lines 파일 (hole_metrics.write_metrics_jsonl)
+    resume : bool
+        {work_dir}/{prefix}_manifest.json에 기록된 이전 실행에서 입력과 출력이 바뀌지 않은
+        완료 단계를 건너뛰고 첫 미완료/변경 단계부터 실행 (False면 모두 다시 실행, 기록은 갱신)
+    pore_sidecar : bool
+        기공 표면 점을 바이너리 사이드카 {prefix}_pore_surface.npz로도 저장
+        (hole_pymol.read_pore_points로 텍스트 PDB 파싱 없이 읽기)
+    lod : str or dict, optional
+        세부 수준 프리셋 - 'preview' (빠른 미리보기: 점 솎아내기 + 낮은 해상도), 'report' (기본),
+        'publication' (고해상도), 또는 {'preset': 이름, 바꿀 설정...} (hole_lod.py 참고)
+        표면 점 밀도 / 솎아내기 / ray 해상도 / surface_quality / PNG DPI를 함께 선택
+    image_format : str
+        최종 시각화 이미지 형식 - 'png' (기본), 'webp' / 'jpeg' (미리보기용 손실 압축)
+        레이어는 메모리에서 합성하고 최종 이미지만 {prefix}_visualization.{png,webp,jpg}로 인코딩
+    image_quality : int
+        WebP / JPEG 품질 (1-100)
+    png_compress_level : int
+        PNG zlib 압축 수준 (0 = 가장 빠름, 9 = 가장 작음, 기본 6)
 
     Returns
     -------
     dict
-        전체 파이프라인 실행 결과
+        전체 파이프라인 실행 결과 ('metrics': 단계별 시간 / CPU / 자식 프로세스 RSS / 출력 크기)
     """
-    import sys
+    options = dict(
+        pdb_file=pdb_file,
+        output_prefix=output_prefix,
+        endrad=endrad,
+        work_dir=work_dir,
+        radius_file=radius_file,
+        ignore_residues=ignore_residues,
+        cvect=cvect,
+        cpoint=cpoint,
+        cache=cache,
+        render_engine=render_engine,
+        surface_engine=surface_engine,
+        profile_format=profile_format,
+        multistart=multistart,
+        sample=sample,
+        adaptive=adaptive,
+        max_endrad=max_endrad,
+        metrics_file=metrics_file,
+        resume=resume,
+        pore_sidecar=pore_sidecar,
+        lod=lod,
+        image_format=image_format,
+        image_quality=image_quality,
+        png_compress_level=png_compress_level
+    )
+
+    try:
+        state = _analysis_state(options)
+    except ValueError as e:
+        print(f"✗ 옵션 오류: {e}")
+        return {'success': False, 'error': str(e)}
+    for name, stage in ANALYSIS_STAGES:
+        _run_stage(name, stage, state)
+        if not state['result']['success']:
+            break
+
+    _report_metrics(state)
+    return state['result']
+
+
+def _stage_hole(state):
+    """파이프라인 Step 1: HOLE 실행 (+ 캐시된 그래프/PyMOL 결과 복원)"""
+    options = state['options']
+    pdb_file = options['pdb_file']
+    output_prefix = options['output_prefix']
+    endrad = options['endrad']
+    work_dir = options['work_dir']
+    radius_file = options['radius_file']
+    ignore_residues = options['ignore_residues']
+    cvect = options['cvect']
+    cpoint = options['cpoint']
+    cache = options['cache']
+    sample = options['sample']
+    adaptive = options['adaptive']
+    multistart = options['multistart']
+    max_endrad = options['max_endrad']
 
     print("=" * 60)
     print("HOLE 전체 분석 파이프라인")
@@ -361,7 +1019,7 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
     print("\n" + "=" * 60)
     print("Step 1: HOLE 실행")
     print("=" * 60)
-    result = run_hole(
+    hole_options = dict(
         pdb_file=pdb_file,
         output_prefix=output_prefix,
         endrad=endrad,
@@ -369,178 +1027,230 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
         radius_file=radius_file,
         ignore_residues=ignore_residues,
         cvect=cvect,
-        cpoint=cpoint
+        cpoint=cpoint,
+        cache=cache,
+        sample=sample
     )
+    if adaptive:
+        result = run_hole_adaptive(multistart=multistart, max_endrad=max_endrad, **hole_options)
+    elif multistart and multistart > 1:
+        result = run_hole_multistart(n_starts=multistart, **hole_options)
+    else:
+        result = run_hole(**hole_options)
 
+    state['result'] = result
     if not result['success']:
         print(f"✗ HOLE 실행 실패: {result.get('error', 'Unknown error')}")
-        return result
+        return
 
-    print(f"✓ HOLE 실행 완료")
+    print(f"✓ HOLE 실행 완료" + (" (캐시)" if result.get('cache_hit') else ""))
     print(f"  출력 파일: {result['output_file']}")
     print(f"  SPH 파일: {result['sph_file']}")
     if result['min_radius']:
         print(f"  최소 반지름: {result['min_radius']:.3f} Å")
 
-    # Step 2: hole_plot.py 실행
-    print("\n" + "=" * 60)
-    print("Step 2: 그래프 생성 (hole_plot.py)")
-    print("=" * 60)
-    try:
-        sys.path.insert(0, str(Path(__file__).parent / "scripts"))
-        from hole_plot import plot_hole_profile
-
-        # 절대 경로로 변환
+    # 적응형 실행의 병합 프로파일은 _out.txt에 없으므로 따로 저장 (재개 시 그대로 읽음)
+    if result.get('adaptive'):
+        adaptive_profile = Path(work_dir).resolve() / f"{output_prefix}_adaptive.npz"
+        result['adaptive_profile'] = save_profile(result['hole_output'], adaptive_profile, compress=False)
+
+    # 캐시된 그래프/PyMOL 결과 복원 (HOLE 캐시 키 + 접두사 + LOD로 파생한 키)
+    # HOLE 결과가 캐시에서 복원된 경우에만 사용 (새로 실행한 HOLE 결과와 섞이지 않도록)
+    artifact_key = None
+    restored_roles = set()
+    if cache is not None and result.get('cache_key'):
+        artifact_key = _artifact_key(result['cache_key'], state['options'])
+    if artifact_key and result.get('cache_hit'):
         work_path = Path(work_dir).resolve()
-        plot_file = work_path / f"{output_prefix}_profile.png"
-        plot_hole_profile(result['output_file'], save_as=str(plot_file))
-        print(f"✓ 그래프 생성 완료: {plot_file}")
-        result['plot_file'] = str(plot_file)
+        restored = cache.restore(artifact_key, {
+            'plot_file': work_path / f"{output_prefix}_profile.png",
+            'pore_pdb': work_path / f"{output_prefix}_pore_surface.pdb",
+            'pymol_script': work_path / f"{output_prefix}_pymol.pml",
+            'pore_points': work_path / f"{output_prefix}_pore_surface.npz",
+            'pymol_png': work_path / f"{output_prefix}_visualization{_image_extension(state['options'])}"
+        })
+        if restored and restored['files']:
+            # PyMOL 스크립트의 절대 경로를 현재 작업 디렉토리로 변경
+            cached_work_dir = restored['meta'].get('work_dir')
+            if 'pymol_script' in restored['files'] and cached_work_dir and cached_work_dir != str(work_path):
+                pml_file = Path(restored['files']['pymol_script'])
+                pml_file.write_text(pml_file.read_text().replace(cached_work_dir, str(work_path)))
+
+            if 'pore_pdb' in restored['files'] and 'pore_points' not in restored['files']:
+                # 복원한 기공 PDB와 맞지 않는 이전 실행의 사이드카 삭제
+                (work_path / f"{output_prefix}_pore_surface.npz").unlink(missing_ok=True)
+            result.update(restored['files'])
+            restored_roles = set(restored['files'])
+            if 'pymol_png' in restored_roles and restored['meta'].get('render_engine_used'):
+                result['render_engine_used'] = restored['meta']['render_engine_used']
+            print(f"✓ 캐시 적중: {', '.join(sorted(restored_roles))} 복원 (key {artifact_key[:12]})")
+
+    state['artifact_key'] = artifact_key
+    state['restored_roles'] = restored_roles
+
+
+def _stage_plot(state):
+    """파이프라인 Step 2: 그래프 생성 + 프로파일 배열 저장"""
+    options, result = state['options'], state['result']
+    pdb_file = options['pdb_file']
+    output_prefix = options['output_prefix']
+    endrad = options['endrad']
+    work_dir = options['work_dir']
+    radius_file = options['radius_file']
+    ignore_residues = options['ignore_residues']
+    cvect = options['cvect']
+    cpoint = options['cpoint']
+    profile_format = options['profile_format']
+
+    # Step 2: hole_plot.py 실행 (캐시에서 복원된 경우 생략)
+    if 'plot_file' not in result:
+        print("\n" + "=" * 60)
+        print("Step 2: 그래프 생성 (hole_plot.py)")
+        print("=" * 60)
+        try:
+            from hole_plot import profile_plotter
+
+            # 절대 경로로 변환
+            work_path = Path(work_dir).resolve()
+            plot_file = work_path / f"{output_prefix}_profile.png"
+            with measure('plot'):
+                # 스레드별 템플릿 그래프 재사용 (배치에서 그래프가 쌓이지 않음)
+                profile_plotter().plot(result['hole_output'] or result['output_file'], save_as=str(plot_file))
+            print(f"✓ 그래프 생성 완료: {plot_file}")
+            result['plot_file'] = str(plot_file)
+        except ImportError as e:
+            print(f"✗ matplotlib이 설치되지 않아 그래프 생성 건너뜀")
+            print(f"  설치: python -m pip install matplotlib")
+            result['plot_error'] = 'matplotlib not installed'
+        except Exception as e:
+            print(f"✗ 그래프 생성 실패: {e}")
+            result['plot_error'] = str(e)
+
+    # 프로파일 배열 저장 (메타데이터 포함, 파싱 결과에서 바로 기록하므로 캐시 적중 시에도 갱신)
+    # 비압축으로 저장 - load_profile이 .npz 배열을 메모리 매핑 (프로파일은 수백 점이라 크기 차이 작음)
+    try:
+        profile_file = Path(work_dir).resolve() / f"{output_prefix}_profile.{profile_format}"
+        with measure('profile'):
+            save_profile(result['hole_output'] or result['output_file'], profile_file, metadata={
+                'structure': str(Path(pdb_file).resolve()),
+                'output_prefix': output_prefix,
+                'radius_file': str(Path(os.path.expanduser(radius_file or HOLE_RAD)).resolve()),
+                'endrad': result.get('endrad', endrad),
+                'cvect': result.get('cvect', cvect),
+                'cpoint': result.get('cpoint', cpoint),
+                'ignore_residues': ignore_residues if ignore_residues is not None else DEFAULT_IGNORE_RESIDUES
+            }, compress=False)
+        print(f"✓ 프로파일 배열 저장: {profile_file}")
+        result['profile_file'] = str(profile_file)
     except ImportError as e:
-        print(f"✗ matplotlib이 설치되지 않아 그래프 생성 건너뜀")
-        print(f"  설치: python -m pip install matplotlib")
-        result['plot_error'] = 'matplotlib not installed'
+        print(f"✗ 프로파일 저장 건너뜀 ({profile_format} 형식 패키지 없음: {e.name})")
+        result['profile_error'] = str(e)
     except Exception as e:
-        print(f"✗ 그래프 생성 실패: {e}")
-        result['plot_error'] = str(e)
+        print(f"✗ 프로파일 저장 실패: {e}")
+        result['profile_error'] = str(e)
 
-    # Step 3: hole_pymol.py 실행
-    print("\n" + "=" * 60)
-    print("Step 3: PyMOL 시각화 파일 생성 (hole_pymol.py)")
-    print("=" * 60)
-    try:
-        import subprocess
-        hole_pymol_script = Path(__file__).parent / "scripts" / "hole_pymol.py"
-        python_exe = sys.executable
-
-        proc = subprocess.run(
-            [python_exe, str(hole_pymol_script), result['sph_file']],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
 
-        if proc.returncode == 0:
-            print(proc.stdout)
-            print(f"✓ PyMOL 시각화 파일 생성 완료")
+def _stage_pymol(state):
+    """파이프라인 Step 3: PyMOL 시각화 파일 생성"""
+    options, result = state['options'], state['result']
+    surface_engine = options['surface_engine']
+    pore_sidecar = options.get('pore_sidecar', False)
+
+    # Step 3: hole_pymol.py 실행 (캐시에서 복원된 경우 생략)
+    if 'pymol_script' not in result or (pore_sidecar and 'pore_points' not in result):
+        print("\n" + "=" * 60)
+        print("Step 3: PyMOL 시각화 파일 생성 (hole_pymol.py)")
+        print("=" * 60)
+        try:
+            # 별도 Python 프로세스 없이 직접 호출 (sph_process/qpt_conv만 외부 실행)
+            from hole_pymol import generate_pymol_files
+
+            files = generate_pymol_files(result['sph_file'], surface_engine=surface_engine,
+                                         sidecar=pore_sidecar, lod=options.get('lod'))
+
+            if files['success']:
+                print(f"✓ PyMOL 시각화 파일 생성 완료")
+
+                # 생성된 파일들 결과에 추가
+                result['pore_pdb'] = files['pore_pdb']
+                if files.get('pore_points'):
+                    result['pore_points'] = files['pore_points']
+                if files['pymol_script']:
+                    result['pymol_script'] = files['pymol_script']
+            else:
+                print(f"✗ PyMOL 시각화 파일 생성 실패: {files['error']}")
+                result['pymol_error'] = files['error']
+        except Exception as e:
+            print(f"✗ PyMOL 시각화 파일 생성 실패: {e}")
+            result['pymol_error'] = str(e)
 
-            # 생성된 파일들 결과에 추가
-            base_name = Path(result['sph_file']).stem
-            work_path = Path(work_dir)
-            result['pore_pdb'] = str(work_path / f"{base_name}_pore_surface.pdb")
-            result['pymol_script'] = str(work_path / f"{base_name}_pymol.pml")
-        else:
-            print(f"✗ PyMOL 시각화 파일 생성 실패")
-            print(proc.stderr)
-            result['pymol_error'] = proc.stderr
-    except Exception as e:
-        print(f"✗ PyMOL 시각화 파일 생성 실패: {e}")
-        result['pymol_error'] = str(e)
+
+def _stage_render(state):
+    """파이프라인 Step 4: PyMOL PNG 렌더링 + 레이어 합성"""
+    options, result = state['options'], state['result']
+    work_dir = options['work_dir']
+    render_engine = options['render_engine']
 
     # Step 4: PyMOL PNG 자동 생성
-    if 'pymol_script' in result:
+    if 'pymol_script' in result and 'pymol_png' not in result:
         print("\n" + "=" * 60)
         print("Step 4: PyMOL PNG 렌더링")
         print("=" * 60)
 
         base_name = Path(result['sph_file']).stem
         work_path = Path(work_dir).resolve()
-        png_output = work_path / f"{base_name}_visualization.png"
+        image_format = options.get('image_format', 'png')
+        png_output = work_path / f"{base_name}_visualization{_image_extension(options)}"
 
         try:
-            print("PyMOL로 PNG 생성 중 (레이어별 렌더링)...")
+            settings = lod_settings(options.get('lod'))
+            print(f"PyMOL로 PNG 생성 중 (레이어별 렌더링, {settings['name']}: "
+                  f"{settings['width']}×{settings['height']}, {settings['dpi']} DPI)...")
 
             # PyMOL 스크립트 절대 경로
             pml_script_abs = Path(result['pymol_script']).resolve()
 
-            # 중간 파일 경로
-            surface_pore_png = work_path / f"{base_name}_temp_surface_pore.png"
-            cartoon_png = work_path / f"{base_name}_temp_cartoon.png"
-
-            import time
-
-            # 1단계: Surface + Pore 렌더링
-            print("  1/3: Surface + Pore 레이어 렌더링...")
-            # set_view로 절대 카메라 위치 설정 (Z축 수직: +Z=아래, -Z=위)
-            view_matrix = "set_view (1.000, 0.000, 0.000, 0.000, 0.000, -1.000, 0.000, 1.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, -100.0, 100.0, -20.0)"
-            pymol_cmd_surface = [
-                'pymol',
-                '-c',
-                '-d', f"@{pml_script_abs}; hide everything, protein_cartoon; hide spheres, pore; show surface, pore; set surface_quality, 1, pore; set transparency, 0.6, protein_surface; {view_matrix}; zoom all, 20; ray 800, 800; png {surface_pore_png}, dpi=200; quit"
-            ]
-
-            proc1 = subprocess.run(
-                pymol_cmd_surface,
-                capture_output=True,
-                text=True,
-                timeout=180,
-                cwd=str(work_path)
-            )
-            time.sleep(2)
-
-            if not surface_pore_png.exists() or surface_pore_png.stat().st_size == 0:
-                print(f"✗ Surface+Pore 렌더링 실패")
-                raise Exception("Surface layer rendering failed")
-
-            print(f"  ✓ Surface+Pore 렌더링 완료 ({surface_pore_png.stat().st_size/1024:.1f} KB)")
-
-            # 2단계: Cartoon만 렌더링 (투명 배경)
-            print("  2/3: Cartoon 레이어 렌더링...")
-            pymol_cmd_cartoon = [
-                'pymol',
-                '-c',
-                '-d', f"@{pml_script_abs}; hide everything, protein_surface; hide everything, pore; set ray_opaque_background, 0; set transparency, 0.4, protein_cartoon; set cartoon_transparency, 0.4, protein_cartoon; {view_matrix}; zoom all, 20; ray 800, 800; png {cartoon_png}, dpi=200; quit"
-            ]
-
-            proc2 = subprocess.run(
-                pymol_cmd_cartoon,
-                capture_output=True,
-                text=True,
-                timeout=180,
-                cwd=str(work_path)
-            )
-            time.sleep(2)
-
-            if not cartoon_png.exists() or cartoon_png.stat().st_size == 0:
-                print(f"✗ Cartoon 렌더링 실패")
-                raise Exception("Cartoon layer rendering failed")
-
-            print(f"  ✓ Cartoon 렌더링 완료 ({cartoon_png.stat().st_size/1024:.1f} KB)")
-
-            # 3단계: 두 이미지 합성
-            print("  3/3: 이미지 합성 중...")
-            try:
-                from PIL import Image
-
-                # 이미지 로드
-                img_surface = Image.open(surface_pore_png).convert('RGBA')
-                img_cartoon = Image.open(cartoon_png).convert('RGBA')
-
-                # Cartoon을 Surface 위에 합성
-                final_img = Image.alpha_composite(img_surface, img_cartoon)
-
-                # 최종 이미지 저장
-                final_img.save(png_output, 'PNG', dpi=(200, 200))
-
-                # 임시 파일 삭제
-                surface_pore_png.unlink()
-                cartoon_png.unlink()
-
-                if png_output.exists() and png_output.stat().st_size > 0:
-                    file_size = png_output.stat().st_size
-                    print(f"✓ PNG 파일 생성 완료: {png_output} ({file_size/1024:.1f} KB)")
-                    result['pymol_png'] = str(png_output)
-                else:
-                    print(f"✗ 최종 이미지 저장 실패")
-
-            except ImportError:
-                print("✗ PIL/Pillow가 설치되지 않아 이미지 합성 실패")
-                print("  설치: conda install pillow")
-                # 임시 파일이라도 유지
-                if surface_pore_png.exists():
-                    surface_pore_png.rename(png_output)
-                    print(f"  대신 Surface+Pore 이미지 저장: {png_output}")
-                    result['pymol_png'] = str(png_output)
+            # 1-2단계: Surface + Pore / Cartoon 레이어 렌더링 (작업 디렉토리에 중간 PNG 없이 RGBA 배열로)
+            # (inprocess: 재사용 PyMOL 세션에서 구조 1회 로드 / subprocess: 레이어별 pymol 동시 실행,
+            #  두 엔진 모두 /dev/shm 임시 디렉토리 경유 / projection: NumPy 투영 배열)
+            print("  1-2/3: Surface + Pore, Cartoon 레이어 렌더링...")
+            with measure('layers'):
+                images, engine = render_layer_images(
+                    pml_script_abs, work_dir=work_path, engine=render_engine, timeout=180,
+                    width=settings['width'], height=settings['height'],
+                    dpi=settings['dpi'], surface_quality=settings['surface_quality'])
+            print(f"  렌더링 엔진: {engine}")
+            result['render_engine_used'] = engine
+            if engine == 'projection' and render_engine != 'projection':
+                # PyMOL 대체 결과는 완료로 기록하거나 캐시하지 않아 다음 실행에서 PyMOL을 다시 시도
+                result['render_fallback'] = True
+                print("  Warning: PyMOL 대신 projection 렌더링 결과 - 재개 / 캐시에 완료로 기록하지 않음")
+
+            for name, label in (('surface_pore', 'Surface+Pore'), ('cartoon', 'Cartoon')):
+                if name not in images:
+                    print(f"✗ {label} 렌더링 실패")
+                    raise Exception(f"{name} layer rendering failed")
+                height, width = images[name].shape[:2]
+                print(f"  ✓ {label} 렌더링 완료 ({width}×{height})")
+
+            # 3단계: 메모리에서 합성 후 최종 이미지만 인코딩
+            print(f"  3/3: 이미지 합성 중 ({image_format})...")
+            with measure('composite'):
+                save_image(composite_layers(images), png_output, image_format=image_format,
+                           dpi=settings['dpi'],
+                           compress_level=options.get('png_compress_level', PNG_COMPRESS_LEVEL),
+                           quality=options.get('image_quality', IMAGE_QUALITY))
+
+            if png_output.exists() and png_output.stat().st_size > 0:
+                file_size = png_output.stat().st_size
+                print(f"✓ 이미지 파일 생성 완료: {png_output} ({file_size/1024:.1f} KB)")
+                result['pymol_png'] = str(png_output)
+            else:
+                print(f"✗ 최종 이미지 저장 실패")
+
+        except ImportError:
+            print("✗ PIL/Pillow가 설치되지 않아 이미지 합성 실패")
+            print("  설치: conda install pillow")
 
         except FileNotFoundError:
             print("✗ PyMOL 명령을 찾을 수 없습니다.")
@@ -558,6 +1268,28 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
             print(f"  pymol -c -d \"@{result['pymol_script']}; orient pore; zoom pore, 5; ray 3000,3000; png {png_output}, dpi=300; quit\"")
             result['pymol_png_error'] = str(e)
 
+
+def _stage_finalize(state):
+    """파이프라인 Step 5: 결과 캐시 등록, 중간 파일 정리, 결과 요약"""
+    options, result = state['options'], state['result']
+    output_prefix = options['output_prefix']
+    work_dir = options['work_dir']
+    cache = options['cache']
+    profile_format = options['profile_format']
+
+    # 새로 생성된 그래프/PyMOL 결과를 캐시에 등록
+    artifact_key = state['artifact_key']
+    if artifact_key:
+        artifact_roles = ['plot_file', 'pore_pdb', 'pymol_script', 'pore_points', 'pymol_png']
+        if result.get('render_fallback'):
+            artifact_roles.remove('pymol_png')  # PyMOL 대체 렌더링은 캐시하지 않음
+        files = {role: result[role] for role in artifact_roles if role in result}
+        if set(files) - state['restored_roles']:
+            meta = {'work_dir': str(Path(work_dir).resolve())}
+            if 'pymol_png' in files and result.get('render_engine_used'):
+                meta['render_engine_used'] = result['render_engine_used']
+            cache.store(artifact_key, files, meta=meta, replace=True)
+
     # Step 5: 중간 파일 정리
     print("\n" + "=" * 60)
     print("Step 4: 중간 파일 정리")
@@ -571,14 +1303,20 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
     final_files = set()
     final_files.add(str(work_path / f"{output_prefix}.pdb"))  # 단백질 PDB
     final_files.add(str(work_path / f"{output_prefix}_pore_surface.pdb"))  # 기공 PDB
+    final_files.add(str(work_path / f"{output_prefix}_pore_surface.npz"))  # 기공 표면 점 사이드카
     final_files.add(str(work_path / f"{output_prefix}_profile.png"))  # 그래프
+    final_files.add(str(work_path / f"{output_prefix}_profile.{profile_format}"))  # 프로파일 배열
     final_files.add(str(work_path / f"{output_prefix}_pymol.pml"))  # PyMOL 스크립트
-    final_files.add(str(work_path / f"{output_prefix}_visualization.png"))  # PyMOL PNG
+    final_files.add(str(work_path / f"{output_prefix}_visualization{_image_extension(options)}"))  # 시각화 이미지
 
     # 중간 파일들 (이동할 파일)
-    intermediate_extensions = ['.inp', '_out.txt', '.sph', '_surface.qpt', '_surface.vmd_plot', '.tsv']
+    intermediate_extensions = ['.inp', '_out.txt', '.sph', '_adaptive.npz', '_surface.qpt', '_surface.vmd_plot', '.tsv']
     moved_count = 0
 
+    # 이동된 파일은 결과 딕셔너리의 경로도 함께 갱신
+    moved_keys = {'.inp': 'input_file', '_out.txt': 'output_file', '.sph': 'sph_file',
+                  '_adaptive.npz': 'adaptive_profile'}
+
     for ext in intermediate_extensions:
         src = work_path / f"{output_prefix}{ext}"
         if src.exists():
@@ -586,6 +1324,8 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
             src.rename(dst)
             moved_count += 1
             print(f"  이동: {src.name} → intermediate_files/")
+            if ext in moved_keys:
+                result[moved_keys[ext]] = str(dst)
 
     print(f"✓ 중간 파일 {moved_count}개를 intermediate_files/ 폴더로 정리")
 
@@ -601,11 +1341,18 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
     if 'pore_pdb' in result:
         print(f"  {file_num}. 기공 PDB: {result['pore_pdb']}")
         file_num += 1
+    if 'pore_points' in result:
+        print(f"  {file_num}. 기공 표면 점 (바이너리): {result['pore_points']}")
+        file_num += 1
 
     if 'plot_file' in result:
         print(f"  {file_num}. 그래프: {result['plot_file']}")
         file_num += 1
 
+    if 'profile_file' in result:
+        print(f"  {file_num}. 프로파일 배열: {result['profile_file']}")
+        file_num += 1
+
     if 'pymol_script' in result:
         print(f"  {file_num}. PyMOL 스크립트: {result['pymol_script']}")
         file_num += 1
@@ -624,16 +1371,989 @@ def run_full_analysis(pdb_file, output_prefix="analysis", endrad=5.0,
     if 'pymol_script' in result:
         print(f"  PyMOL 대화형: pymol {result['pymol_script']}")
 
+
+# 전체 분석 파이프라인 단계 (이름, 함수) - 각 함수는 state {'options', 'result', ...}를 이어받음
+# run_full_analysis는 순서대로 실행하고, run_batch_async는 단계별 동시 실행 수를 제한하여 구조 간에 겹쳐 실행
+ANALYSIS_STAGES = [
+    ('hole', _stage_hole),
+    ('plot', _stage_plot),
+    ('pymol', _stage_pymol),
+    ('render', _stage_render),
+    ('finalize', _stage_finalize)
+]
+
+# 단계별 출력 파일 (결과 딕셔너리 키) - 측정 기록의 출력 크기
+STAGE_OUTPUTS = {
+    'hole': ['pdb_file', 'input_file', 'output_file', 'sph_file', 'adaptive_profile'],
+    'plot': ['plot_file', 'profile_file'],
+    'pymol': ['pore_pdb', 'pymol_script', 'pore_points'],
+    'render': ['pymol_png']
+}
+
+# 옵션에 따라 만들어지는 출력 (없어도 단계 완료로 기록)
+OPTIONAL_OUTPUTS = {'pore_points', 'adaptive_profile'}
+
+
+# 체크포인트 단계: 입력 해시에 들어가는 옵션 / 출력 해시를 입력으로 쓰는 앞 단계 / 실패 원인 결과 키
+CHECKPOINT_STAGES = {
+    'hole': {'options': ['endrad', 'ignore_residues', 'cvect', 'cpoint', 'sample',
+                         'adaptive', 'multistart', 'max_endrad'],
+             'after': [], 'errors': ['error']},
+    'plot': {'options': ['profile_format', 'endrad', 'radius_file', 'ignore_residues', 'cvect', 'cpoint'],
+             'after': ['hole'], 'errors': ['plot_error', 'profile_error']},
+    'pymol': {'options': ['surface_engine', 'pore_sidecar', 'lod'], 'after': ['hole'], 'errors': ['pymol_error']},
+    'render': {'options': ['render_engine', 'lod', 'image_format', 'image_quality', 'png_compress_level'],
+               'after': ['hole', 'pymol'], 'errors': ['pymol_png_error']}
+}
+
+# 재개 시 HOLE 결과 딕셔너리에 되돌릴 값 (매니페스트에 JSON으로 기록)
+HOLE_RESUME_KEYS = ['min_radius', 'cvect', 'cpoint', 'endrad', 'cache_key',
+                    'multistart', 'best_start', 'adaptive']
+
+# 단계별로 매니페스트에 기록하여 재개 시 되돌릴 결과 값
+STAGE_RESUME_KEYS = {'hole': HOLE_RESUME_KEYS, 'render': ['render_engine_used']}
+
+
+def _artifact_key(cache_key, options):
+    """그래프/PyMOL 결과 캐시 키 (HOLE 캐시 키 + 접두사 + 표면 엔진 + 렌더링 엔진 종류 + LOD / 이미지 설정)"""
+    parts = [options['output_prefix'], 'artifacts', options['surface_engine']]
+    if options.get('render_engine') == 'projection':
+        # projection 이미지는 PyMOL 렌더링 결과와 따로 캐시 (PyMOL 대체 결과는 캐시하지 않음)
+        parts.append('projection')
+    if options.get('lod') is not None:
+        parts.append(sorted(lod_settings(options['lod']).items()))
+    image = (options.get('image_format', 'png'), options.get('image_quality', IMAGE_QUALITY),
+             options.get('png_compress_level', PNG_COMPRESS_LEVEL))
+    if image != ('png', IMAGE_QUALITY, PNG_COMPRESS_LEVEL):
+        parts.append(image)
+    return derive_key(cache_key, *parts)
+
+
+def _image_extension(options):
+    """최종 시각화 이미지 확장자 (image_format)"""
+    return IMAGE_FORMATS[options.get('image_format', 'png')][1]
+
+
+def _analysis_state(options):
+    """
+    파이프라인 단계들이 이어받는 state (옵션, 측정 기록, 실행 매니페스트)
+
+    lod는 normalize_lod로 정규화하므로 lod='report'와 None은 같은 체크포인트 / 캐시 키가 됩니다.
+
+    Raises
+    ------
+    ValueError
+        알 수 없는 lod 프리셋 / 설정
+    """
+    return {
+        'options': dict(options, lod=normalize_lod(options.get('lod'))),
+        'metrics': [],
+        'manifest': RunManifest(options['work_dir'], options['output_prefix']),
+        'artifact_key': None,
+        'restored_roles': set()
+    }
+
+
+def _stage_inputs(name, state):
+    """체크포인트 단계의 입력 해시 (옵션 + 입력 파일 / 앞 단계 출력 해시)"""
+    options, manifest = state['options'], state['manifest']
+    spec = CHECKPOINT_STAGES[name]
+    parts = [name, {key: options.get(key) for key in spec['options']}]
+    if name == 'hole':
+        radius_file = os.path.expanduser(options['radius_file'] or HOLE_RAD)
+        # 없는 파일은 해시하지 않음 - run_hole이 오류 결과로 보고
+        parts.append([hash_file(path) if Path(path).is_file() else None
+                      for path in (options['pdb_file'], radius_file)])
+    parts += [manifest.output_hashes(dep) for dep in spec['after']]
+    return stage_key(*parts)
+
+
+def _resume_stage(name, state, entry):
+    """매니페스트 기록으로 단계 결과 복원 (단계 실행 생략)"""
+    options, outputs = state['options'], entry['outputs']
+    if name == 'hole':
+        print("=" * 60)
+        print("HOLE 전체 분석 파이프라인 (재개)")
+        print("=" * 60)
+        print(f"매니페스트: {state['manifest'].path}")
+        # 적응형 실행은 저장해 둔 병합 프로파일 사용 (_out.txt는 전체 경로 실행 결과뿐)
+        if outputs.get('adaptive_profile'):
+            hole_output = load_profile(outputs['adaptive_profile'])
+        else:
+            hole_output = parse_hole_file(outputs['output_file'])
+        state['result'] = dict(entry['result'], success=True, resumed=True, atom_table=None,
+                               hole_output=hole_output, **outputs)
+        if options['cache'] is not None and state['result'].get('cache_key'):
+            state['artifact_key'] = _artifact_key(state['result']['cache_key'], options)
+    else:
+        state['result'].update(entry.get('result') or {}, **outputs)
+        state['restored_roles'] |= set(outputs)
+    print(f"✓ {name} 단계 건너뜀 (이전 실행 결과: {', '.join(Path(path).name for path in outputs.values())})")
+
+
+def _checkpoint_stage(name, state, inputs):
+    """단계 실행 결과를 매니페스트에 기록 (출력이 모두 만들어졌으면 완료, 아니면 실패)"""
+    result = state.get('result') or {}
+    spec = CHECKPOINT_STAGES[name]
+    outputs = {role: result.get(role) for role in STAGE_OUTPUTS[name]
+               if role not in OPTIONAL_OUTPUTS or result.get(role)}
+    missing = [role for role, path in outputs.items() if not (path and Path(path).is_file())]
+    complete = bool(result.get('success')) and not missing
+    errors = [str(result[key]) for key in spec['errors'] if result.get(key)]
+    if not complete and not errors:
+        errors = [f"출력 없음: {', '.join(missing)}"]
+    status = 'complete' if complete else 'failed'
+    if complete and name == 'render' and result.get('render_fallback'):
+        # PyMOL을 요청했지만 projection으로 대체 - 다음 실행에서 다시 렌더링
+        status = 'fallback'
+        errors = [f"PyMOL 대신 {result['render_engine_used']} 렌더링"]
+    state['manifest'].record(
+        name, inputs, outputs,
+        result={key: result[key] for key in STAGE_RESUME_KEYS.get(name, []) if key in result},
+        status=status,
+        error='; '.join(errors) or None
+    )
+
+
+def _run_stage(name, stage, state):
+    """
+    파이프라인 단계 하나를 측정하며 실행 (기록은 state['metrics'])
+
+    체크포인트 단계는 매니페스트에서 입력/출력이 바뀌지 않은 완료 기록을 찾으면
+    실행하지 않고 결과를 복원하며, 실행한 경우 결과를 매니페스트에 기록합니다.
+    """
+    with measure(name, state['metrics']) as record:
+        try:
+            inputs = None
+            if name in CHECKPOINT_STAGES and (name == 'hole' or state['result'].get('success')):
+                inputs = _stage_inputs(name, state)
+                entry = state['manifest'].check(name, inputs) if state['options'].get('resume') else None
+                if entry is not None:
+                    _resume_stage(name, state, entry)
+                    record['resumed'] = True
+                    return
+            stage(state)
+            if inputs is not None:
+                _checkpoint_stage(name, state, inputs)
+        finally:
+            result = state.get('result') or {}
+            record_outputs(record, [result.get(key) for key in STAGE_OUTPUTS.get(name, [])])
+
+
+def _report_metrics(state):
+    """단계별 측정 요약 출력, 결과에 'metrics' 기록, metrics_file이 있으면 JSON lines로 추가"""
+    options, metrics = state['options'], state['metrics']
+    result = state.setdefault('result', {'success': False})
+    result['metrics'] = metrics
+    if not metrics:
+        return
+
+    print("\n" + "=" * 60)
+    print("단계별 측정")
+    print("=" * 60)
+    for line in format_metrics(metrics):
+        print(f"  {line}")
+    print(f"  합계      {sum(record['wall'] for record in metrics):7.2f}s")
+
+    if options.get('metrics_file'):
+        write_metrics_jsonl(options['metrics_file'], metrics,
+                            structure=options['output_prefix'],
+                            pdb_file=str(options['pdb_file']),
+                            success=bool(result.get('success')))
+        print(f"✓ 측정 기록: {options['metrics_file']}")
+
+
+def resolve_radius_file(radius_file):
+    """
+    YAML 설정의 radius_file 값을 절대 경로로 변환
+
+    상대 경로(예: "simple.rad")는 rad/ 디렉토리(~/MODEL/hole2/rad/) 기준으로 해석합니다.
+    """
+    if radius_file and not radius_file.startswith('/'):
+        return os.path.join(HOLE_RAD_DIR, radius_file)
+    return radius_file
+
+
+def expand_batch_entries(structures, work_dir="output", **defaults):
+    """
+    배치 입력을 구조별 run_full_analysis 인자 목록으로 확장
+
+    Parameters
+    ----------
+    structures : list
+        각 항목은 다음 중 하나:
+        - PDB 파일 경로 (str)
+        - glob 패턴 (str, 예: "example/*.pdb")
+        - YAML 항목 (dict) - 'pdb_file' (경로 또는 glob) 필수,
+          'output_prefix', 'endrad', 'radius_file', 'ignore', 'cvect', 'cpoint' 개별 지정 가능
+    work_dir : str
+        배치 출력 상위 디렉토리 - 각 구조는 {work_dir}/{prefix}/ 에 독립적으로 저장
+    **defaults
+        모든 구조에 공통으로 적용할 run_full_analysis 인자
+
+    Returns
+    -------
+    list of dict
+        구조별 run_full_analysis 키워드 인자 (입력 순서 유지)
+    """
+    import glob
+
+    entries = []
+    used_prefixes = {}
+
+    for item in structures:
+        if isinstance(item, dict):
+            options = dict(item)
+            pattern = options.pop('pdb_file', None)
+            if 'ignore' in options:
+                options['ignore_residues'] = options.pop('ignore')
+            if 'radius_file' in options:
+                options['radius_file'] = resolve_radius_file(options['radius_file'])
+        else:
+            options = {}
+            pattern = item
+
+        if not pattern:
+            print(f"  Warning: pdb_file이 없는 배치 항목 건너뜀: {item}")
+            continue
+
+        pattern = os.path.expanduser(str(pattern))
+        if glob.has_magic(pattern):
+            pdb_files = sorted(glob.glob(pattern))
+            if not pdb_files:
+                print(f"  Warning: 일치하는 PDB 파일 없음: {pattern}")
+        else:
+            pdb_files = [pattern]
+
+        for pdb in pdb_files:
+            entry = dict(defaults)
+            entry.update(options)
+
+            # 접두사 중복 시 번호를 붙여 작업 디렉토리 충돌 방지
+            prefix = entry.get('output_prefix') if len(pdb_files) == 1 else None
+            prefix = prefix or Path(pdb).stem
+            if prefix in used_prefixes:
+                used_prefixes[prefix] += 1
+                prefix = f"{prefix}_{used_prefixes[prefix]}"
+            else:
+                used_prefixes[prefix] = 1
+
+            entry['pdb_file'] = str(Path(pdb).resolve())
+            entry['output_prefix'] = prefix
+            entry['work_dir'] = str(Path(entry.pop('work_dir', work_dir)).resolve() / prefix)
+            entries.append(entry)
+
+    return entries
+
+
+def _run_batch_entry(entry):
+    """
+    배치 워커: 한 구조에 대해 전체 파이프라인 실행
+
+    진행 메시지가 섞이지 않도록 표준 출력은 구조별 로그 파일({prefix}_run.log)로 보냅니다.
+    """
+    import contextlib
+    import time
+
+    work_path = Path(entry['work_dir'])
+    work_path.mkdir(parents=True, exist_ok=True)
+    log_file = work_path / f"{entry['output_prefix']}_run.log"
+
+    start = time.time()
+    with open(log_file, 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            result = run_full_analysis(**entry)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+    return _batch_row(entry, result, log_file, time.time() - start)
+
+
+def _batch_row(entry, result, log_file, elapsed):
+    """배치 요약 테이블의 구조별 결과 행"""
+    conductance = None
+    if result.get('success') and result.get('hole_output'):
+        conductance = get_conductance(result['hole_output'])
+
+    return {
+        'name': entry['output_prefix'],
+        'pdb_file': entry['pdb_file'],
+        'work_dir': entry['work_dir'],
+        'success': bool(result.get('success')),
+        'min_radius': result.get('min_radius'),
+        'geometric_factor': conductance['geometric_factor'] if conductance else None,
+        'conductance': conductance['macroscopic_conductance'] if conductance else None,
+        'plot_file': result.get('plot_file'),
+        'profile_file': result.get('profile_file'),
+        'pore_pdb': result.get('pore_pdb'),
+        'pymol_png': result.get('pymol_png'),
+        'log_file': str(log_file),
+        'elapsed': elapsed,
+        'error': result.get('error'),
+        'metrics': result.get('metrics')
+    }
+
+
+BATCH_SUMMARY_COLUMNS = ['name', 'success', 'min_radius', 'geometric_factor', 'conductance',
+                         'elapsed', 'pdb_file', 'work_dir', 'plot_file', 'profile_file',
+                         'pore_pdb', 'pymol_png', 'log_file', 'error']
+
+
+def compare_batch_profiles(rows, work_dir="output", n_clusters=4, align=None):
+    """
+    배치 결과의 프로파일 배열 비교 (hole_compare.compare_profiles)
+
+    {work_dir}/batch_comparison_{band,heatmap,cluster}.png 와
+    batch_comparison_matrix.{npz,tsv} (구조 × 공통 채널 좌표 반경 행렬)를 생성합니다.
+
+    Parameters
+    ----------
+    rows : list of dict
+        run_batch_analysis / run_batch_async 반환값
+    work_dir : str
+        배치 출력 상위 디렉토리
+    n_clusters : int
+        프로파일 군집 수
+    align : str, optional
+        채널 좌표 정렬 방법 ('xcorr', 'constriction') - 쌍별 결과는
+        {work_dir}/batch_comparison_pairs.npz에 캐시되어 구조를 추가해도 새 쌍만 계산
+
+    Returns
+    -------
+    dict or None
+        compare_profiles 결과 (비교할 프로파일이 2개 미만이면 None)
+    """
+    from hole_compare import compare_profiles
+
+    sources = [row['profile_file'] for row in rows if row.get('success') and row.get('profile_file')]
+    if len(sources) < 2:
+        print("프로파일 비교 건너뜀 (성공한 구조가 2개 미만)")
+        return None
+
+    print()
+    return compare_profiles(sources, work_dir=work_dir, output_prefix="batch_comparison",
+                            n_clusters=n_clusters, align=align)
+
+
+def save_batch_summary(rows, tsv_file):
+    """
+    배치 결과 요약 테이블을 TSV 파일로 저장
+
+    Parameters
+    ----------
+    rows : list of dict
+        run_batch_analysis 반환값
+    tsv_file : str
+        저장할 TSV 파일 경로
+
+    Returns
+    -------
+    str
+        생성된 TSV 파일 경로
+    """
+    def _format(value):
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        return str(value)
+
+    lines = ['\t'.join(BATCH_SUMMARY_COLUMNS)]
+    for row in rows:
+        lines.append('\t'.join(_format(row.get(col)) for col in BATCH_SUMMARY_COLUMNS))
+
+    Path(tsv_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(tsv_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    return str(tsv_file)
+
+
+def run_batch_analysis(structures, work_dir="output", max_workers=None,
+                       summary_file=None, **options):
+    """
+    여러 구조에 대해 전체 분석 파이프라인을 병렬 실행 (프로세스 풀)
+
+    각 구조는 {work_dir}/{prefix}/ 에서 독립적으로 HOLE → 그래프 → PyMOL 단계를
+    수행하며, 완료 후 구조별 핵심 결과를 하나의 요약 테이블로 모읍니다.
+
+    Parameters
+    ----------
+    structures : list
+        PDB 경로, glob 패턴 또는 YAML 항목(dict) 목록 (expand_batch_entries 참고)
+    work_dir : str
+        배치 출력 상위 디렉토리
+    max_workers : int, optional
+        동시 실행 구조 수 (기본: CPU 코어 수)
+    summary_file : str, optional
+        요약 TSV 경로 (기본: {work_dir}/batch_summary.tsv)
+    **options
+        모든 구조에 공통으로 적용할 run_full_analysis 인자
+        (endrad, radius_file, ignore_residues, cvect, cpoint, cache, multistart,
+        sample, adaptive, max_endrad, metrics_file, resume)
+
+    Returns
+    -------
+    list of dict
+        구조별 결과 행 (입력 순서 유지):
+        - 'name', 'pdb_file', 'work_dir', 'success'
+        - 'min_radius', 'geometric_factor', 'conductance' (pS)
+        - 'plot_file', 'profile_file', 'pore_pdb', 'pymol_png', 'log_file'
+        - 'elapsed': float - 구조별 소요 시간 (초)
+        - 'error': str - 실패 원인 (실패 시)
+        - 'metrics': list of dict - 단계별 측정 기록 (TSV에는 저장하지 않음)
+
+    Examples
+    --------
+    >>> rows = run_batch_analysis(["example/*.pdb"], work_dir="screen", max_workers=8)
+    >>> for row in rows:
+    ...     print(row['name'], row['min_radius'])
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    entries = expand_batch_entries(structures, work_dir=work_dir, **options)
+    if not entries:
+        print("✗ 배치 분석할 PDB 파일이 없습니다.")
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(entries)))
+
+    print("=" * 60)
+    print("HOLE 배치 분석 파이프라인")
+    print("=" * 60)
+    print(f"구조 수: {len(entries)}")
+    print(f"병렬 작업 수: {max_workers}")
+    print(f"출력 위치: {work_dir}/")
+
+    rows = [None] * len(entries)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_run_batch_entry, entry): i
+                   for i, entry in enumerate(entries)}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            entry = entries[i]
+            try:
+                row = future.result()
+            except Exception as e:
+                # 워커 프로세스 자체가 실패한 경우
+                row = {'name': entry['output_prefix'], 'pdb_file': entry['pdb_file'],
+                       'work_dir': entry['work_dir'], 'success': False, 'error': str(e)}
+            rows[i] = row
+
+            if row['success']:
+                min_radius = row.get('min_radius')
+                radius_text = f"{min_radius:.3f} Å" if min_radius is not None else "N/A"
+                print(f"  [{done}/{len(entries)}] ✓ {row['name']} "
+                      f"(최소 반지름: {radius_text}, {row.get('elapsed', 0):.1f}s)")
+            else:
+                print(f"  [{done}/{len(entries)}] ✗ {row['name']}: {row.get('error') or 'Unknown error'}")
+
+    if summary_file is None:
+        summary_file = Path(work_dir) / "batch_summary.tsv"
+    save_batch_summary(rows, summary_file)
+
+    n_success = sum(1 for row in rows if row['success'])
+    print("\n" + "=" * 60)
+    print(f"배치 분석 완료: {n_success}/{len(rows)} 성공")
+    print("=" * 60)
+    print(f"요약 테이블: {summary_file}")
+
+    return rows
+
+
+# 비동기 파이프라인 단계별 기본 동시 실행 수 (지정하지 않은 단계는 max_workers)
+# plot은 스레드별 Agg 템플릿 그래프로 그려 동시 실행이 안전하지만 GIL에 묶여 이득이 적으므로 기본 1
+DEFAULT_STAGE_LIMITS = {'plot': 1, 'render': 2}
+
+
+class _ThreadStdout:
+    """
+    스레드별 출력 대상으로 write를 보내는 sys.stdout 대체 객체
+
+    비동기 파이프라인에서는 여러 구조의 단계가 스레드에서 동시에 실행되므로
+    contextlib.redirect_stdout(프로세스 전체) 대신 스레드마다 구조 로그 파일로 보냅니다.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _stream(self):
+        return getattr(self.local, 'stream', None) or self.default
+
+    def write(self, text):
+        return self._stream().write(text)
+
+    def flush(self):
+        self._stream().flush()
+
+
+def _run_stage_logged(name, stage, state, log, stdout):
+    """executor 스레드에서 단계 하나를 실행 (출력은 구조 로그 파일)"""
+    stdout.local.stream = log
+    try:
+        _run_stage(name, stage, state)
+    except Exception as e:
+        print(f"✗ 단계 실행 실패: {e}")
+        state['result'] = dict(state.get('result') or {}, success=False, error=str(e))
+    finally:
+        log.flush()
+        stdout.local.stream = None
+
+
+async def _run_entry_async(entry, semaphores, executor, stdout):
+    """구조 하나의 파이프라인 단계를 순서대로 실행 (단계마다 세마포어로 동시 실행 수 제한)"""
+    import asyncio
+    import inspect
+    import time
+
+    loop = asyncio.get_running_loop()
+    work_path = Path(entry['work_dir'])
+    work_path.mkdir(parents=True, exist_ok=True)
+    log_file = work_path / f"{entry['output_prefix']}_run.log"
+
+    # run_full_analysis 기본값을 채운 단계 옵션
+    options = {name: param.default for name, param in inspect.signature(run_full_analysis).parameters.items()
+               if param.default is not inspect.Parameter.empty}
+    options.update(entry)
+    try:
+        state = _analysis_state(options)
+    except ValueError as e:
+        return _batch_row(entry, {'success': False, 'error': str(e)}, log_file, 0.0)
+
+    start = time.time()
+    with open(log_file, 'w') as log:
+        for name, stage in ANALYSIS_STAGES:
+            async with semaphores[name]:
+                await loop.run_in_executor(executor, _run_stage_logged, name, stage, state, log, stdout)
+            if not state['result'].get('success'):
+                break
+        stdout.local.stream = log
+        try:
+            _report_metrics(state)
+        finally:
+            stdout.local.stream = None
+
+    return _batch_row(entry, state['result'], log_file, time.time() - start)
+
+
+async def _run_entries_async(entries, limits):
+    """모든 구조의 파이프라인을 동시에 시작하고 완료 순서대로 진행 상황 출력"""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    semaphores = {name: asyncio.Semaphore(limits[name]) for name, _ in ANALYSIS_STAGES}
+
+    async def run(i, entry):
+        try:
+            return i, await _run_entry_async(entry, semaphores, executor, stdout)
+        except Exception as e:
+            return i, {'name': entry['output_prefix'], 'pdb_file': entry['pdb_file'],
+                       'work_dir': entry['work_dir'], 'success': False, 'error': str(e)}
+
+    stdout = _ThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    rows = [None] * len(entries)
+    try:
+        # 단계 세마포어를 모두 채워도 스레드가 부족하지 않도록 동시 실행 수의 합만큼 생성
+        with ThreadPoolExecutor(max_workers=sum(limits.values())) as executor:
+            tasks = [run(i, entry) for i, entry in enumerate(entries)]
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                i, row = await task
+                rows[i] = row
+                if row['success']:
+                    min_radius = row.get('min_radius')
+                    radius_text = f"{min_radius:.3f} Å" if min_radius is not None else "N/A"
+                    print(f"  [{done}/{len(entries)}] ✓ {row['name']} "
+                          f"(최소 반지름: {radius_text}, {row.get('elapsed', 0):.1f}s)")
+                else:
+                    print(f"  [{done}/{len(entries)}] ✗ {row['name']}: {row.get('error') or 'Unknown error'}")
+    finally:
+        sys.stdout = stdout.default
+
+    return rows
+
+
+def run_batch_async(structures, work_dir="output", max_workers=None, stage_limits=None,
+                    summary_file=None, **options):
+    """
+    여러 구조의 분석 단계를 겹쳐 실행하는 비동기 배치 파이프라인 (asyncio)
+
+    run_batch_analysis는 구조마다 전체 파이프라인을 한 프로세스에서 순서대로 실행하므로
+    모든 워커가 동시에 HOLE 또는 PyMOL 렌더링에 몰릴 수 있습니다. 여기서는 구조마다
+    ANALYSIS_STAGES (hole → plot → pymol → render → finalize)를 순서대로 진행하되
+    단계별 세마포어로 동시 실행 수를 제한하므로, 구조 B의 HOLE이 구조 A의 PyMOL 렌더링과
+    겹쳐 실행되면서도 단계마다 코어를 과도하게 사용하지 않습니다.
+
+    단계 함수는 run_full_analysis와 같은 함수를 스레드 executor에서 실행합니다
+    (HOLE / sph_process / pymol 외부 프로세스를 기다리는 동안 GIL을 놓음).
+
+    Parameters
+    ----------
+    structures : list
+        PDB 경로, glob 패턴 또는 YAML 항목(dict) 목록 (expand_batch_entries 참고)
+    work_dir : str
+        배치 출력 상위 디렉토리
+    max_workers : int, optional
+        stage_limits에 없는 단계의 동시 실행 수 (기본: CPU 코어 수)
+    stage_limits : dict, optional
+        단계별 동시 실행 수 (예: {'hole': 8, 'render': 2}) - 기본값 DEFAULT_STAGE_LIMITS
+    summary_file : str, optional
+        요약 TSV 경로 (기본: {work_dir}/batch_summary.tsv)
+    **options
+        모든 구조에 공통으로 적용할 run_full_analysis 인자
+
+    Returns
+    -------
+    list of dict
+        구조별 결과 행 (run_batch_analysis와 동일, 입력 순서 유지)
+
+    Examples
+    --------
+    >>> rows = run_batch_async(["example/*.pdb"], work_dir="screen",
+    ...                        stage_limits={'hole': 8, 'render': 2})
+    """
+    import asyncio
+    import matplotlib
+
+    entries = expand_batch_entries(structures, work_dir=work_dir, **options)
+    if not entries:
+        print("✗ 배치 분석할 PDB 파일이 없습니다.")
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    limits = {name: max_workers for name, _ in ANALYSIS_STAGES}
+    limits.update(DEFAULT_STAGE_LIMITS)
+    limits.update(stage_limits or {})
+    limits = {name: max(1, min(int(limits[name]), len(entries))) for name, _ in ANALYSIS_STAGES}
+
+    # 그래프는 executor 스레드에서 그리므로 (hole_plot.ProfilePlotter는 Agg 캔버스 직접 사용)
+    # 다른 pyplot 호출도 GUI 백엔드 대신 파일 전용 백엔드 사용
+    matplotlib.use('Agg')
+
+    print("=" * 60)
+    print("HOLE 비동기 배치 파이프라인")
+    print("=" * 60)
+    print(f"구조 수: {len(entries)}")
+    print(f"단계별 동시 실행 수: {', '.join(f'{name}={limit}' for name, limit in limits.items())}")
+    print(f"출력 위치: {work_dir}/")
+
+    rows = asyncio.run(_run_entries_async(entries, limits))
+
+    if summary_file is None:
+        summary_file = Path(work_dir) / "batch_summary.tsv"
+    save_batch_summary(rows, summary_file)
+
+    n_success = sum(1 for row in rows if row['success'])
+    print("\n" + "=" * 60)
+    print(f"배치 분석 완료: {n_success}/{len(rows)} 성공")
+    print("=" * 60)
+    print(f"요약 테이블: {summary_file}")
+
+    return rows
+
+
+def iter_pdb_models(pdb_file):
+    """
+    멀티 모델 PDB 파일에서 MODEL 블록을 순서대로 스트리밍
+
+    파일 전체를 메모리에 올리지 않고 한 번만 읽습니다.
+    MODEL 레코드가 없는 단일 구조 파일은 하나의 프레임으로 취급합니다.
+
+    Parameters
+    ----------
+    pdb_file : str
+        멀티 모델 PDB 파일 경로
+
+    Yields
+    ------
+    tuple
+        (모델 번호, ATOM/HETATM 라인 리스트)
+    """
+    model_num = None
+    atom_lines = []
+    frame_index = 0
+
+    with open(pdb_file, 'r') as f:
+        for line in f:
+            if line.startswith(('ATOM', 'HETATM')):
+                atom_lines.append(line)
+            elif line.startswith('MODEL'):
+                parts = line.split()
+                model_num = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else frame_index + 1
+            elif line.startswith('ENDMDL'):
+                yield (model_num if model_num is not None else frame_index + 1), atom_lines
+                frame_index += 1
+                model_num = None
+                atom_lines = []
+
+    # ENDMDL 없이 끝난 마지막 블록 (또는 단일 구조)
+    if atom_lines:
+        yield (model_num if model_num is not None else frame_index + 1), atom_lines
+
+
+def _atom_selection(frame_table, ignore_residues):
+    """
+    프레임 원자 테이블에 대한 유지 여부 마스크 생성 (run_hole과 동일한 필터 규칙)
+
+    같은 토폴로지의 프레임에서는 한 번 계산한 마스크를 그대로 재사용합니다.
+    """
+    remove_set, remove_all_hetatm = _hole_remove_set(ignore_residues)
+    keep, _, _ = selection_mask(frame_table, remove_set, remove_all_hetatm)
+    return keep
+
+
+def _run_hole_frame(frame_num, frame_prefix, frame_path, input_content, keep_files):
+    """
+    트라젝토리 워커: 필터링된 프레임 하나에 대해 HOLE 실행 후 프로파일 추출
+
+    HOLE은 작업 디렉토리에 고정 이름의 임시 파일(sr_gseed_tempfile)을 만들기 때문에
+    동시에 실행되는 프레임은 각자의 디렉토리(frame_path)에서 실행해야 합니다.
+    """
+    import shutil
+
+    input_file = frame_path / f"{frame_prefix}.inp"
+    output_file = frame_path / f"{frame_prefix}_out.txt"
+
+    with open(input_file, 'w') as f:
+        f.write(input_content)
+
+    frame = {'frame': frame_num, 'success': False}
+    try:
+        with open(input_file, 'r') as inp, open(output_file, 'w') as out:
+            proc = run_process(
+                [HOLE_EXE],
+                stdin=inp,
+                stdout=out,
+                stderr=subprocess.PIPE,
+                cwd=frame_path,
+                text=True,
+                timeout=120
+            )
+
+        parsed = parse_hole_file(output_file) if proc.returncode == 0 else None
+        if parsed is not None and len(parsed) > 0:
+            frame.update({
+                'success': True,
+                'channel_coord': parsed.channel_coord,
+                'radius': parsed.radius,
+                'min_radius': parsed.min_radius,
+                'conductance': parsed.conductance
+            })
+        else:
+            frame['error'] = proc.stderr or 'No profile data in HOLE output'
+    except subprocess.TimeoutExpired:
+        frame['error'] = 'Timeout (>120s)'
+    except Exception as e:
+        frame['error'] = str(e)
+    finally:
+        # 프레임별 임시 디렉토리 정리
+        if not keep_files:
+            shutil.rmtree(frame_path, ignore_errors=True)
+
+    return frame
+
+
+def run_hole_trajectory(pdb_file, output_prefix="trajectory", endrad=5.0, work_dir=".",
+                        radius_file=None, ignore_residues=None, cvect=None, cpoint=None,
+                        max_workers=None, bin_width=0.25, stride=1, keep_frame_files=False,
+                        sample=None):
+    """
+    멀티 모델 PDB (MD 트라젝토리)의 프레임별 HOLE 기공 프로파일 계산
+
+    MODEL 블록을 스트리밍으로 한 번만 읽고, 첫 프레임에서 계산한 원자 선택
+    (ignore 잔기 / HETATM 제거)을 모든 프레임에 재사용합니다. 필터링된 프레임은
+    HOLE 입력용 임시 파일로 한 번에 기록되며, 여러 프레임의 HOLE을 동시에 실행합니다.
+
+    Parameters
+    ----------
+    pdb_file : str
+        멀티 모델 PDB 파일 경로 (MODEL/ENDMDL 블록)
+    output_prefix : str
+        출력 파일 접두사
+    endrad : float
+        채널 종료 반지름 (Angstrom)
+    work_dir : str
+        작업 디렉토리 (프레임 임시 파일은 {work_dir}/frames/{prefix}_fNNNNN/)
+    radius_file : str, optional
+        반지름 파일 경로 (기본값: simple.rad)
+    ignore_residues : list of str, optional
+        제거할 잔기 목록 (run_hole과 동일)
+    cvect, cpoint : list of float or 'auto', optional
+        채널 방향 벡터 / 시작점 (모든 프레임에 공통 적용, 'auto'이면 첫 프레임에서 탐지)
+    max_workers : int, optional
+        동시 실행 HOLE 프로세스 수 (기본: CPU 코어 수)
+    bin_width : float
+        공통 채널 좌표 격자 간격 (Angstrom)
+    stride : int
+        프레임 간격 (예: 10이면 10 프레임마다 하나씩 분석)
+    keep_frame_files : bool
+        프레임별 .pdb/.inp/_out.txt 파일 유지 여부 (기본: 삭제)
+    sample : float, optional
+        채널 축 방향 샘플링 간격 (Angstrom, 기본값: HOLE 기본 0.25)
+
+    Returns
+    -------
+    dict
+        - 'success': bool - 하나 이상의 프레임 성공 여부
+        - 'frames': np.ndarray - 성공한 프레임의 모델 번호 (n_frames,)
+        - 'channel_coord': np.ndarray - 공통 채널 좌표 격자 (n_bins,)
+        - 'radius': np.ndarray - 프레임 × 격자 반경 행렬 (n_frames, n_bins),
+          프레임 프로파일 범위 밖은 NaN
+        - 'min_radius': np.ndarray - 프레임별 최소 반경 (n_frames,)
+        - 'conductance': np.ndarray - 프레임별 Gmacro (pS) (n_frames,)
+        - 'failed_frames': list of dict - 실패한 프레임 번호와 원인
+        - 'output_file': str - 결과 배열 저장 파일 (.npz)
+        - 'timeseries_file': str - 프레임별 최소 반경/전도도 TSV
+
+    Examples
+    --------
+    >>> traj = run_hole_trajectory("md_frames.pdb", work_dir="traj", max_workers=16)
+    >>> traj['radius'].shape
+    (1000, 245)
+    >>> print(f"평균 최소 반경: {traj['min_radius'].mean():.2f} Å")
+    """
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    work_path = Path(work_dir).resolve()
+    frames_path = work_path / "frames"
+    frames_path.mkdir(parents=True, exist_ok=True)
+
+    pdb_path = Path(pdb_file).resolve()
+    if not pdb_path.exists():
+        return {'success': False, 'error': f'PDB file not found: {pdb_path}'}
+
+    if radius_file is None:
+        radius_file = HOLE_RAD
+    else:
+        radius_file = os.path.expanduser(radius_file)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    print("=" * 60)
+    print("HOLE 트라젝토리 분석")
+    print("=" * 60)
+    print(f"입력 파일: {pdb_file}")
+    print(f"병렬 작업 수: {max_workers}")
+
+    keep = None
+    frames = []
+    pending = set()
+
+    # HOLE은 CPU 바운드 외부 프로세스이므로 스레드 풀로 충분 (프레임 데이터 피클링 불필요)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for index, (frame_num, atom_lines) in enumerate(iter_pdb_models(pdb_path)):
+            if index % stride:
+                continue
+
+            frame_table = AtomTable.from_lines(atom_lines)
+
+            # 원자 선택은 첫 프레임에서 한 번만 계산 (원자 수가 다르면 재계산)
+            if keep is None or len(keep) != len(atom_lines):
+                if keep is not None:
+                    print(f"  Warning: 프레임 {frame_num}의 원자 수가 달라 선택을 다시 계산합니다.")
+                keep = _atom_selection(frame_table, ignore_residues)
+
+            # 채널 축 자동 탐지는 첫 프레임에서 한 번만 (모든 프레임에 같은 축 적용)
+            if cvect == 'auto' or cpoint == 'auto':
+                cvect, cpoint, _ = resolve_channel_axis(frame_table, keep[frame_table.atom_index],
+                                                        cvect, cpoint, endrad=endrad)
+
+            frame_prefix = f"{output_prefix}_f{frame_num:05d}"
+            frame_path = frames_path / frame_prefix
+            frame_path.mkdir(exist_ok=True)
+            frame_pdb = frame_path / f"{frame_prefix}.pdb"
+            write_pdb(frame_table, frame_pdb, keep, trailer="END\n")
+
+            input_content = build_hole_input(
+                frame_pdb, radius_file, endrad,
+                source_name=f"{pdb_path.name} (MODEL {frame_num})",
+                ignore_residues=ignore_residues,
+                cvect=cvect,
+                cpoint=cpoint,
+                sample=sample
+            )
+
+            # 제출 대기열을 제한하여 프레임 파일이 디스크에 쌓이지 않도록 함
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                frames.extend(future.result() for future in done)
+
+            pending.add(pool.submit(_run_hole_frame, frame_num, frame_prefix, frame_path,
+                                    input_content, keep_frame_files))
+
+        frames.extend(future.result() for future in wait(pending).done)
+
+    frames.sort(key=lambda frame: frame['frame'])
+    succeeded = [frame for frame in frames if frame['success']]
+    failed = [{'frame': frame['frame'], 'error': frame.get('error')}
+              for frame in frames if not frame['success']]
+
+    print(f"✓ {len(succeeded)}/{len(frames)} 프레임 분석 완료")
+    if failed:
+        print(f"  Warning: 실패한 프레임 {len(failed)}개: "
+              f"{', '.join(str(frame['frame']) for frame in failed[:10])}")
+
+    if not succeeded:
+        return {'success': False, 'error': 'No frame analysed successfully',
+                'failed_frames': failed}
+
+    # 공통 채널 좌표 격자에 프레임별 프로파일 보간 (범위 밖은 NaN)
+    coord_min = min(frame['channel_coord'].min() for frame in succeeded)
+    coord_max = max(frame['channel_coord'].max() for frame in succeeded)
+    grid = np.arange(coord_min, coord_max + bin_width / 2, bin_width)
+
+    radius = np.full((len(succeeded), len(grid)), np.nan)
+    for i, frame in enumerate(succeeded):
+        radius[i] = np.interp(grid, frame['channel_coord'], frame['radius'],
+                              left=np.nan, right=np.nan)
+
+    result = {
+        'success': True,
+        'frames': np.array([frame['frame'] for frame in succeeded]),
+        'channel_coord': grid,
+        'radius': radius,
+        'min_radius': np.array([frame['min_radius'] for frame in succeeded], dtype=float),
+        'conductance': np.array([frame['conductance'] for frame in succeeded], dtype=float),
+        'failed_frames': failed
+    }
+
+    # 결과 저장: 배열 (.npz) + 시계열 (.tsv)
+    npz_file = work_path / f"{output_prefix}_trajectory.npz"
+    np.savez_compressed(npz_file, frames=result['frames'], channel_coord=grid, radius=radius,
+                        min_radius=result['min_radius'], conductance=result['conductance'])
+
+    tsv_file = work_path / f"{output_prefix}_trajectory.tsv"
+    lines = ["frame\tmin_radius\tconductance"]
+    for frame_num, min_radius, conductance in zip(result['frames'], result['min_radius'],
+                                                  result['conductance']):
+        lines.append(f"{frame_num}\t{min_radius:.5f}\t{conductance:.5f}")
+    with open(tsv_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    result['output_file'] = str(npz_file)
+    result['timeseries_file'] = str(tsv_file)
+
+    print(f"  프로파일 행렬: {radius.shape[0]} 프레임 × {radius.shape[1]} 격자")
+    print(f"  배열 파일: {npz_file}")
+    print(f"  시계열 파일: {tsv_file}")
+
     return result
 
 
 if __name__ == "__main__":
     """커맨드라인 실행 인터페이스"""
-    import sys
     import argparse
 
     parser = argparse.ArgumentParser(
-        description='HOLE 전체 분석 파이프라인 (YAML 설정 파일 필수)',
+        description='HOLE 전체 분석 파이프라인 (YAML 설정 파일 또는 --pdb 배치 입력)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 예시:
@@ -642,19 +2362,83 @@ if __name__ == "__main__":
 
   # 또는 --config 옵션 사용
   python hole_runner.py --config hole_config.yml
+
+  # 배치 모드: 여러 PDB를 병렬 분석 (YAML은 공통 설정으로 사용)
+  python hole_runner.py hole_config.yml --pdb "example/*.pdb" --workers 8
+
+  # 배치 모드: YAML의 structures 목록 사용
+  python hole_runner.py batch_config.yml -j 16
+
+  # 비동기 배치: 단계별 동시 실행 수를 제한하며 구조 간 단계를 겹쳐 실행
+  python hole_runner.py hole_config.yml --pdb "example/*.pdb" --async -j 8
+
+  # 트라젝토리 모드: 멀티 모델 PDB의 프레임별 프로파일
+  python hole_runner.py hole_config.yml --trajectory -j 16
+
+  # 다중 시작점: 시작점/축 후보 8개 중 가장 좋은 HOLE 경로 선택
+  python hole_runner.py hole_config.yml --multistart 8
+
+  # 적응형: endrad를 입구까지 늘리고 좁은 구간만 정밀 샘플링
+  python hole_runner.py hole_config.yml --adaptive
+
+  # 배치 스크린은 빠른 미리보기로, 선택한 구조만 고해상도로 다시 렌더링 (HOLE/그래프 단계는 재개)
+  python hole_runner.py hole_config.yml --pdb "example/*.pdb" --lod preview
+  python hole_runner.py hole_config.yml --pdb example/opm_1k4c.pdb --lod publication
+
+  # 단계별 시간/자원 측정 기록
+  python hole_runner.py hole_config.yml --metrics metrics.jsonl
+
+  # 배치 후 프로파일 비교 (분포 띠, 히트맵, 군집, 정렬된 행렬)
+  python hole_runner.py hole_config.yml --pdb "example/*.pdb" --compare
+  python hole_runner.py hole_config.yml --pdb "example/*.pdb" --compare --align xcorr
         """
     )
 
     parser.add_argument('config_file', nargs='?', help='YAML 설정 파일 경로')
     parser.add_argument('--config', '-c', help='YAML 설정 파일 경로 (대체 방법)')
+    parser.add_argument('--pdb', nargs='+', metavar='PDB',
+                        help='배치 모드: PDB 파일 경로 또는 glob 패턴 목록')
+    parser.add_argument('--workers', '-j', type=int, default=None,
+                        help='병렬 작업 수 (배치/트라젝토리 모드, 기본: CPU 코어 수)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='배치 모드를 단계별 비동기 파이프라인으로 실행 (구조 간 HOLE/렌더링 겹쳐 실행)')
+    parser.add_argument('--summary', help='배치 요약 TSV 경로 (기본: {work_dir}/batch_summary.tsv)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='결과 캐시를 사용하지 않고 모든 단계를 다시 실행')
+    parser.add_argument('--compare', action='store_true',
+                        help='배치 완료 후 프로파일 비교 (분포 띠 / 히트맵 / 군집 그래프, 정렬된 행렬)')
+    parser.add_argument('--align', choices=['xcorr', 'constriction'], default=None,
+                        help='프로파일 비교 전 채널 좌표 정렬: xcorr (교차상관) / constriction (최소 반경 지점 기준)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='이전 실행 매니페스트를 무시하고 완료된 단계도 다시 실행')
+    parser.add_argument('--cache-dir', help='결과 캐시 디렉토리 (기본: $HOLE_CACHE_DIR 또는 ~/.cache/hole2)')
+    parser.add_argument('--trajectory', action='store_true',
+                        help='트라젝토리 모드: pdb_file의 MODEL 블록별로 HOLE 실행')
+    parser.add_argument('--stride', type=int, default=None,
+                        help='트라젝토리 모드 프레임 간격 (기본: 1)')
+    parser.add_argument('--surface-engine', choices=['sph_process', 'numpy'], default=None,
+                        help='기공 표면 점 생성 엔진 (기본: sph_process)')
+    parser.add_argument('--render-engine', choices=RENDER_ENGINES, default=None,
+                        help='PNG 렌더링 엔진 (기본: auto - pymol2 모듈이 있으면 프로세스 내 렌더링, '
+                             'PyMOL이 없으면 projection: NumPy 투영)')
+    parser.add_argument('--multistart', type=int, default=None, metavar='N',
+                        help='시작점/축 후보 N개로 HOLE을 동시에 실행하여 최적 경로 선택 (기본: 사용 안 함)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='endrad를 입구에 도달할 때까지 늘리고 좁은 구간만 작은 sample로 정밀화')
+    parser.add_argument('--lod', choices=list(LOD_PRESETS), default=None,
+                        help='세부 수준 프리셋: preview (빠른 미리보기) / report (기본) / publication (고해상도)')
+    parser.add_argument('--image-format', choices=list(IMAGE_FORMATS), default=None,
+                        help='최종 시각화 이미지 형식 (기본: png, 미리보기는 webp / jpeg)')
+    parser.add_argument('--metrics', metavar='FILE', default=None,
+                        help='단계별 시간/CPU/자식 프로세스 RSS/출력 크기를 JSON lines 파일에 추가 기록')
 
     args = parser.parse_args()
 
     # 설정 파일 경로 결정
     config_file = args.config if args.config else args.config_file
 
-    if not config_file:
-        print("✗ 오류: YAML 설정 파일이 필요합니다.")
+    if not config_file and not args.pdb:
+        print("✗ 오류: YAML 설정 파일 또는 --pdb 입력이 필요합니다.")
         print()
         parser.print_help()
         sys.exit(1)
@@ -662,47 +2446,133 @@ if __name__ == "__main__":
     # YAML 설정 파일 로드
     import yaml
 
-    try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-
-        # YAML에서 파라미터 읽기
-        pdb_file = config.get('pdb_file')
-        endrad = config.get('endrad', 5.0)
-        work_dir = config.get('work_dir', 'output')
-        radius_file = config.get('radius_file')
-        ignore_residues = config.get('ignore')
-        cvect = [0.0, 0.0, 1.0]  # 채널 방향 벡터 (Z축 고정)
-        cpoint = None  # 채널 시작점 (자동 탐지 사용)
-
-        # output_prefix 자동 생성 (지정되지 않은 경우 PDB 파일명 사용)
-        output_prefix = config.get('output_prefix')
-        if not output_prefix:
-            from pathlib import Path
-            # PDB 파일명에서 확장자 제거하여 prefix로 사용
-            output_prefix = Path(pdb_file).stem
-            print(f"output_prefix 미지정 → 자동 설정: {output_prefix}")
-
-        # radius_file이 상대 경로면 절대 경로로 변환
-        if radius_file and not radius_file.startswith('/'):
-            # rad 파일은 ~/MODEL/hole2/rad/ 디렉토리에 있음
-            import os
-            rad_dir = os.path.expanduser("~/MODEL/hole2/rad")
-            radius_file = os.path.join(rad_dir, radius_file)
-
-        if not pdb_file:
-            print("✗ 오류: YAML 설정 파일에 pdb_file이 지정되지 않았습니다.")
-            sys.exit(1)
+    config = {}
+    if config_file:
+        try:
+            with open(config_file, 'r') as f:
+                config = yaml.safe_load(f) or {}
+            print(f"YAML 설정 파일 사용: {config_file}")
 
-        print(f"YAML 설정 파일 사용: {config_file}")
+        except FileNotFoundError:
+            print(f"✗ 오류: 설정 파일을 찾을 수 없습니다: {config_file}")
+            sys.exit(1)
+        except yaml.YAMLError as e:
+            print(f"✗ 오류: YAML 파일 파싱 실패: {e}")
+            sys.exit(1)
 
-    except FileNotFoundError:
-        print(f"✗ 오류: 설정 파일을 찾을 수 없습니다: {config_file}")
+    # YAML에서 파라미터 읽기
+    pdb_file = config.get('pdb_file')
+    endrad = config.get('endrad', 5.0)
+    work_dir = config.get('work_dir', 'output')
+    radius_file = resolve_radius_file(config.get('radius_file'))
+    ignore_residues = config.get('ignore')
+    cvect = config.get('cvect', 'auto')  # 채널 방향 벡터 ('auto': 원자 좌표에서 탐지)
+    cpoint = config.get('cpoint', 'auto')  # 채널 시작점 ('auto': 탐지된 터널 가운데)
+    render_engine = args.render_engine or config.get('render_engine', 'auto')
+    surface_engine = args.surface_engine or config.get('surface_engine', 'sph_process')
+    profile_format = config.get('profile_format', 'npz')
+    multistart = args.multistart if args.multistart is not None else config.get('multistart', 0)
+    sample = config.get('sample')  # HOLE 샘플링 간격 (adaptive: 좁은 구간 정밀화 간격)
+    adaptive = args.adaptive or config.get('adaptive', False)
+    max_endrad = config.get('max_endrad')
+    metrics_file = args.metrics or config.get('metrics_file')  # 단계별 측정 JSON lines
+    if metrics_file:
+        metrics_file = str(Path(metrics_file).resolve())
+    resume = not args.no_resume and config.get('resume', True)  # 완료된 단계 건너뛰기
+    pore_sidecar = config.get('pore_sidecar', False)  # 기공 표면 점 바이너리 사이드카 (.npz)
+    lod = args.lod or config.get('lod')  # 세부 수준 프리셋 (preview / report / publication)
+    image_format = args.image_format or config.get('image_format', 'png')  # 최종 이미지 형식
+    image_quality = config.get('image_quality', IMAGE_QUALITY)  # WebP / JPEG 품질
+    png_compress_level = config.get('png_compress_level', PNG_COMPRESS_LEVEL)  # PNG zlib 수준
+    if image_format not in IMAGE_FORMATS:
+        print(f"✗ 오류: 알 수 없는 image_format: {image_format} (가능: {', '.join(IMAGE_FORMATS)})")
         sys.exit(1)
-    except yaml.YAMLError as e:
-        print(f"✗ 오류: YAML 파일 파싱 실패: {e}")
+    if lod is not None:
+        try:
+            lod_settings(lod)
+        except ValueError as e:
+            print(f"✗ 오류: {e}")
+            sys.exit(1)
+
+    # 결과 캐시 (같은 구조 + 파라미터면 HOLE/그래프/PyMOL 단계 생략)
+    cache = None
+    if not args.no_cache and config.get('cache', True):
+        cache_max_mb = config.get('cache_max_mb')
+        cache = ResultCache(
+            args.cache_dir or config.get('cache_dir'),
+            max_bytes=int(cache_max_mb * 1024 ** 2) if cache_max_mb else DEFAULT_CACHE_MAX_BYTES
+        )
+
+    # 배치 모드: --pdb 목록 또는 YAML의 structures 목록
+    structures = args.pdb or config.get('structures')
+    if structures:
+        batch_options = {}
+        if args.use_async or config.get('async'):
+            # 단계별 동시 실행 수 (YAML stage_limits: {hole: 8, render: 2})
+            batch_runner = run_batch_async
+            batch_options['stage_limits'] = config.get('stage_limits')
+        else:
+            batch_runner = run_batch_analysis
+        rows = batch_runner(
+            structures,
+            work_dir=work_dir,
+            max_workers=args.workers,
+            summary_file=args.summary,
+            **batch_options,
+            endrad=endrad,
+            radius_file=radius_file,
+            ignore_residues=ignore_residues,
+            cvect=cvect,
+            cpoint=cpoint,
+            cache=cache,
+            render_engine=render_engine,
+            surface_engine=surface_engine,
+            profile_format=profile_format,
+            multistart=multistart,
+            sample=sample,
+            adaptive=adaptive,
+            max_endrad=max_endrad,
+            metrics_file=metrics_file,
+            resume=resume,
+            pore_sidecar=pore_sidecar,
+            lod=lod,
+            image_format=image_format,
+            image_quality=image_quality,
+            png_compress_level=png_compress_level
+        )
+        if args.compare or config.get('compare'):
+            compare_batch_profiles(rows, work_dir=work_dir, n_clusters=config.get('compare_clusters', 4),
+                                   align=args.align or config.get('compare_align'))
+        sys.exit(0 if rows and all(row['success'] for row in rows) else 1)
+
+    if not pdb_file:
+        print("✗ 오류: YAML 설정 파일에 pdb_file이 지정되지 않았습니다.")
         sys.exit(1)
 
+    # output_prefix 자동 생성 (지정되지 않은 경우 PDB 파일명 사용)
+    output_prefix = config.get('output_prefix')
+    if not output_prefix:
+        # PDB 파일명에서 확장자 제거하여 prefix로 사용
+        output_prefix = Path(pdb_file).stem
+        print(f"output_prefix 미지정 → 자동 설정: {output_prefix}")
+
+    # 트라젝토리 모드: 멀티 모델 PDB의 프레임별 분석
+    if args.trajectory or config.get('trajectory'):
+        result = run_hole_trajectory(
+            pdb_file=pdb_file,
+            output_prefix=output_prefix,
+            endrad=endrad,
+            work_dir=work_dir,
+            radius_file=radius_file,
+            ignore_residues=ignore_residues,
+            cvect=cvect,
+            cpoint=cpoint,
+            max_workers=args.workers,
+            stride=args.stride or config.get('stride', 1),
+            sample=sample
+        )
+        sys.exit(0 if result['success'] else 1)
+
     # 전체 분석 실행
     result = run_full_analysis(
         pdb_file=pdb_file,
@@ -712,7 +2582,22 @@ if __name__ == "__main__":
         radius_file=radius_file,
         ignore_residues=ignore_residues,
         cvect=cvect,
-        cpoint=cpoint
+        cpoint=cpoint,
+        cache=cache,
+        render_engine=render_engine,
+        surface_engine=surface_engine,
+        profile_format=profile_format,
+        multistart=multistart,
+        sample=sample,
+        adaptive=adaptive,
+        max_endrad=max_endrad,
+        metrics_file=metrics_file,
+        resume=resume,
+        pore_sidecar=pore_sidecar,
+        lod=lod,
+        image_format=image_format,
+        image_quality=image_quality,
+        png_compress_level=png_compress_level
     )
 
     # 종료 코드 반환
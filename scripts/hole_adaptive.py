@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+HOLE endrad / sample 적응형 정밀화
+=================================
+큰 sample / 보수적인 endrad로 먼저 전체 경로를 찾고, 프로파일이 단백질 안에서
+endrad에 걸려 잘렸는지 판단하여 endrad를 늘린 뒤, 좁은 구간만 작은 sample로 다시 계산
+
+- 입구 판단: 축 주변 원자의 축 방향 범위 밖까지 경로가 이어졌으면 입구(mouth)에 도달한 것
+- 정밀화: 최소 반경 구 중심에서 시작하고 endrad = 최소 반경 + 여유로 실행하면
+  HOLE이 좁은 구간만 따라가므로 전체 경로를 다시 계산하지 않음
+- HOLE 실행은 hole_runner.run_hole_adaptive에서 수행
+
+사용 예시:
+---------
+from hole_adaptive import protein_span, mouth_status, constriction_start, merge_profiles
+
+span = protein_span(coords, cvect, cpoint)
+low, high = mouth_status(coarse.channel_coord, span)
+start, fine_endrad = constriction_start(coarse, centres, radii)
+merged = merge_profiles(coarse, fine)
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+from hole_axis import _unit, ENCLOSE_RADIUS
+
+
+# 첫 실행 sample (HOLE 기본값 0.25 Å의 두 배) / 좁은 구간 정밀화 sample (Angstrom)
+COARSE_SAMPLE = 0.5
+FINE_SAMPLE = 0.1
+
+# endrad 증가 배율 / 상한 (Angstrom)
+ENDRAD_GROWTH = 2.0
+MAX_ENDRAD = 20.0
+
+# 경로 끝이 단백질 축 방향 범위 끝에서 이 거리 이내이면 입구에 도달한 것으로 판단 (Angstrom)
+MOUTH_MARGIN = 3.0
+
+# 좁은 구간: 최소 반경 + CONSTRICTION_MARGIN 이하인 연속 구간 (Angstrom)
+CONSTRICTION_MARGIN = 1.0
+
+
+def protein_span(coords, cvect, cpoint, radius=ENCLOSE_RADIUS):
+    """
+    채널 축 주변 원자의 축 방향 좌표 범위
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        필터링된 원자 좌표 (N, 3)
+    cvect, cpoint : list of float
+        채널 방향 벡터 / 축 위의 점
+    radius : float
+        축에서 이 거리 이내의 원자만 사용 (Angstrom) - 옆으로 떨어진 세포질 도메인 제외
+
+    Returns
+    -------
+    tuple of float or None
+        (최소, 최대) - HOLE 채널 좌표(cenxyz.cvec)와 같은 기준, 축 주변에 원자가 없으면 None
+    """
+    axis = _unit(cvect)
+    coords = np.asarray(coords, dtype=float)
+    offset = coords - np.asarray(cpoint, dtype=float)
+    lateral = offset - np.outer(offset @ axis, axis)
+    near = np.einsum('ij,ij->i', lateral, lateral) <= radius ** 2
+    if not near.any():
+        return None
+    along = coords[near] @ axis
+    return float(along.min()), float(along.max())
+
+
+def mouth_status(channel_coord, span, margin=MOUTH_MARGIN):
+    """
+    프로파일 양 끝이 단백질 입구까지 이어졌는지 판단
+
+    Parameters
+    ----------
+    channel_coord : np.ndarray
+        HOLE 채널 좌표
+    span : tuple of float or None
+        protein_span 결과
+    margin : float
+        입구로 인정할 단백질 범위 끝과의 거리 (Angstrom)
+
+    Returns
+    -------
+    tuple of bool
+        (낮은 쪽 입구 도달, 높은 쪽 입구 도달) - span이 None이면 (True, True)
+    """
+    if span is None:
+        return True, True
+    return (bool(channel_coord.min() <= span[0] + margin),
+            bool(channel_coord.max() >= span[1] - margin))
+
+
+def constriction_start(hole_output, centres, radii, margin=CONSTRICTION_MARGIN):
+    """
+    좁은 구간 정밀화 실행의 시작점 / endrad
+
+    Parameters
+    ----------
+    hole_output : HoleOutput
+        첫 실행 결과 (최소 반경)
+    centres, radii : np.ndarray
+        첫 실행의 구 중심 / 반경 (hole_surface.read_sph_spheres)
+    margin : float
+        좁은 구간 기준 (최소 반경 + margin)
+
+    Returns
+    -------
+    tuple
+        (시작점 list of float, endrad float) - 구가 없으면 (None, None)
+    """
+    if len(radii) == 0 or hole_output.min_radius is None:
+        return None, None
+    start = centres[int(np.argmin(radii))]
+    return [round(float(x), 4) for x in start], round(float(hole_output.min_radius + margin), 3)
+
+
+def merge_profiles(coarse, fine):
+    """
+    전체 경로 프로파일의 좁은 구간을 정밀화 프로파일로 교체
+
+    누적값(cen_line_d, sum_s_area)은 전체 경로 기준으로 보간하여 이어지게 하고,
+    전도도 / 기하 인자는 전체 경로 HOLE 계산값을 유지합니다.
+
+    Parameters
+    ----------
+    coarse : HoleOutput
+        endrad 조정 후 전체 경로 결과
+    fine : HoleOutput
+        좁은 구간 정밀화 결과
+
+    Returns
+    -------
+    HoleOutput
+        병합된 프로파일 (min_radius는 병합된 반경의 최소값)
+    """
+    if fine is None or len(fine) == 0:
+        return coarse
+
+    low, high = fine.channel_coord.min(), fine.channel_coord.max()
+    outside = (coarse.channel_coord < low) | (coarse.channel_coord > high)
+
+    channel_coord = np.concatenate([coarse.channel_coord[outside], fine.channel_coord])
+    order = np.argsort(channel_coord, kind='stable')
+
+    def merged(values, fine_values):
+        return np.concatenate([values[outside], fine_values])[order]
+
+    radius = merged(coarse.radius, fine.radius)
+    return replace(
+        coarse,
+        channel_coord=channel_coord[order],
+        radius=radius,
+        cen_line_d=merged(coarse.cen_line_d,
+                          np.interp(fine.channel_coord, coarse.channel_coord, coarse.cen_line_d)),
+        sum_s_area=merged(coarse.sum_s_area,
+                          np.interp(fine.channel_coord, coarse.channel_coord, coarse.sum_s_area)),
+        sampled=merged(coarse.sampled, fine.sampled),
+        min_radius=float(radius.min())
+    )
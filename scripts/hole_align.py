@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+기공 프로파일 정렬 (채널 좌표 원점 맞추기)
+======================================
+HOLE 채널 좌표(cenxyz.cvec)는 구조마다 원점(과 축 방향)이 달라서 겹쳐 그리거나
+수치로 비교하면 어긋납니다. 프로파일 사이의 좌표 이동량(과 축 반전)을 찾아 공통 좌표로 정렬
+
+- 'xcorr': 반경 프로파일의 마스크 정규화 교차상관 (FFT) - 모든 쌍의 이동량 / 정렬 후 RMS 거리
+  행렬을 계산하고, 거리 합이 가장 작은 프로파일(medoid)을 기준으로 나머지를 정렬
+  (allow_flip=True이면 축 방향이 반대인 프로파일도 뒤집어 비교 - HOLE cvect 방향을 맞춘
+  프로파일은 기본값 그대로 반전하지 않음)
+- 'constriction': 프로파일마다 고른 좁은 지점(최소 반경, 또는 한쪽 끝에서 처음 나오는 좁은 구간)을 0으로
+- 쌍별 결과는 프로파일 내용 해시를 키로 PairCache 파일에 저장하여 구조가 추가되어도 새 쌍만 계산
+
+사용 예시:
+---------
+from hole_align import align_profiles, PairCache
+
+alignment = align_profiles(profiles, method='xcorr', cache=PairCache("screen/pairs.npz"))
+comparison = resample_profiles(profiles, labels, shifts=alignment['shifts'], signs=alignment['signs'])
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from hole_adaptive import CONSTRICTION_MARGIN
+
+
+ALIGN_METHODS = ('xcorr', 'constriction')
+
+# 정렬 격자 간격 (Angstrom, 이동량 정밀도)
+ALIGN_BIN_WIDTH = 0.25
+
+# 교차상관에서 인정할 최소 겹침: 짧은 프로파일 길이의 비율 / 격자 점 수
+MIN_OVERLAP_FRACTION = 0.5
+MIN_OVERLAP_POINTS = 8
+
+# 한 번에 FFT 교차상관을 계산할 프로파일 수 (메모리 제한)
+XCORR_CHUNK = 128
+
+
+def profile_hash(profile):
+    """프로파일 좌표 / 반경 내용 해시 (쌍별 캐시 키)"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(profile.channel_coord, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(profile.radius, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class PairCache:
+    """
+    쌍별 정렬 결과 캐시 (.npz 파일 하나)
+
+    키는 '기준 해시:이동 해시:설정'이며, 반대 방향 쌍은 역변환으로 재사용합니다.
+
+    Parameters
+    ----------
+    cache_file : str, optional
+        캐시 파일 경로 (None이면 메모리에만 유지)
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.entries = {}
+        self.modified = False
+        if self.cache_file and self.cache_file.exists():
+            try:
+                with np.load(self.cache_file) as data:
+                    for key, *values in zip(data['keys'], data['shift'], data['sign'],
+                                            data['distance'], data['score']):
+                        self.entries[str(key)] = tuple(float(v) for v in values)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  Warning: 정렬 캐시를 읽지 못해 새로 만듭니다: {self.cache_file} ({e})")
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, shift, sign, distance, score):
+        self.entries[key] = (float(shift), float(sign), float(distance), float(score))
+        self.modified = True
+
+    def save(self):
+        """변경된 경우 캐시 파일 저장 (임시 파일 → rename)"""
+        if not self.cache_file or not self.modified:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        keys = list(self.entries)
+        values = np.array([self.entries[key] for key in keys], dtype=float).reshape(-1, 4)
+        tmp_file = self.cache_file.with_name(f".{self.cache_file.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_file, keys=np.array(keys), shift=values[:, 0], sign=values[:, 1],
+                 distance=values[:, 2], score=values[:, 3])
+        os.replace(tmp_file, self.cache_file)
+        self.modified = False
+
+
+def local_profiles(profiles, bin_width=ALIGN_BIN_WIDTH, flip=False):
+    """
+    프로파일별 자기 원점 격자로 보간 (프로파일 범위만, 길이가 다르면 NaN으로 채움)
+
+    Parameters
+    ----------
+    flip : bool
+        True이면 좌표를 뒤집은 (c → -c) 프로파일
+
+    Returns
+    -------
+    tuple
+        (starts (n,) - 격자 첫 좌표, values (n, L) - 반경, lengths (n,) - 유효 격자 점 수)
+    """
+    coords, radii = [], []
+    for profile in profiles:
+        coord = np.asarray(profile.channel_coord, dtype=float)
+        radius = np.asarray(profile.radius, dtype=float)
+        if flip:
+            coord = -coord
+        order = np.argsort(coord, kind='stable')
+        coords.append(coord[order])
+        radii.append(radius[order])
+
+    starts = np.array([coord[0] for coord in coords])
+    lengths = np.array([int(np.floor((coord[-1] - coord[0]) / bin_width)) + 1 for coord in coords])
+    width = int(lengths.max())
+
+    # resample_profiles와 같은 방식: 좌표 이동으로 이어붙여 np.interp 한 번
+    span = max(coord[-1] - coord[0] for coord in coords) + width * bin_width + 1.0
+    offsets = np.arange(len(coords)) * span
+    xp = np.concatenate([coord - start + offset for coord, start, offset in zip(coords, starts, offsets)])
+    grid = np.arange(width) * bin_width
+    values = np.interp((grid[None, :] + offsets[:, None]).ravel(), xp, np.concatenate(radii))
+    values = values.reshape(len(coords), width)
+    values[np.arange(width)[None, :] >= lengths[:, None]] = np.nan
+    return starts, values, lengths
+
+
+def _spectra(values, size):
+    """교차상관용 FFT: (반경, 반경², 마스크)"""
+    mask = ~np.isnan(values)
+    filled = np.where(mask, values, 0.0)
+    return (np.fft.rfft(filled, size), np.fft.rfft(filled ** 2, size),
+            np.fft.rfft(mask.astype(float), size))
+
+
+def _best_lags(reference, moving, size, min_overlap):
+    """
+    기준 프로파일 하나와 여러 프로파일의 마스크 정규화 교차상관 최대 지연
+
+    c_uv(k) = Σ_t u(t) v(t+k) 를 irfft(conj(U)·V)로 계산하고, 겹치는 격자 점만으로
+    상관계수 / RMS 차이를 구합니다.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (지연 격자 수, 상관계수, RMS 차이) - 각각 (k,)
+    """
+    ref_a, ref_b, ref_m = reference
+    a, b, m = moving
+
+    def corr(u, v):
+        return np.fft.irfft(np.conj(u)[None, :] * v, size)
+
+    count = np.rint(corr(ref_m, m))
+    sum_f, sum_g = corr(ref_a, m), corr(ref_m, a)
+    sum_ff, sum_gg, sum_fg = corr(ref_b, m), corr(ref_m, b), corr(ref_a, a)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_fg - sum_f * sum_g / count
+        var_f = sum_ff - sum_f ** 2 / count
+        var_g = sum_gg - sum_g ** 2 / count
+        score = cov / np.sqrt(var_f * var_g)
+        rms = np.sqrt(np.maximum(sum_ff + sum_gg - 2.0 * sum_fg, 0.0) / count)
+    score[(count < min_overlap[:, None]) | ~np.isfinite(score)] = -np.inf
+
+    best = np.argmax(score, axis=1)
+    rows = np.arange(len(best))
+    lags = np.where(best > size // 2, best - size, best)
+    return lags, score[rows, best], rms[rows, best]
+
+
+def pairwise_alignment(profiles, bin_width=ALIGN_BIN_WIDTH, allow_flip=False, cache=None,
+                       min_overlap_fraction=MIN_OVERLAP_FRACTION):
+    """
+    모든 프로파일 쌍의 교차상관 정렬
+
+    Parameters
+    ----------
+    profiles : list of HoleOutput
+        프로파일
+    bin_width : float
+        정렬 격자 간격 (Angstrom)
+    allow_flip : bool
+        축 방향이 반대인 경우도 비교 (좌표를 뒤집은 프로파일과의 상관이 더 크면 반전)
+        축 방향이 같은 프로파일도 상관이 조금만 커지면 뒤집히므로 cvect 방향이 제각각일 때만 사용
+    cache : PairCache, optional
+        쌍별 결과 캐시 (없는 쌍만 계산 후 추가)
+    min_overlap_fraction : float
+        짧은 프로파일 길이 대비 최소 겹침 비율
+
+    Returns
+    -------
+    dict
+        (n, n) 행렬 - [i, j]는 프로파일 j를 i의 좌표로 옮기는 변환 c → sign·c + shift
+        - 'shift': np.ndarray (Å), 'sign': np.ndarray (+1 / -1)
+        - 'distance': np.ndarray - 정렬 후 겹침 구간 RMS 반경 차이 (Å, 겹침 부족 시 inf)
+        - 'score': np.ndarray - 정규화 교차상관 (-1~1)
+        - 'computed': int - 새로 계산한 쌍 수
+    """
+    n = len(profiles)
+    hashes = [profile_hash(profile) for profile in profiles]
+    setting = f"{bin_width:g}:{int(bool(allow_flip))}:{min_overlap_fraction:g}"
+
+    shift = np.zeros((n, n))
+    sign = np.ones((n, n))
+    distance = np.zeros((n, n))
+    score = np.ones((n, n))
+
+    # 캐시에서 찾은 쌍 채우기 (반대 방향 키는 역변환)
+    missing = np.ones((n, n), dtype=bool)
+    np.fill_diagonal(missing, False)
+    if cache is not None:
+        for i in range(n):
+            for j in range(i + 1, n):
+                entry = cache.get(f"{hashes[i]}:{hashes[j]}:{setting}")
+                if entry is None:
+                    reverse = cache.get(f"{hashes[j]}:{hashes[i]}:{setting}")
+                    if reverse is not None:
+                        s, g, d, c = reverse
+                        entry = (-g * s, g, d, c)
+                if entry is not None:
+                    shift[i, j], sign[i, j], distance[i, j], score[i, j] = entry
+                    missing[i, j] = False
+
+    computed = 0
+    rows = [i for i in range(n) if missing[i, i + 1:].any()]
+    if rows:
+        starts, values, lengths = local_profiles(profiles, bin_width)
+        size = 1 << int(np.ceil(np.log2(2 * values.shape[1])))
+        forward = _spectra(values, size)
+        candidates = [(1.0, starts, forward)]
+        if allow_flip:
+            flip_starts, flip_values, _ = local_profiles(profiles, bin_width, flip=True)
+            candidates.append((-1.0, flip_starts, _spectra(flip_values, size)))
+
+        for i in rows:
+            targets = np.flatnonzero(missing[i])
+            targets = targets[targets > i]
+            reference = tuple(spectrum[i] for spectrum in forward)
+            for chunk in range(0, len(targets), XCORR_CHUNK):
+                js = targets[chunk:chunk + XCORR_CHUNK]
+                min_overlap = np.maximum(MIN_OVERLAP_POINTS,
+                                         min_overlap_fraction * np.minimum(lengths[i], lengths[js]))
+                best_score = np.full(len(js), -np.inf)
+                for direction, moving_starts, spectra in candidates:
+                    lags, scores, rms = _best_lags(reference, tuple(s[js] for s in spectra), size, min_overlap)
+                    better = scores > best_score
+                    best_score[better] = scores[better]
+                    # 기준 격자 t ↔ 이동 격자 t + lag: start_i + t·bw = s + start_j' + (t + lag)·bw
+                    shift[i, js[better]] = starts[i] - moving_starts[js[better]] - lags[better] * bin_width
+                    sign[i, js[better]] = direction
+                    distance[i, js[better]] = rms[better]
+                distance[i, js[~np.isfinite(best_score)]] = np.inf
+                score[i, js] = best_score
+                computed += len(js)
+                if cache is not None:
+                    for j in js:
+                        cache.put(f"{hashes[i]}:{hashes[j]}:{setting}",
+                                  shift[i, j], sign[i, j], distance[i, j], score[i, j])
+
+    # 아래 삼각: j → i 변환의 역변환
+    lower = np.tril_indices(n, -1)
+    upper = (lower[1], lower[0])
+    sign[lower] = sign[upper]
+    shift[lower] = -sign[upper] * shift[upper]
+    distance[lower] = distance[upper]
+    score[lower] = score[upper]
+
+    if cache is not None:
+        cache.save()
+    return {'shift': shift, 'sign': sign, 'distance': distance, 'score': score, 'computed': computed}
+
+
+def constriction_anchor(profile, which='min', threshold=None):
+    """
+    프로파일의 기준 좁은 지점 채널 좌표
+
+    Parameters
+    ----------
+    profile : HoleOutput
+        프로파일
+    which : str
+        'min' (최소 반경 지점), 'first' / 'last' (채널 좌표 낮은 쪽 / 높은 쪽 끝에서 처음 나오는
+        threshold 이하 국소 최소)
+    threshold : float, optional
+        'first' / 'last'의 좁은 구간 기준 반경 (기본: 최소 반경 + hole_adaptive.CONSTRICTION_MARGIN)
+
+    Returns
+    -------
+    float
+        채널 좌표 (Å)
+    """
+    coord = np.asarray(profile.channel_coord, dtype=float)
+    radius = np.asarray(profile.radius, dtype=float)
+    order = np.argsort(coord, kind='stable')
+    coord, radius = coord[order], radius[order]
+
+    if which == 'min':
+        return float(coord[np.argmin(radius)])
+    if which not in ('first', 'last'):
+        raise ValueError(f"알 수 없는 좁은 지점 기준: {which} (가능: min, first, last)")
+
+    if threshold is None:
+        threshold = radius.min() + CONSTRICTION_MARGIN
+    padded = np.concatenate([[np.inf], radius, [np.inf]])
+    minima = np.flatnonzero((radius <= padded[:-2]) & (radius <= padded[2:]) & (radius <= threshold))
+    index = minima[0] if which == 'first' else minima[-1]
+    return float(coord[index])
+
+
+def align_profiles(profiles, method='xcorr', bin_width=ALIGN_BIN_WIDTH, cache=None,
+                   allow_flip=False, anchor='min', threshold=None):
+    """
+    프로파일들을 공통 채널 좌표로 정렬
+
+    Parameters
+    ----------
+    profiles : list of HoleOutput
+        프로파일
+    method : str
+        'xcorr' (교차상관, 기준 = 정렬 거리 합이 가장 작은 프로파일) 또는
+        'constriction' (프로파일마다 anchor 지점을 0으로)
+    bin_width : float
+        xcorr 정렬 격자 간격 (Angstrom)
+    cache : PairCache, optional
+        xcorr 쌍별 결과 캐시
+    allow_flip : bool
+        xcorr에서 축 방향 반전 허용 (기본: 반전하지 않음 - 같은 cvect 방향이면 막과 같은 방향)
+    anchor, threshold
+        constriction 기준 지점 (constriction_anchor 참고)
+
+    Returns
+    -------
+    dict
+        - 'shifts', 'signs': np.ndarray (n,) - 프로파일별 좌표 변환 c → sign·c + shift
+        - 'reference': int or None - xcorr 기준 프로파일 번호
+        - 'distance': np.ndarray or None - xcorr 정렬 후 쌍별 RMS 거리 (n, n)
+        - 'score': np.ndarray or None - 기준과의 교차상관 (n,)
+        - 'method': str
+    """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f"알 수 없는 정렬 방법: {method} (가능: {', '.join(ALIGN_METHODS)})")
+
+    n = len(profiles)
+    if method == 'constriction':
+        shifts = np.array([-constriction_anchor(profile, anchor, threshold) for profile in profiles])
+        return {'shifts': shifts, 'signs': np.ones(n), 'reference': None, 'distance': None,
+                'score': None, 'method': method}
+
+    pairs = pairwise_alignment(profiles, bin_width=bin_width, allow_flip=allow_flip, cache=cache)
+    distance = pairs['distance']
+    finite = distance[np.isfinite(distance)]
+    penalty = 2.0 * finite.max() if finite.size and finite.max() > 0 else 1.0
+    reference = int(np.argmin(np.where(np.isfinite(distance), distance, penalty).sum(axis=1)))
+
+    return {
+        'shifts': pairs['shift'][reference],
+        'signs': pairs['sign'][reference],
+        'reference': reference,
+        'distance': distance,
+        'score': pairs['score'][reference],
+        'method': method,
+        'computed': pairs['computed']
+    }
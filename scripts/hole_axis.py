@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+HOLE 채널 축 / 시작점 자동 탐지
+==============================
+원자 좌표로부터 채널 방향(CVECT)과 채널 안의 시작점(CPOINT)을 추정하여
+OPM 정렬이 되지 않은 구조(rcsb_* 등)에서도 HOLE이 기공을 벗어나지 않도록 함
+
+1. 후보 축 생성: 좌표계 Z축, OPM 막 법선, 관성 주축 3개,
+   호모 올리고머 대칭축 (체인 중심이 이루는 평면의 법선)
+2. 후보 축마다 벡터화된 공동 탐침(cavity probe):
+   축에 평행한 직선 격자를 슬랩(slab)별로 검사하여
+   - 여유 반경: 직선에서 가장 가까운 원자까지 거리 - 원자 반경
+   - 둘러싸임: 직선 주위 방위각 구간(sector) 대부분에 원자가 있는지
+   둘러싸이고 열린 슬랩이 가장 길게 이어진 직선 = 단백질을 관통하는 터널
+3. 터널이 가장 긴 축과 직선을 선택 (OPM 막 법선 / Z축 / 대칭축 우선)
+4. 시작점: 터널에서 막 중심에 가장 가까운 점
+   (OPM DUM 원자가 있으면 그 중심, 없으면 바깥 표면의 소수성 잔기 띠로 추정)
+
+사용 예시:
+---------
+from hole_pdb import read_pdb
+from hole_axis import detect_channel_axis
+
+table = read_pdb("protein.pdb")
+axis = detect_channel_axis(table.coords, chains=table.chain, residues=table.resname)
+print(axis['cvect'], axis['cpoint'], axis['method'])
+"""
+
+import numpy as np
+
+
+# 여유 반경 계산에 사용할 원자 반경 (Å, 중원자 평균)
+ATOM_RADIUS = 1.5
+
+# 열린 슬랩으로 판단할 최소 여유 반경 (Å)
+MIN_CLEARANCE = 0.5
+
+# 축 방향 슬랩 두께 (Å)
+SLAB_WIDTH = 2.0
+
+# 직선 격자: 중심에서 반경 PROBE_HALF_WIDTH 안을 PROBE_STEP 간격으로 검사 후
+# 최적 직선 주변을 REFINE_STEP 간격으로 다시 검사 (Å)
+PROBE_HALF_WIDTH = 15.0
+PROBE_STEP = 2.5
+REFINE_STEP = 0.5
+
+# 둘러싸임 판정: ENCLOSE_RADIUS 안의 원자로 8개 방위각 구간(8분면) 중
+# MIN_SECTORS개 이상이 채워져야 함 (측면 틈(fenestration) 허용)
+ENCLOSE_RADIUS = 25.0
+MIN_SECTORS = 6
+
+# 우선 후보 (순서대로): Z축(OPM 정렬), 호모 올리고머 대칭축
+# 터널이 최장 터널의 PREFERRED_RATIO 이상이면 더 긴 다른 후보보다 우선
+# (OPM 막 법선(DUM 원자)은 터널이 있으면 항상 선택)
+PREFERRED_AXES = ('z', 'symmetry')
+PREFERRED_RATIO = 0.9
+
+# 막 중심 추정 (DUM 원자가 없는 구조): 바깥 표면 잔기 중 소수성 잔기 비율이
+# 막 두께 창(window)에서 가장 높은 축 위치
+HYDROPHOBIC_RESIDUES = ('ALA', 'VAL', 'LEU', 'ILE', 'PHE', 'MET', 'TRP')
+MEMBRANE_THICKNESS = 30.0
+
+# 대칭축 추정에 사용할 체인 최소 원자 수 / 같은 크기로 볼 원자 수 차이 비율
+MIN_CHAIN_ATOMS = 20
+CHAIN_SIZE_TOLERANCE = 0.1
+
+# 8비트 값의 1 비트 수
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _unit(vector):
+    """단위 벡터 (방향 부호는 Z 성분이 양수가 되도록 통일)"""
+    vector = np.asarray(vector, dtype=float)
+    vector = vector / np.linalg.norm(vector)
+    for component in vector[::-1]:
+        if abs(component) > 1e-8:
+            return vector if component > 0 else -vector
+    return vector
+
+
+def _plane_basis(axis):
+    """축에 수직인 정규 직교 기저 (u, v)"""
+    helper = np.array([1.0, 0.0, 0.0]) if abs(axis[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u)
+    return u, np.cross(axis, u)
+
+
+def candidate_axes(coords, chains=None, membrane=None):
+    """
+    후보 채널 축 생성
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        원자 좌표 (N, 3)
+    chains : np.ndarray, optional
+        원자별 체인 ID (N,) - 호모 올리고머 대칭축 추정에 사용
+    membrane : np.ndarray, optional
+        OPM 막 경계 DUM 원자 좌표 (M, 3) - 막 법선 후보
+
+    Returns
+    -------
+    list of dict
+        {'method': 이름, 'axis': 단위 벡터, 'centre': 격자 중심}
+    """
+    centroid = coords.mean(axis=0)
+    candidates = [{'method': 'z', 'axis': np.array([0.0, 0.0, 1.0]), 'centre': centroid}]
+
+    # OPM 막 경계면(DUM 원자 평면 두 장)의 법선 = 분산이 가장 작은 방향
+    if membrane is not None and len(membrane) >= 3:
+        _, vectors = np.linalg.eigh(np.cov((membrane - membrane.mean(axis=0)).T))
+        candidates.append({'method': 'membrane', 'axis': _unit(vectors[:, 0]), 'centre': centroid})
+
+    # 관성 주축 (고유값 오름차순)
+    _, vectors = np.linalg.eigh(np.cov((coords - centroid).T))
+    for i in range(3):
+        candidates.append({'method': f'principal-{i + 1}', 'axis': _unit(vectors[:, i]),
+                           'centre': centroid})
+
+    # 호모 올리고머: 같은 크기 체인들의 중심
+    if chains is not None and len(chains) == len(coords):
+        names, inverse, counts = np.unique(chains, return_inverse=True, return_counts=True)
+        large = counts >= MIN_CHAIN_ATOMS
+        if large.sum() >= 2:
+            size = np.median(counts[large])
+            members = large & (np.abs(counts - size) <= CHAIN_SIZE_TOLERANCE * size)
+            if members.sum() >= 2:
+                sums = np.zeros((len(names), 3))
+                np.add.at(sums, inverse.ravel(), coords)
+                centres = (sums / counts[:, None])[members]
+                middle = centres.mean(axis=0)
+                if len(centres) >= 3:
+                    # 대칭축 = 체인 중심이 이루는 평면의 법선
+                    _, _, vt = np.linalg.svd(centres - middle)
+                    candidates.append({'method': 'symmetry', 'axis': _unit(vt[-1]), 'centre': middle})
+                else:
+                    # 이량체: 두 체인 중심을 잇는 방향 (축 방향으로 쌓인 이량체)
+                    candidates.append({'method': 'dimer', 'axis': _unit(centres[1] - centres[0]),
+                                       'centre': middle})
+
+    return candidates
+
+
+def _offset_grid(half_width, step, origin=(0.0, 0.0)):
+    """원형 영역 안의 2D 직선 오프셋 격자 (G, 2)"""
+    ticks = np.arange(-half_width, half_width + step / 2, step)
+    grid = np.stack(np.meshgrid(ticks, ticks, indexing='ij'), axis=-1).reshape(-1, 2)
+    grid = grid[np.einsum('ij,ij->i', grid, grid) <= half_width ** 2 + 1e-9]
+    return grid + np.asarray(origin, dtype=float)
+
+
+def probe_lines(coords, axis, centre, offsets):
+    """
+    축에 평행한 직선들의 슬랩별 여유 반경 / 둘러싸임 계산
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        원자 좌표 (N, 3)
+    axis : np.ndarray
+        단위 축 벡터 (3,)
+    centre : np.ndarray
+        직선 격자 중심 (3,)
+    offsets : np.ndarray
+        축에 수직인 평면에서의 직선 위치 (G, 2)
+
+    Returns
+    -------
+    dict
+        - 'clearance': np.ndarray (G, S) - 여유 반경 (Å)
+        - 'enclosed': np.ndarray (G, S) - 둘러싸임 여부
+        - 'slab_centre': np.ndarray (S,) - 슬랩 중심의 축 좌표
+        - 'basis': (u, v) 평면 기저
+    """
+    u, v = _plane_basis(axis)
+    relative = coords - centre
+    t = relative @ axis
+    plane = np.column_stack([relative @ u, relative @ v]).astype(np.float32)
+
+    # 직선 격자에서 ENCLOSE_RADIUS보다 먼 원자는 어느 판정에도 쓰이지 않음
+    reach = np.abs(offsets).max() * np.sqrt(2) + ENCLOSE_RADIUS if len(offsets) else ENCLOSE_RADIUS
+    near = np.einsum('ij,ij->i', plane, plane) <= reach ** 2
+    t, plane = t[near], plane[near]
+
+    if len(t) == 0:
+        empty = np.zeros((len(offsets), 0))
+        return {'clearance': empty, 'enclosed': empty.astype(bool),
+                'slab_centre': np.zeros(0), 'basis': (u, v)}
+
+    slab = np.floor((t - t.min()) / SLAB_WIDTH).astype(int)
+    n_slabs = slab.max() + 1
+    order = np.argsort(slab, kind='stable')
+    bounds = np.searchsorted(slab[order], np.arange(n_slabs + 1))
+
+    clearance = np.full((len(offsets), n_slabs), np.inf)
+    enclosed = np.zeros((len(offsets), n_slabs), dtype=bool)
+    offsets32 = offsets.astype(np.float32)
+
+    for s in range(n_slabs):
+        members = plane[order[bounds[s]:bounds[s + 1]]]
+        if len(members) == 0:
+            continue
+        dx = members[None, :, 0] - offsets32[:, None, 0]
+        dy = members[None, :, 1] - offsets32[:, None, 1]
+        dist_sq = dx * dx + dy * dy
+        clearance[:, s] = np.sqrt(dist_sq.min(axis=1)) - ATOM_RADIUS
+
+        # 방위각 8분면 점유 - 비트 OR로 모은 뒤 비트 수 계산
+        bits = np.where(dist_sq <= ENCLOSE_RADIUS ** 2, np.left_shift(1, _octant(dx, dy), dtype=np.uint8), 0)
+        occupied = _POPCOUNT[np.bitwise_or.reduce(bits.astype(np.uint8), axis=1)]
+        enclosed[:, s] = occupied >= MIN_SECTORS
+
+    slab_centre = t.min() + (np.arange(n_slabs) + 0.5) * SLAB_WIDTH
+    return {'clearance': clearance, 'enclosed': enclosed, 'slab_centre': slab_centre, 'basis': (u, v)}
+
+
+def _longest_runs(open_mask, clearance):
+    """
+    직선별로 열린 슬랩이 가장 길게 이어진 구간
+
+    Returns
+    -------
+    length : np.ndarray
+        최장 구간 슬랩 수 (G,)
+    mean_clearance : np.ndarray
+        최장 구간의 평균 여유 반경 (G,) - 같은 길이일 때 더 중심에 가까운 직선 선택
+    start : np.ndarray
+        최장 구간 시작 슬랩 (G,)
+    """
+    n_lines, n_slabs = open_mask.shape
+    if n_slabs == 0:
+        zeros = np.zeros(n_lines)
+        return zeros.astype(int), zeros, zeros.astype(int)
+
+    # 닫힌 슬랩마다 구간 번호 증가 → 같은 번호의 열린 슬랩이 하나의 구간
+    run_id = np.cumsum(~open_mask, axis=1)
+    key = (np.arange(n_lines)[:, None] * (n_slabs + 1) + run_id)[open_mask]
+    size = n_lines * (n_slabs + 1)
+    length = np.bincount(key, minlength=size).reshape(n_lines, n_slabs + 1)
+    total = np.bincount(key, weights=np.minimum(clearance[open_mask], PROBE_HALF_WIDTH),
+                        minlength=size).reshape(n_lines, n_slabs + 1)
+
+    best = length.argmax(axis=1)
+    rows = np.arange(n_lines)
+    run_length = length[rows, best]
+    mean_clearance = np.where(run_length > 0, total[rows, best] / np.maximum(run_length, 1), 0.0)
+
+    # 구간 시작 = 해당 구간 번호의 첫 열린 슬랩
+    first = np.where(open_mask & (run_id == best[:, None]), np.arange(n_slabs), n_slabs).min(axis=1)
+    return run_length, mean_clearance, np.minimum(first, n_slabs - 1)
+
+
+def _best_line(coords, axis, centre, offsets):
+    """직선 격자에서 터널이 가장 긴 직선 (같은 길이면 평균 여유 반경이 큰 직선)"""
+    probe = probe_lines(coords, axis, centre, offsets)
+    open_mask = probe['enclosed'] & (probe['clearance'] >= MIN_CLEARANCE)
+    length, mean_clearance, start = _longest_runs(open_mask, probe['clearance'])
+
+    best = int(np.lexsort((mean_clearance, length))[-1])
+    return {
+        'offset': offsets[best],
+        'length': int(length[best]),
+        'mean_clearance': float(mean_clearance[best]),
+        'start': int(start[best]),
+        'probe': probe,
+        'line': best
+    }
+
+
+def _octant(dx, dy):
+    """방위각 8분면 번호 (사분면 × |dx| < |dy|)"""
+    return ((dx < 0).astype(np.uint8) << 2) | ((dy < 0).astype(np.uint8) << 1) \
+        | (np.abs(dx) < np.abs(dy)).astype(np.uint8)
+
+
+def hydrophobic_belt(coords, residues, axis, point):
+    """
+    축 방향 소수성 표면 프로파일 (막 통과 영역 추정)
+
+    축 위치(슬랩)와 방위각 8분면마다 축에서 가장 먼 원자(바깥 표면)를 고르고,
+    그 잔기가 소수성인 비율을 막 두께 창으로 평균합니다.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        원자 좌표 (N, 3)
+    residues : np.ndarray
+        원자별 잔기 이름 (N,)
+    axis : np.ndarray
+        단위 축 벡터
+    point : np.ndarray
+        축 위의 점 (축 좌표 기준점)
+
+    Returns
+    -------
+    position : np.ndarray
+        슬랩 중심의 축 좌표 (S,)
+    score : np.ndarray
+        소수성 바깥 표면 비율 (S,)
+    """
+    u, v = _plane_basis(axis)
+    relative = coords - point
+    t = relative @ axis
+    x, y = relative @ u, relative @ v
+
+    slab = np.floor((t - t.min()) / SLAB_WIDTH).astype(int)
+    key = slab * 8 + _octant(x, y)
+    order = np.lexsort((x * x + y * y, key))
+    outer = order[np.append(key[order][1:] != key[order][:-1], True)]
+
+    n_slabs = slab.max() + 1
+    hydrophobic = np.isin(residues[outer], HYDROPHOBIC_RESIDUES)
+    window = np.ones(max(1, int(round(MEMBRANE_THICKNESS / SLAB_WIDTH))))
+    total = np.convolve(np.bincount(slab[outer], minlength=n_slabs), window, mode='same')
+    count = np.convolve(np.bincount(slab[outer], weights=hydrophobic, minlength=n_slabs), window, mode='same')
+
+    position = t.min() + (np.arange(n_slabs) + 0.5) * SLAB_WIDTH
+    return position, count / np.maximum(total, 1)
+
+
+def detect_channel_axis(coords, chains=None, residues=None, membrane=None,
+                        candidates=None, centre=None, endrad=None):
+    """
+    원자 좌표에서 채널 축(CVECT)과 시작점(CPOINT) 추정
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        원자 좌표 (N, 3) - 무시할 잔기(물, 이온, DUM 등)를 제거한 좌표 사용
+    chains : np.ndarray, optional
+        원자별 체인 ID (N,) - 호모 올리고머 대칭축 후보 생성
+    residues : np.ndarray, optional
+        원자별 잔기 이름 (N,) - 소수성 표면으로 막 중심 추정 (hydrophobic_belt)
+    membrane : np.ndarray, optional
+        OPM 막 경계 DUM 원자 좌표 (M, 3) - 막 법선 / 막 중심
+    candidates : list of array-like, optional
+        검사할 축 목록 (None이면 candidate_axes로 자동 생성)
+    centre : array-like, optional
+        직선 격자 중심 (None이면 후보별 중심)
+    endrad : float, optional
+        HOLE 종료 반지름 - 시작점의 여유 반경이 endrad 이상이면 터널에서 endrad보다 좁은
+        가장 가까운 지점으로 옮김 (넓은 공동에서 시작하면 HOLE이 한쪽으로만 진행하므로)
+
+    Returns
+    -------
+    dict
+        - 'success': bool - 단백질을 관통하는 터널을 찾았는지 여부
+        - 'cvect': list of float - 채널 방향 단위 벡터
+        - 'cpoint': list of float - 채널 안의 시작점 (실패 시 None)
+        - 'method': str - 선택된 후보 ('membrane', 'z', 'principal-1..3', 'symmetry', 'dimer', 'given')
+        - 'anchor': str - 시작점 기준 ('membrane': DUM 원자, 'hydrophobic': 소수성 표면, 'tunnel': 터널 가운데)
+        - 'tunnel_length': float - 둘러싸이고 열린 터널 길이 (Å)
+        - 'clearance': float - 시작점의 여유 반경 (Å)
+        - 'candidates': list of dict - 후보별 {'method', 'cvect', 'tunnel_length'}
+
+    Examples
+    --------
+    >>> axis = detect_channel_axis(table.coords, chains=table.chain, residues=table.resname)
+    >>> run_hole("protein.pdb", cvect=axis['cvect'], cpoint=axis['cpoint'])
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+    finite = np.isfinite(coords).all(axis=1)
+    coords = coords[finite]
+    if chains is not None:
+        chains = np.asarray(chains)[finite]
+    if residues is not None:
+        residues = np.asarray(residues)[finite]
+    if membrane is not None:
+        membrane = np.asarray(membrane, dtype=float).reshape(-1, 3)
+        membrane = membrane[np.isfinite(membrane).all(axis=1)]
+        if len(membrane) < 3:
+            membrane = None
+
+    failed = {'success': False, 'cvect': [0.0, 0.0, 1.0], 'cpoint': None, 'method': 'z',
+              'anchor': None, 'tunnel_length': 0.0, 'clearance': 0.0, 'candidates': []}
+    if len(coords) < 3:
+        return failed
+
+    if candidates is None:
+        axes = candidate_axes(coords, chains=chains, membrane=membrane)
+    else:
+        axes = [{'method': 'given', 'axis': _unit(axis), 'centre': coords.mean(axis=0)}
+                for axis in candidates]
+    if centre is not None:
+        for item in axes:
+            item['centre'] = np.asarray(centre, dtype=float)
+
+    # 1차: 후보 축마다 성긴 직선 격자
+    coarse = _offset_grid(PROBE_HALF_WIDTH, PROBE_STEP)
+    for item in axes:
+        item.update(_best_line(coords, item['axis'], item['centre'], coarse))
+
+    longest = max(item['length'] for item in axes)
+    chosen = max(axes, key=lambda item: (item['length'], item['mean_clearance']))
+    membrane_axis = [item for item in axes if item['method'] == 'membrane' and item['length'] > 0]
+    for method in PREFERRED_AXES:
+        preferred = [item for item in axes if item['method'] == method]
+        if preferred and longest > 0 and preferred[0]['length'] >= PREFERRED_RATIO * longest:
+            chosen = preferred[0]
+            break
+    if membrane_axis:
+        chosen = membrane_axis[0]
+
+    failed['candidates'] = [{'method': item['method'], 'cvect': [round(float(x), 4) for x in item['axis']],
+                             'tunnel_length': item['length'] * SLAB_WIDTH} for item in axes]
+    if chosen['length'] == 0:
+        return failed
+
+    # 2차: 선택된 직선 주변을 촘촘하게
+    fine = _offset_grid(PROBE_STEP, REFINE_STEP, origin=chosen['offset'])
+    refined = _best_line(coords, chosen['axis'], chosen['centre'], fine)
+    if (refined['length'], refined['mean_clearance']) >= (chosen['length'], chosen['mean_clearance']):
+        chosen.update(refined)
+
+    axis = chosen['axis']
+    probe = chosen['probe']
+    u, v = probe['basis']
+    point = chosen['centre'] + chosen['offset'][0] * u + chosen['offset'][1] * v
+    tunnel = np.arange(chosen['start'], chosen['start'] + chosen['length'])
+    tunnel_t = probe['slab_centre'][tunnel]
+    clearance = probe['clearance'][chosen['line'], tunnel]
+
+    # 시작점: 막 중심 (DUM 원자 → 소수성 표면 순) 에 가장 가까운 터널 위치, 없으면 터널 가운데
+    if membrane is not None:
+        anchor = 'membrane'
+        index = int(np.argmin(np.abs(tunnel_t - (membrane.mean(axis=0) - point) @ axis)))
+    elif residues is not None:
+        anchor = 'hydrophobic'
+        position, score = hydrophobic_belt(coords, residues, axis, point)
+        index = int(np.argmax(np.interp(tunnel_t, position, score)))
+    else:
+        anchor = 'tunnel'
+        index = len(tunnel) // 2
+
+    if endrad is not None and clearance[index] >= endrad and (clearance < endrad).any():
+        narrow = np.flatnonzero(clearance < endrad)
+        index = int(narrow[np.argmin(np.abs(narrow - index))])
+
+    cpoint = point + tunnel_t[index] * axis
+    return {
+        'success': True,
+        'cvect': [round(float(x), 4) for x in axis],
+        'cpoint': [round(float(x), 3) for x in cpoint],
+        'method': chosen['method'],
+        'anchor': anchor,
+        'tunnel_length': chosen['length'] * SLAB_WIDTH,
+        'clearance': float(clearance[index]),
+        'candidates': failed['candidates']
+    }
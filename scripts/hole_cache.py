@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+HOLE 결과 캐시
+==============
+필터링된 구조 좌표 + HOLE 입력 카드의 해시를 키로 사용하는 디스크 캐시
+
+구조와 파라미터(반지름 파일, endrad, cvect, ignore 목록 등)가 같으면
+HOLE / sph_process / qpt_conv / 그래프 / PyMOL 렌더링을 다시 실행하지 않고
+캐시된 결과 파일을 작업 디렉토리로 복사합니다.
+캐시 전체 크기는 max_bytes로 제한되며, 가장 오래 사용되지 않은 항목부터 삭제됩니다 (LRU).
+
+사용 예시:
+---------
+from hole_cache import ResultCache
+from hole_runner import run_full_analysis
+
+cache = ResultCache("~/.cache/hole2", max_bytes=2 * 1024**3)
+result = run_full_analysis("protein.pdb", cache=cache)
+print(result.get('cache_hit'))
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+
+# 캐시 형식 버전 (HOLE 실행 방식이나 결과 파일 구성이 바뀌면 증가시켜 기존 항목 무효화)
+CACHE_VERSION = "1"
+
+DEFAULT_CACHE_DIR = os.environ.get('HOLE_CACHE_DIR', os.path.expanduser("~/.cache/hole2"))
+DEFAULT_MAX_BYTES = 1024 ** 3  # 1 GB
+
+# 키 계산에서 제외할 입력 카드 (경로/파일명은 내용 해시로 대체)
+_PATH_CARDS = ('coord', 'radius', 'sphpdb')
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _hash_file_lines(path, prefixes=None):
+    """파일 내용 해시 (prefixes가 주어지면 해당 레코드 라인만 사용)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for line in f:
+            if prefixes is None or line.startswith(prefixes):
+                digest.update(line.rstrip())
+                digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def hole_cache_key(filtered_pdb, input_content, radius_file):
+    """
+    HOLE 실행 결과의 캐시 키 계산
+
+    Parameters
+    ----------
+    filtered_pdb : str
+        HOLE에 입력되는 필터링된 PDB 파일 ({prefix}.pdb)
+    input_content : str
+        run_hole이 생성한 HOLE 입력 카드 전체
+    radius_file : str
+        반지름 파일 경로 (경로 대신 내용이 키에 반영됨)
+
+    Returns
+    -------
+    str
+        SHA-256 16진 문자열
+    """
+    # 작업 디렉토리/접두사에 따라 달라지는 카드와 주석은 제외
+    cards = []
+    for line in input_content.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('!'):
+            continue
+        if stripped.split()[0].lower() in _PATH_CARDS:
+            continue
+        cards.append(stripped)
+
+    digest = hashlib.sha256()
+    digest.update(f"hole-cache-v{CACHE_VERSION}\n".encode())
+    digest.update(_hash_file_lines(filtered_pdb, (b'ATOM', b'HETATM')).encode())
+    digest.update(_hash_file_lines(radius_file).encode())
+    digest.update('\n'.join(cards).encode())
+    return digest.hexdigest()
+
+
+def derive_key(key, *parts):
+    """기존 키에 추가 조건(접두사, 렌더링 설정 등)을 더한 파생 키"""
+    digest = hashlib.sha256(key.encode())
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(str(part).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    크기 제한 LRU 디스크 캐시
+
+    각 항목은 {cache_dir}/{key[:2]}/{key}/ 디렉토리에 결과 파일과 manifest.json으로 저장됩니다.
+    항목은 임시 디렉토리에 작성된 뒤 rename으로 한 번에 등록되므로
+    배치 모드의 여러 프로세스가 같은 캐시를 동시에 사용해도 안전합니다.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        캐시 디렉토리 (기본: $HOLE_CACHE_DIR 또는 ~/.cache/hole2)
+    max_bytes : int, optional
+        캐시 최대 크기 (기본: 1 GB)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR))
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / key
+
+    def lookup(self, key):
+        """
+        캐시 항목 조회
+
+        Returns
+        -------
+        dict or None
+            manifest 내용 ('files': {역할: 파일명}, 'meta': {...}) 또는 None
+        """
+        manifest_file = self._entry_path(key) / MANIFEST_NAME
+        try:
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+            # LRU: 마지막 사용 시각 갱신
+            os.utime(manifest_file)
+        except (OSError, ValueError):
+            return None
+
+        entry_path = self._entry_path(key)
+        if not all((entry_path / name).exists() for name in manifest['files'].values()):
+            return None
+        return manifest
+
+    def restore(self, key, destinations):
+        """
+        캐시된 파일을 지정한 경로로 복사
+
+        Parameters
+        ----------
+        key : str
+            캐시 키
+        destinations : dict
+            {역할: 복사할 경로} - 캐시에 없는 역할은 무시
+
+        Returns
+        -------
+        dict or None
+            {역할: 복사된 경로} 와 manifest의 'meta', 캐시 미스이면 None
+        """
+        manifest = self.lookup(key)
+        if manifest is None:
+            return None
+
+        entry_path = self._entry_path(key)
+        restored = {}
+        for role, name in manifest['files'].items():
+            if role in destinations:
+                dst = Path(destinations[role])
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(entry_path / name, dst)
+                restored[role] = str(dst)
+
+        return {'files': restored, 'meta': manifest.get('meta', {})}
+
+    def store(self, key, files, meta=None, replace=False):
+        """
+        결과 파일을 캐시에 등록
+
+        Parameters
+        ----------
+        key : str
+            캐시 키
+        files : dict
+            {역할: 파일 경로} - 존재하지 않는 파일은 건너뜀
+        meta : dict, optional
+            함께 저장할 JSON 직렬화 가능한 정보
+        replace : bool
+            같은 키의 기존 항목을 교체할지 여부 (예: 일부 결과만 있던 항목 보완)
+
+        Returns
+        -------
+        bool
+            등록 여부 (이미 같은 키가 있고 replace=False이면 False)
+        """
+        entry_path = self._entry_path(key)
+        if (entry_path / MANIFEST_NAME).exists():
+            if not replace:
+                return False
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.parent / f".tmp-{key}-{uuid.uuid4().hex}"
+        tmp_path.mkdir()
+
+        stored = {}
+        size = 0
+        for role, src in files.items():
+            src = Path(src)
+            if not src.exists():
+                continue
+            shutil.copyfile(src, tmp_path / src.name)
+            stored[role] = src.name
+            size += src.stat().st_size
+
+        with open(tmp_path / MANIFEST_NAME, 'w') as f:
+            json.dump({'key': key, 'files': stored, 'size': size,
+                       'created': time.time(), 'meta': meta or {}}, f, indent=2)
+
+        try:
+            tmp_path.rename(entry_path)
+        except OSError:
+            # 다른 프로세스가 먼저 등록함
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+
+        self.evict()
+        return True
+
+    def entries(self):
+        """
+        캐시 항목 목록
+
+        Returns
+        -------
+        list of tuple
+            (마지막 사용 시각, 크기(bytes), 항목 경로) - 오래된 순
+        """
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+
+        for manifest_file in self.cache_dir.glob(f"*/*/{MANIFEST_NAME}"):
+            try:
+                last_used = manifest_file.stat().st_mtime
+                size = sum(p.stat().st_size for p in manifest_file.parent.iterdir())
+            except OSError:
+                continue
+            entries.append((last_used, size, manifest_file.parent))
+
+        entries.sort()
+        return entries
+
+    def size(self):
+        """캐시 전체 크기 (bytes)"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        캐시 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+
+        Returns
+        -------
+        int
+            삭제한 항목 수
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+여러 구조의 기공 프로파일 비교
+============================
+수백 개의 HOLE 프로파일을 병렬로 읽어 공통 채널 좌표 격자로 보간하고,
+한 축에 선을 모두 겹쳐 그리는 대신 요약 그래프로 비교
+
+- 보간: 모든 프로파일을 좌표 이동으로 이어붙여 np.interp 한 번으로 (구조 × 격자) 행렬 생성
+- 요약: 중앙값 / 백분위수 띠, 구조 × 좌표 히트맵 (군집 순서), 군집별 중앙 프로파일
+- 군집: 겹치는 구간의 RMS 반경 차이 (행렬 곱으로 한 번에 계산) + 평균 연결 계층 군집
+- 정렬: 구조마다 다른 채널 좌표 원점 / 축 방향을 교차상관 또는 좁은 지점 기준으로 맞춤 (hole_align)
+- 정렬된 행렬은 .npz / .tsv로 내보내 후속 분석에 사용
+
+사용 예시:
+---------
+from hole_compare import compare_profiles, load_profiles, resample_profiles
+
+result = compare_profiles(["screen/a/a_profile.npz", "screen/b/b_profile.npz"],
+                          work_dir="screen", n_clusters=4, align='xcorr')
+print(result['matrix_file'])
+
+profiles, labels = load_profiles(glob.glob("screen/*/*_profile.npz"))
+comparison = resample_profiles(profiles, labels, bin_width=0.25)
+comparison['radius'].shape    # (구조 수, 격자 점 수)
+"""
+
+import warnings
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from hole_output import HoleOutput, as_hole_output, output_name, PROFILE_FORMATS
+
+
+# 공통 격자 간격 (Angstrom, 트라젝토리 분석과 같은 기본값)
+BIN_WIDTH = 0.25
+
+# 요약 띠 백분위수
+BAND_PERCENTILES = (10, 25, 50, 75, 90)
+
+# 두 프로파일 거리 계산에 필요한 최소 겹침 격자 점 수 (기본 간격에서 2 Å)
+MIN_OVERLAP = 8
+
+# 히트맵에 구조 이름을 표시할 최대 구조 수
+MAX_HEATMAP_LABELS = 60
+
+
+def _profile_label(source, profile):
+    """프로파일 이름 - 저장된 output_prefix, 없으면 파일 이름 (_profile, _out 제외)"""
+    prefix = profile.metadata.get('output_prefix')
+    if prefix:
+        return str(prefix)
+    name = output_name(profile if isinstance(source, HoleOutput) else source)
+    for suffix in ('_profile', '_out'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def load_profiles(sources, max_workers=None):
+    """
+    프로파일을 병렬로 읽기
+
+    프로파일 배열 파일(.npz / .parquet / .h5)은 메모리 매핑으로 읽으므로 스레드,
+    HOLE 출력 텍스트(_out.txt)가 있으면 파싱이 CPU를 쓰므로 프로세스로 읽습니다.
+
+    Parameters
+    ----------
+    sources : list of str or HoleOutput
+        프로파일 파일 / HOLE 출력 파일 / 파싱된 결과
+    max_workers : int, optional
+        동시 읽기 수 (기본: CPU 코어 수)
+
+    Returns
+    -------
+    tuple
+        (profiles list of HoleOutput, labels list of str) - 읽지 못했거나 점이 2개 미만인 항목 제외
+    """
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    paths = [source for source in sources if not isinstance(source, HoleOutput)]
+    text = [path for path in paths if Path(path).suffix.lower() not in PROFILE_FORMATS]
+    pool_class = ProcessPoolExecutor if len(text) > 1 else ThreadPoolExecutor
+
+    loaded = {}
+    if paths:
+        with pool_class(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(as_hole_output, source)
+                       for i, source in enumerate(sources) if not isinstance(source, HoleOutput)}
+            for i, future in futures.items():
+                try:
+                    loaded[i] = future.result()
+                except Exception as e:
+                    print(f"  Warning: 프로파일 읽기 실패: {sources[i]} ({e})")
+
+    profiles, labels = [], []
+    for i, source in enumerate(sources):
+        profile = source if isinstance(source, HoleOutput) else loaded.get(i)
+        if profile is None:
+            continue
+        if len(profile) < 2:
+            print(f"  Warning: 프로파일 점이 부족하여 제외: {output_name(source)}")
+            continue
+        profiles.append(profile)
+        labels.append(_profile_label(source, profile))
+    return profiles, labels
+
+
+def resample_profiles(profiles, labels=None, bin_width=BIN_WIDTH, grid=None, shifts=None, signs=None):
+    """
+    프로파일들을 공통 채널 좌표 격자로 보간
+
+    프로파일 i의 좌표를 i × (전체 범위 + 여유)만큼 이동하여 이어붙이면 구간이 겹치지 않으므로
+    모든 프로파일을 np.interp 한 번으로 보간할 수 있습니다. 각 프로파일 범위 밖은 NaN.
+
+    Parameters
+    ----------
+    profiles : list of HoleOutput
+        load_profiles 결과
+    labels : list of str, optional
+        구조 이름 (기본: 파일 이름)
+    bin_width : float
+        격자 간격 (Angstrom)
+    grid : np.ndarray, optional
+        사용할 격자 (기본: 모든 프로파일 범위를 덮는 bin_width 간격 격자)
+    shifts, signs : array-like, optional
+        프로파일별 좌표 변환 c → sign·c + shift (hole_align.align_profiles 결과)
+
+    Returns
+    -------
+    dict
+        - 'channel_coord': np.ndarray - 공통 격자 (n_bins,)
+        - 'radius': np.ndarray - 구조 × 격자 반경 행렬 (n_profiles, n_bins), 범위 밖 NaN
+        - 'labels': list of str
+        - 'min_radius', 'conductance': np.ndarray - 구조별 HOLE 요약값 (없으면 NaN)
+        - 'sources': list of str - 원래 HOLE 출력 파일
+        - 'shifts', 'signs': np.ndarray - 적용한 좌표 변환 (정렬하지 않았으면 0 / 1)
+    """
+    if not profiles:
+        raise ValueError("비교할 프로파일이 없습니다.")
+    if labels is None:
+        labels = [_profile_label(profile, profile) for profile in profiles]
+
+    shifts = np.zeros(len(profiles)) if shifts is None else np.asarray(shifts, dtype=float)
+    signs = np.ones(len(profiles)) if signs is None else np.asarray(signs, dtype=float)
+
+    coords, radii = [], []
+    for profile, shift, sign in zip(profiles, shifts, signs):
+        coord = sign * np.asarray(profile.channel_coord, dtype=float) + shift
+        order = np.argsort(coord, kind='stable')
+        coords.append(coord[order])
+        radii.append(np.asarray(profile.radius, dtype=float)[order])
+
+    lows = np.array([coord[0] for coord in coords])
+    highs = np.array([coord[-1] for coord in coords])
+    if grid is None:
+        grid = np.arange(lows.min(), highs.max() + bin_width / 2, bin_width)
+    grid = np.asarray(grid, dtype=float)
+
+    span = max(highs.max(), grid[-1]) - min(lows.min(), grid[0]) + 1.0
+    offsets = np.arange(len(profiles)) * span
+    xp = np.concatenate([coord + offset for coord, offset in zip(coords, offsets)])
+    fp = np.concatenate(radii)
+    matrix = np.interp((grid[None, :] + offsets[:, None]).ravel(), xp, fp).reshape(len(profiles), len(grid))
+    matrix[(grid[None, :] < lows[:, None]) | (grid[None, :] > highs[:, None])] = np.nan
+
+    def summary(name):
+        return np.array([getattr(p, name) if getattr(p, name) is not None else np.nan for p in profiles],
+                        dtype=float)
+
+    return {
+        'channel_coord': grid,
+        'radius': matrix,
+        'labels': list(labels),
+        'min_radius': summary('min_radius'),
+        'conductance': summary('conductance'),
+        'sources': [str(profile.output_file) for profile in profiles],
+        'shifts': shifts,
+        'signs': signs
+    }
+
+
+def profile_band(comparison, percentiles=BAND_PERCENTILES):
+    """
+    격자 점별 반경 백분위수 (NaN 제외)
+
+    Returns
+    -------
+    dict
+        - 'channel_coord': np.ndarray
+        - 'count': np.ndarray - 격자 점별 프로파일 수
+        - 'percentiles': {백분위수: np.ndarray}
+    """
+    matrix = comparison['radius']
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 모든 값이 NaN인 격자 점
+        values = np.nanpercentile(matrix, percentiles, axis=0)
+    return {
+        'channel_coord': comparison['channel_coord'],
+        'count': np.sum(~np.isnan(matrix), axis=0),
+        'percentiles': dict(zip(percentiles, values))
+    }
+
+
+def profile_distances(matrix, min_overlap=MIN_OVERLAP):
+    """
+    프로파일 쌍의 RMS 반경 차이 (겹치는 격자 점에서만)
+
+    NaN을 0으로 채운 행렬 X와 유효 마스크 M으로
+    sum((a - b)^2) = X²·Mᵀ + M·X²ᵀ - 2·X·Xᵀ 를 행렬 곱으로 한 번에 계산합니다.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        구조 × 격자 반경 행렬 (NaN = 범위 밖)
+    min_overlap : int
+        거리를 계산할 최소 겹침 격자 점 수 (부족하면 inf)
+
+    Returns
+    -------
+    np.ndarray
+        (n_profiles, n_profiles) 거리 행렬 (Å), 대각선 0
+    """
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    mask = valid.astype(float)
+    squares = values ** 2
+
+    overlap = mask @ mask.T
+    total = squares @ mask.T + mask @ squares.T - 2.0 * (values @ values.T)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distances = np.sqrt(np.maximum(total, 0.0) / overlap)
+    distances[overlap < min_overlap] = np.inf
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+def cluster_profiles(distances, n_clusters=4):
+    """
+    평균 연결 계층 군집 (Lance-Williams 갱신, scipy 불필요)
+
+    Parameters
+    ----------
+    distances : np.ndarray
+        profile_distances 결과 (겹치지 않는 쌍의 inf는 최대 거리의 2배로 취급)
+    n_clusters : int
+        군집 수
+
+    Returns
+    -------
+    dict
+        - 'labels': np.ndarray - 구조별 군집 번호 (0부터, 잎 순서에서 먼저 나오는 군집이 0)
+        - 'order': np.ndarray - 비슷한 프로파일이 이웃하는 잎 순서 (히트맵 행 순서)
+        - 'n_clusters': int
+    """
+    n = len(distances)
+    n_clusters = max(1, min(n_clusters, n))
+    finite = distances[np.isfinite(distances)]
+    fill = 2.0 * finite.max() if finite.size and finite.max() > 0 else 1.0
+
+    dist = np.where(np.isfinite(distances), distances, fill).astype(float)
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    members = [[i] for i in range(n)]
+    groups = [list(group) for group in members] if n_clusters == n else None
+
+    for remaining in range(n, 1, -1):
+        i, j = divmod(int(np.argmin(dist)), n)
+        if i > j:
+            i, j = j, i
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i], dist[:, i] = merged, merged
+        dist[j], dist[:, j] = np.inf, np.inf
+        dist[i, i] = np.inf
+        sizes[i] += sizes[j]
+        members[i], members[j] = members[i] + members[j], None
+        if remaining - 1 == n_clusters:
+            groups = [list(group) for group in members if group is not None]
+
+    order = np.array(next(group for group in members if group is not None))
+    position = np.empty(n, dtype=int)
+    position[order] = np.arange(n)
+
+    labels = np.empty(n, dtype=int)
+    for number, group in enumerate(sorted(groups, key=lambda group: position[group].min())):
+        labels[group] = number
+    return {'labels': labels, 'order': order, 'n_clusters': n_clusters}
+
+
+def plot_profile_band(comparison, band=None, title="HOLE Pore Radius Distribution",
+                      xlabel="Channel Coordinate (Å)", ylabel="Pore Radius (Å)",
+                      figsize=(10, 6), dpi=150, save_as=None):
+    """
+    중앙값 + 백분위수 띠 (10-90, 25-75) 그래프
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+    """
+    if band is None:
+        band = profile_band(comparison)
+    coord, values = band['channel_coord'], band['percentiles']
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    ax.fill_between(coord, values[10], values[90], color='tab:blue', alpha=0.15, linewidth=0,
+                    label='10-90 percentile')
+    ax.fill_between(coord, values[25], values[75], color='tab:blue', alpha=0.3, linewidth=0,
+                    label='25-75 percentile')
+    ax.plot(coord, values[50], color='tab:blue', linewidth=2.5, label='Median')
+
+    ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.set_title(f"{title}\n{len(comparison['labels'])} structures", fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.legend(loc='best', fontsize=10)
+    plt.tight_layout()
+
+    if save_as:
+        plt.savefig(save_as, dpi=dpi, bbox_inches='tight')
+        print(f"분포 그래프 저장: {save_as}")
+    return fig
+
+
+def plot_profile_heatmap(comparison, clusters=None, title="HOLE Pore Radius Heatmap",
+                         xlabel="Channel Coordinate (Å)", figsize=(12, 8), dpi=150, save_as=None):
+    """
+    구조 × 채널 좌표 반경 히트맵 (clusters가 있으면 잎 순서로 정렬하고 군집 경계 표시)
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+    """
+    matrix, coord, labels = comparison['radius'], comparison['channel_coord'], comparison['labels']
+    order = clusters['order'] if clusters else np.arange(len(labels))
+
+    finite = matrix[~np.isnan(matrix)]
+    vmax = float(np.percentile(finite, 98)) if finite.size else 1.0  # 넓은 전정이 색 범위를 차지하지 않도록
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    cmap = plt.get_cmap('viridis').copy()
+    cmap.set_bad('lightgrey')
+    image = ax.imshow(np.ma.masked_invalid(matrix[order]), aspect='auto', interpolation='nearest',
+                      cmap=cmap, vmin=0.0, vmax=vmax,
+                      extent=(coord[0], coord[-1], len(order) - 0.5, -0.5))
+    fig.colorbar(image, ax=ax, label='Pore Radius (Å)')
+
+    if len(order) <= MAX_HEATMAP_LABELS:
+        ax.set_yticks(np.arange(len(order)))
+        ax.set_yticklabels([labels[i] for i in order], fontsize=7)
+    else:
+        ax.set_ylabel(f"Structures (n={len(order)})", fontsize=12, fontweight='bold')
+
+    if clusters:
+        ordered = clusters['labels'][order]
+        for boundary in np.flatnonzero(np.diff(ordered)) + 0.5:
+            ax.axhline(boundary, color='white', linewidth=1.5)
+
+    ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    plt.tight_layout()
+
+    if save_as:
+        plt.savefig(save_as, dpi=dpi, bbox_inches='tight')
+        print(f"히트맵 저장: {save_as}")
+    return fig
+
+
+def plot_profile_clusters(comparison, clusters, title="HOLE Pore Radius Clusters",
+                          xlabel="Channel Coordinate (Å)", ylabel="Pore Radius (Å)",
+                          figsize=(10, 6), dpi=150, save_as=None):
+    """
+    군집별 중앙 프로파일 + 25-75 백분위수 띠
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+    """
+    coord = comparison['channel_coord']
+    colors = plt.cm.tab10(np.arange(clusters['n_clusters']) % 10)
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    for number in range(clusters['n_clusters']):
+        rows = comparison['radius'][clusters['labels'] == number]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low, median, high = np.nanpercentile(rows, (25, 50, 75), axis=0)
+        ax.fill_between(coord, low, high, color=colors[number], alpha=0.2, linewidth=0)
+        ax.plot(coord, median, color=colors[number], linewidth=2,
+                label=f"Cluster {number + 1} (n={len(rows)})")
+
+    ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.legend(loc='best', fontsize=10)
+    plt.tight_layout()
+
+    if save_as:
+        plt.savefig(save_as, dpi=dpi, bbox_inches='tight')
+        print(f"군집 그래프 저장: {save_as}")
+    return fig
+
+
+def export_matrix(comparison, matrix_file, clusters=None):
+    """
+    정렬된 구조 × 격자 행렬 저장
+
+    Parameters
+    ----------
+    comparison : dict
+        resample_profiles 결과
+    matrix_file : str
+        .npz (channel_coord, radius, labels, sources, min_radius, conductance, shift, sign, cluster, order)
+        또는 .tsv / .csv (행: 구조, 열: structure, cluster, 격자 좌표 - 범위 밖은 빈 칸)
+    clusters : dict, optional
+        cluster_profiles 결과
+
+    Returns
+    -------
+    str
+        저장한 파일 경로
+    """
+    matrix_file = Path(matrix_file)
+    matrix_file.parent.mkdir(parents=True, exist_ok=True)
+    n = len(comparison['labels'])
+    cluster = clusters['labels'] if clusters else np.zeros(n, dtype=int)
+
+    if matrix_file.suffix.lower() == '.npz':
+        np.savez_compressed(
+            matrix_file,
+            channel_coord=comparison['channel_coord'],
+            radius=comparison['radius'],
+            labels=np.array(comparison['labels']),
+            sources=np.array(comparison['sources']),
+            min_radius=comparison['min_radius'],
+            conductance=comparison['conductance'],
+            shift=comparison['shifts'],
+            sign=comparison['signs'],
+            cluster=cluster,
+            order=clusters['order'] if clusters else np.arange(n)
+        )
+    else:
+        sep = ',' if matrix_file.suffix.lower() == '.csv' else '\t'
+        lines = [sep.join(['structure', 'cluster'] + [f"{c:.3f}" for c in comparison['channel_coord']])]
+        for label, number, row in zip(comparison['labels'], cluster, comparison['radius']):
+            values = ['' if np.isnan(value) else f"{value:.4f}" for value in row]
+            lines.append(sep.join([label, str(number + 1)] + values))
+        with open(matrix_file, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    return str(matrix_file)
+
+
+def compare_profiles(sources, work_dir=".", output_prefix="comparison", bin_width=BIN_WIDTH,
+                     n_clusters=4, max_workers=None, align=None, align_cache=True, anchor='min'):
+    """
+    프로파일 비교 전체 실행: 병렬 읽기 → (정렬) → 공통 격자 보간 → 군집 → 요약 그래프 / 행렬 저장
+
+    Parameters
+    ----------
+    sources : list of str or HoleOutput
+        프로파일 파일 / HOLE 출력 파일 / 파싱된 결과
+    work_dir : str
+        출력 디렉토리
+    output_prefix : str
+        출력 파일 접두사
+    bin_width : float
+        공통 격자 간격 (Angstrom)
+    n_clusters : int
+        군집 수
+    max_workers : int, optional
+        동시 읽기 수
+    align : str, optional
+        채널 좌표 정렬 방법 (hole_align.ALIGN_METHODS: 'xcorr', 'constriction', 기본: 정렬 안 함)
+    align_cache : bool or str
+        xcorr 쌍별 결과 캐시 파일 (True: {work_dir}/{prefix}_pairs.npz, False: 캐시 안 함)
+    anchor : str
+        constriction 기준 지점 ('min', 'first', 'last' - hole_align.constriction_anchor)
+
+    Returns
+    -------
+    dict
+        - 'success': bool
+        - 'comparison': resample_profiles 결과, 'clusters': cluster_profiles 결과
+        - 'alignment': hole_align.align_profiles 결과 (정렬한 경우)
+        - 'band_plot', 'heatmap_plot', 'cluster_plot': str - 그래프 파일
+        - 'matrix_file': str - .npz 행렬, 'matrix_tsv': str - .tsv 행렬
+        - 'error': str - 실패 원인 (실패 시)
+    """
+    print("=" * 60)
+    print("HOLE 프로파일 비교")
+    print("=" * 60)
+
+    profiles, labels = load_profiles(sources, max_workers=max_workers)
+    print(f"프로파일: {len(profiles)}/{len(sources)}개")
+    if not profiles:
+        return {'success': False, 'error': 'No profile loaded'}
+
+    work_path = Path(work_dir).resolve()
+    work_path.mkdir(parents=True, exist_ok=True)
+
+    alignment = None
+    if align:
+        from hole_align import align_profiles, PairCache
+
+        cache = None
+        if align_cache:
+            cache = PairCache(work_path / f"{output_prefix}_pairs.npz" if align_cache is True else align_cache)
+        alignment = align_profiles(profiles, method=align, bin_width=bin_width, cache=cache, anchor=anchor)
+        if alignment['reference'] is not None:
+            print(f"✓ 정렬 (xcorr): 기준 {labels[alignment['reference']]}, "
+                  f"새로 계산한 쌍 {alignment['computed']}개, 축 반전 {int(np.sum(alignment['signs'] < 0))}개")
+        else:
+            print(f"✓ 정렬 (constriction, {anchor}): 기준 지점 → 0 Å")
+
+    comparison = resample_profiles(profiles, labels, bin_width=bin_width,
+                                   shifts=alignment['shifts'] if alignment else None,
+                                   signs=alignment['signs'] if alignment else None)
+    if alignment and alignment['distance'] is not None:
+        distances = alignment['distance']   # 쌍마다 가장 잘 맞는 이동에서의 거리
+    else:
+        distances = profile_distances(comparison['radius'])
+    clusters = cluster_profiles(distances, n_clusters=n_clusters)
+    print(f"✓ 공통 격자: {comparison['radius'].shape[0]} 구조 × {comparison['radius'].shape[1]} 격자 "
+          f"({comparison['channel_coord'][0]:.1f} ~ {comparison['channel_coord'][-1]:.1f} Å)")
+    print(f"✓ 군집: {clusters['n_clusters']}개 "
+          f"({', '.join(str(n) for n in np.bincount(clusters['labels']))})")
+
+    result = {'success': True, 'comparison': comparison, 'clusters': clusters, 'alignment': alignment}
+
+    for key, plot, extra in (('band_plot', plot_profile_band, {}),
+                             ('heatmap_plot', plot_profile_heatmap, {'clusters': clusters}),
+                             ('cluster_plot', plot_profile_clusters, {'clusters': clusters})):
+        plot_file = work_path / f"{output_prefix}_{key.replace('_plot', '')}.png"
+        fig = plot(comparison, save_as=str(plot_file), **extra)
+        plt.close(fig)
+        result[key] = str(plot_file)
+
+    result['matrix_file'] = export_matrix(comparison, work_path / f"{output_prefix}_matrix.npz", clusters)
+    result['matrix_tsv'] = export_matrix(comparison, work_path / f"{output_prefix}_matrix.tsv", clusters)
+    print(f"✓ 행렬 저장: {result['matrix_file']}")
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    from hole_align import ALIGN_METHODS
+
+    parser = argparse.ArgumentParser(description='여러 HOLE 프로파일 비교 (분포 띠 / 히트맵 / 군집 / 행렬)')
+    parser.add_argument('sources', nargs='+',
+                        help='프로파일 파일 (.npz/.parquet/.h5) 또는 HOLE 출력 파일, glob 패턴 가능')
+    parser.add_argument('--work-dir', '-o', default='.', help='출력 디렉토리 (기본: 현재 디렉토리)')
+    parser.add_argument('--prefix', default='comparison', help='출력 파일 접두사 (기본: comparison)')
+    parser.add_argument('--clusters', '-k', type=int, default=4, help='군집 수 (기본: 4)')
+    parser.add_argument('--bin-width', type=float, default=BIN_WIDTH,
+                        help=f'공통 격자 간격 Å (기본: {BIN_WIDTH})')
+    parser.add_argument('--align', choices=ALIGN_METHODS, default=None,
+                        help='채널 좌표 정렬: xcorr (교차상관) / constriction (좁은 지점 기준) (기본: 정렬 안 함)')
+    parser.add_argument('--anchor', choices=['min', 'first', 'last'], default='min',
+                        help='constriction 기준 지점: 최소 반경 / 낮은 쪽 / 높은 쪽 첫 좁은 구간 (기본: min)')
+    parser.add_argument('--workers', '-j', type=int, default=None, help='동시 읽기 수 (기본: CPU 코어 수)')
+    args = parser.parse_args()
+
+    files = []
+    for pattern in args.sources:
+        files.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    result = compare_profiles(files, work_dir=args.work_dir, output_prefix=args.prefix,
+                              bin_width=args.bin_width, n_clusters=args.clusters, max_workers=args.workers,
+                              align=args.align, anchor=args.anchor)
+    raise SystemExit(0 if result['success'] else 1)
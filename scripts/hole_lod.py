@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+기공 표면 세부 수준 (LOD) 프리셋
+==============================
+표면 점 밀도(dotden), 점 구름 솎아내기(voxel), 렌더링 해상도(ray), surface_quality, PNG DPI를
+프리셋 하나로 함께 선택
+
+- preview: 배치 스크린용 빠른 미리보기 (점 적게 + 1 Å voxel 솎아내기, 400×400, surface_quality 0)
+- report: 기본값 (dotden 15, 솎아내기 없음, 800×800, surface_quality 1 - 기존 파이프라인과 동일)
+- publication: 고품질 (dotden 25, 1600×1600, surface_quality 2, 300 DPI)
+
+솎아내기는 점을 voxel 격자에 넣고 (voxel, 색상)마다 voxel 중심에 가장 가까운 점 하나만 남깁니다.
+색상별로 따로 남기므로 좁은 구간(red) 점이 넓은 구간 점에 묻혀 사라지지 않습니다.
+
+사용 예시:
+---------
+from hole_lod import lod_settings, decimate_surface
+
+settings = lod_settings('preview')
+surface = decimate_surface(surface, settings['voxel'])
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+
+LOD_PRESETS = {
+    'preview': {'dotden': 8, 'voxel': 1.0, 'width': 400, 'height': 400, 'surface_quality': 0, 'dpi': 100},
+    'report': {'dotden': 15, 'voxel': None, 'width': 800, 'height': 800, 'surface_quality': 1, 'dpi': 200},
+    'publication': {'dotden': 25, 'voxel': None, 'width': 1600, 'height': 1600, 'surface_quality': 2, 'dpi': 300}
+}
+
+# lod를 지정하지 않았을 때 (기존 기본값)
+DEFAULT_LOD = 'report'
+
+
+def lod_settings(lod=None):
+    """
+    LOD 프리셋 설정
+
+    Parameters
+    ----------
+    lod : str or dict, optional
+        프리셋 이름 ('preview', 'report', 'publication') 또는
+        {'preset': 이름, 바꿀 설정...} (예: {'preset': 'preview', 'width': 600})
+        None이면 DEFAULT_LOD
+
+    Returns
+    -------
+    dict
+        'name', 'dotden', 'voxel' (Å 또는 None), 'width', 'height', 'surface_quality', 'dpi'
+
+    Raises
+    ------
+    ValueError
+        알 수 없는 프리셋 / 설정 이름
+    """
+    overrides = {}
+    if isinstance(lod, dict):
+        overrides = dict(lod)
+        lod = overrides.pop('preset', DEFAULT_LOD)
+    lod = lod or DEFAULT_LOD
+    if lod not in LOD_PRESETS:
+        raise ValueError(f"알 수 없는 LOD 프리셋: {lod} (가능: {', '.join(LOD_PRESETS)})")
+    unknown = set(overrides) - set(LOD_PRESETS[lod])
+    if unknown:
+        raise ValueError(f"알 수 없는 LOD 설정: {', '.join(sorted(unknown))} (가능: {', '.join(LOD_PRESETS[lod])})")
+    return dict(LOD_PRESETS[lod], **overrides, name=lod)
+
+
+def normalize_lod(lod):
+    """
+    lod 값 정규화 - 같은 설정이면 같은 값 (체크포인트 / 캐시 키용)
+
+    Returns
+    -------
+    None, str or dict
+        기본 설정(DEFAULT_LOD)과 같으면 None, 바뀐 값이 없는 프리셋은 이름,
+        그 밖에는 {'preset': 이름, 프리셋과 다른 설정...}
+
+    Raises
+    ------
+    ValueError
+        알 수 없는 프리셋 / 설정 이름
+    """
+    settings = lod_settings(lod)
+    preset = LOD_PRESETS[settings['name']]
+    overrides = {key: value for key, value in settings.items() if key != 'name' and value != preset[key]}
+    if overrides:
+        return dict(overrides, preset=settings['name'])
+    return None if settings['name'] == DEFAULT_LOD else settings['name']
+
+
+def voxel_decimate(coords, voxel_size, colour=None):
+    """
+    voxel 격자 솎아내기 - (voxel, 색상)마다 voxel 중심에 가장 가까운 점 하나
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        점 좌표 (N, 3)
+    voxel_size : float
+        voxel 한 변 (Å), None 또는 0 이하면 솎아내지 않음
+    colour : np.ndarray, optional
+        점 색상 번호 (N,) - 색상이 다른 점은 같은 voxel이어도 따로 남김
+
+    Returns
+    -------
+    np.ndarray
+        남길 점 번호 (원래 순서)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if not voxel_size or voxel_size <= 0 or len(coords) == 0:
+        return np.arange(len(coords))
+
+    cells = np.floor(coords / voxel_size).astype(np.int64)
+    # (voxel, 색상)을 정수 하나로 묶어 1차원 np.unique (axis=0보다 훨씬 빠름)
+    columns = [cells[:, 0], cells[:, 1], cells[:, 2]]
+    if colour is not None:
+        columns.append(np.asarray(colour, dtype=np.int64))
+    columns = [column - column.min() for column in columns]
+    keys = np.ravel_multi_index(columns, [int(column.max()) + 1 for column in columns])
+    _, group = np.unique(keys, return_inverse=True)
+
+    # 그룹 안에서 voxel 중심까지 거리가 가장 작은 점: (그룹, 거리) 정렬 후 그룹별 첫 점
+    distance = np.sum((coords - (cells + 0.5) * voxel_size) ** 2, axis=1)
+    order = np.lexsort((distance, group))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = group[order][1:] != group[order][:-1]
+    return np.sort(order[first])
+
+
+def decimate_surface(surface, voxel_size):
+    """
+    표면 점 QptPlot 솎아내기 (선분은 그대로)
+
+    Parameters
+    ----------
+    surface : QptPlot
+        .qpt / hole_surface 결과
+    voxel_size : float
+        voxel 한 변 (Å), None이면 그대로 반환
+
+    Returns
+    -------
+    QptPlot
+        점 / 점 색상만 줄인 복사본
+    """
+    if not voxel_size:
+        return surface
+    keep = voxel_decimate(surface.dots, voxel_size, colour=surface.dot_colour)
+    return replace(surface, dots=surface.dots[keep], dot_colour=surface.dot_colour[keep])
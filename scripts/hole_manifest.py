@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+파이프라인 실행 매니페스트 (단계별 체크포인트)
+==========================================
+작업 디렉토리마다 {prefix}_manifest.json에 단계(hole, plot, pymol, render)별
+입력 해시, 출력 파일 (이름 + SHA-256), 상태를 기록하여
+다시 실행할 때 완료되었고 입력/출력이 바뀌지 않은 단계를 건너뜀
+
+- 입력 해시는 단계 옵션 + 앞 단계 출력 파일 해시로 계산하므로 앞 단계가 다시 실행되면
+  뒤 단계도 자동으로 다시 실행됨 (HOLE 결과는 실행마다 조금씩 다름)
+- 출력 파일은 작업 디렉토리 기준 이름으로 기록하고, 정리 단계가 intermediate_files/로
+  옮긴 파일은 재개 시 작업 디렉토리로 되돌림 (이후 단계가 .sph 옆에 결과를 쓰므로)
+- 매니페스트는 임시 파일에 쓴 뒤 rename으로 교체 (중간에 종료되어도 손상되지 않음)
+
+사용 예시:
+---------
+from hole_manifest import RunManifest, stage_key
+
+manifest = RunManifest("output", "my_analysis")
+key = stage_key('plot', {'profile_format': 'npz'}, manifest.output_hashes('hole'))
+entry = manifest.check('plot', key)
+if entry is None:
+    ...  # 단계 실행
+    manifest.record('plot', key, {'plot_file': "output/my_analysis_profile.png"})
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+# 매니페스트 형식 버전 (단계 구성이나 기록 방식이 바뀌면 증가시켜 기존 기록 무효화)
+MANIFEST_VERSION = "1"
+
+# 정리 단계가 중간 파일을 옮기는 디렉토리 (작업 디렉토리 기준)
+INTERMEDIATE_DIR = "intermediate_files"
+
+
+def hash_file(path, chunk_size=1024 ** 2):
+    """파일 내용 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """NumPy 값/경로를 JSON으로 변환"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def stage_key(*parts):
+    """단계 입력 (이름, 옵션, 앞 단계 출력 해시 ...)의 SHA-256 키"""
+    digest = hashlib.sha256(f"hole-manifest-v{MANIFEST_VERSION}".encode())
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(json.dumps(part, sort_keys=True, default=_json_default).encode())
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """
+    작업 디렉토리 하나의 단계별 실행 기록
+
+    Parameters
+    ----------
+    work_dir : str
+        파이프라인 작업 디렉토리
+    output_prefix : str
+        출력 파일 접두사 ({work_dir}/{prefix}_manifest.json)
+    """
+
+    def __init__(self, work_dir, output_prefix):
+        self.work_dir = Path(work_dir).resolve()
+        self.path = self.work_dir / f"{output_prefix}_manifest.json"
+        self.data = {'version': MANIFEST_VERSION, 'output_prefix': output_prefix, 'stages': {}}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.data = data
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def stages(self):
+        return self.data['stages']
+
+    def locate(self, name):
+        """
+        출력 파일 찾기 - 작업 디렉토리에 없고 intermediate_files/에 있으면 작업 디렉토리로 되돌림
+
+        Returns
+        -------
+        Path or None
+            작업 디렉토리 안의 파일 경로 (어디에도 없으면 None)
+        """
+        path = self.work_dir / name
+        if path.is_file():
+            return path
+        moved = self.work_dir / INTERMEDIATE_DIR / name
+        if moved.is_file():
+            moved.rename(path)
+            return path
+        return None
+
+    def check(self, stage, inputs):
+        """
+        단계를 건너뛸 수 있는지 확인
+
+        기록이 완료 상태이고, 입력 해시가 같고, 모든 출력 파일이 (intermediate_files/ 포함)
+        존재하며 내용 해시가 같으면 기록을 반환합니다.
+
+        Returns
+        -------
+        dict or None
+            단계 기록 ('outputs': {역할: 작업 디렉토리 안의 경로 str}, 'result': 추가 결과값)
+            다시 실행해야 하면 None
+        """
+        entry = self.stages.get(stage)
+        if not entry or entry.get('status') != 'complete' or entry.get('inputs') != inputs:
+            return None
+
+        # 해시를 먼저 모두 확인한 뒤 intermediate_files/의 파일을 되돌림
+        found = {}
+        for role, output in entry['outputs'].items():
+            path = self.work_dir / output['name']
+            if not path.is_file():
+                path = self.work_dir / INTERMEDIATE_DIR / output['name']
+            if not path.is_file() or path.stat().st_size != output['size'] or hash_file(path) != output['sha256']:
+                return None
+            found[role] = output['name']
+
+        return dict(entry, outputs={role: str(self.locate(name)) for role, name in found.items()})
+
+    def record(self, stage, inputs, outputs, result=None, status='complete', error=None):
+        """
+        단계 실행 결과 기록 후 저장
+
+        Parameters
+        ----------
+        stage : str
+            단계 이름
+        inputs : str
+            stage_key로 계산한 입력 해시
+        outputs : dict
+            {역할: 파일 경로} - 작업 디렉토리 안의 파일 (없는 파일은 기록하지 않음)
+        result : dict, optional
+            재개 시 결과 딕셔너리에 되돌릴 JSON 값 (최소 반경, 탐지된 축 ...)
+        status : str
+            'complete', 'failed' 또는 'fallback' (대체 경로 결과 - complete가 아니므로 다음 실행에서 다시 실행)
+        error : str, optional
+            실패 원인
+        """
+        files = {}
+        for role, path in outputs.items():
+            if path and Path(path).is_file():
+                files[role] = {'name': Path(path).name, 'size': Path(path).stat().st_size,
+                               'sha256': hash_file(path)}
+        self.stages[stage] = {
+            'status': status,
+            'inputs': inputs,
+            'outputs': files,
+            'result': result or {},
+            'error': error,
+            'time': round(time.time(), 3)
+        }
+        self.save()
+
+    def output_hashes(self, stage):
+        """단계 출력 파일 해시 {역할: sha256} (다음 단계 입력 해시 계산용)"""
+        entry = self.stages.get(stage) or {}
+        return {role: output['sha256'] for role, output in entry.get('outputs', {}).items()}
+
+    def save(self):
+        """매니페스트 저장 (임시 파일 → rename)"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=1, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_path, self.path)
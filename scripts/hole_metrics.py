@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+HOLE 파이프라인 단계별 측정
+=========================
+단계(HOLE, 그래프, PyMOL 파일, 렌더링 ...)마다 벽시계 시간, CPU 시간, 자식 프로세스
+(HOLE, sph_process, pymol)의 CPU 시간과 최대 RSS, 출력 파일 크기를 기록
+
+- 단계는 measure() 컨텍스트로 감싸며, 안쪽의 measure()는 바깥 단계의 'steps'에 기록
+- 자식 프로세스는 run_process / MeasuredPopen으로 실행하면 종료 시 os.wait4로
+  rusage를 회수하여 프로세스를 시작한 단계의 'processes'에 기록
+- 측정 중인 단계가 없으면 기록하지 않으므로 run_hole 등을 단독으로 호출해도 부담 없음
+- 결과는 dict 리스트 (run_full_analysis 결과의 'metrics'), JSON lines 파일로 추가 기록 가능
+
+사용 예시:
+---------
+from hole_metrics import measure, run_process, write_metrics_jsonl
+
+metrics = []
+with measure('hole', metrics):
+    run_process(['hole'], stdin=inp, stdout=out)
+write_metrics_jsonl("metrics.jsonl", metrics, structure="1grm")
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# 스레드별 측정 중인 단계 스택 (비동기 파이프라인에서 단계가 서로 다른 스레드에서 실행)
+_LOCAL = threading.local()
+
+
+def _stack():
+    if not hasattr(_LOCAL, 'stack'):
+        _LOCAL.stack = []
+    return _LOCAL.stack
+
+
+def _current_rss_kb():
+    """현재 프로세스의 RSS (KB, Linux /proc 기준, 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _rss_high_water_kb():
+    """현재 프로세스의 최대 RSS (KB, 프로세스 시작 이후 최고값)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@contextmanager
+def measure(name, metrics=None):
+    """
+    단계 측정 컨텍스트
+
+    Parameters
+    ----------
+    name : str
+        단계 이름 ('hole', 'filter', 'plot' ...)
+    metrics : list, optional
+        기록을 추가할 리스트 - None이면 바깥 단계의 'steps'에 추가
+        (바깥 단계도 없으면 기록하지 않음)
+
+    Yields
+    ------
+    dict
+        단계 기록 - 종료 시 다음 값이 채워짐:
+        - 'stage': str, 'wall': float (초)
+        - 'cpu': float - 이 스레드의 CPU 시간 (초)
+        - 'process_cpu': float - 프로세스 전체 CPU 시간 (초, PyMOL 내부 스레드 포함 -
+          단계가 하나씩 실행될 때 정확)
+        - 'child_cpu': float - 자식 프로세스 CPU 시간 합 (초, 안쪽 단계 포함)
+        - 'child_max_rss_kb': int - 자식 프로세스 최대 RSS (KB, 안쪽 단계 포함)
+        - 'rss_high_water_kb': int - 단계 종료 시점의 프로세스 최대 RSS (KB)
+        - 'processes': list - 자식 프로세스별 'command', 'wall', 'cpu', 'max_rss_kb',
+          'spawn_rss_kb', 'returncode'
+        - 'steps': list - 안쪽 단계 기록
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    record = {'stage': name, 'processes': [], 'steps': []}
+    if metrics is None and parent is None:
+        yield record
+        return
+
+    start_wall, start_cpu, start_process = time.perf_counter(), time.thread_time(), time.process_time()
+    stack.append(record)
+    try:
+        yield record
+    finally:
+        stack.pop()
+        children = _all_processes(record)
+        record.update({
+            'wall': round(time.perf_counter() - start_wall, 6),
+            'cpu': round(time.thread_time() - start_cpu, 6),
+            'process_cpu': round(time.process_time() - start_process, 6),
+            'child_cpu': round(sum(p['cpu'] for p in children), 6),
+            'child_max_rss_kb': max((p['max_rss_kb'] for p in children), default=0),
+            'rss_high_water_kb': _rss_high_water_kb()
+        })
+        (metrics if metrics is not None else parent['steps']).append(record)
+
+
+def _all_processes(record):
+    """단계와 안쪽 단계의 자식 프로세스 기록"""
+    return record['processes'] + [p for step in record['steps'] for p in _all_processes(step)]
+
+
+def record_outputs(record, paths):
+    """단계 기록에 출력 파일 크기 추가 ('outputs': {파일 이름: 바이트}, 'output_bytes')"""
+    outputs = {}
+    for path in paths:
+        if path and Path(path).is_file():
+            outputs[Path(path).name] = Path(path).stat().st_size
+    record['outputs'] = outputs
+    record['output_bytes'] = sum(outputs.values())
+    return record
+
+
+# MeasuredPopen.wait(timeout) 폴링 간격 (초) - Popen.wait와 같이 짧게 시작하여 늘림
+WAIT_POLL_MIN = 0.0005
+WAIT_POLL_MAX = 0.05
+
+
+class MeasuredPopen(subprocess.Popen):
+    """
+    종료 상태를 os.wait4로 회수하여 자식 프로세스 rusage를 기록하는 Popen
+
+    프로세스를 시작한 스레드의 측정 중인 단계에 기록합니다 (없으면 기록 안 함).
+    poll()로 먼저 종료가 확인된 프로세스는 rusage를 얻을 수 없어 기록되지 않습니다.
+
+    Linux의 ru_maxrss는 exec 이전 (fork 시점 부모 프로세스) 메모리도 포함하므로
+    max_rss_kb가 spawn_rss_kb (실행 시점 부모 RSS)와 같으면 자식의 실제 최대 RSS는 그 이하입니다.
+    """
+
+    def __init__(self, args, **kwargs):
+        stack = _stack()
+        self._measure_record = stack[-1] if stack else None
+        self._measure_start = time.perf_counter()
+        self._spawn_rss_kb = _current_rss_kb() if self._measure_record is not None else None
+        super().__init__(args, **kwargs)
+
+    def wait(self, timeout=None):
+        """
+        Popen.wait와 같은 동작 - 직접 os.wait4로 회수하여 rusage 기록
+
+        os.wait4가 없거나 이미 회수된 프로세스는 Popen.wait에 맡깁니다 (rusage 기록 없음).
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            timeout 안에 종료되지 않은 경우 (프로세스는 회수되지 않은 채로 남음)
+        """
+        if self.returncode is not None or not hasattr(os, 'wait4'):
+            return super().wait(timeout=timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = WAIT_POLL_MIN
+        while True:
+            try:
+                pid, status, rusage = os.wait4(self.pid, 0 if deadline is None else os.WNOHANG)
+            except ChildProcessError:
+                # 다른 곳(poll 등)에서 이미 회수됨
+                return super().wait(timeout=timeout)
+            if pid == self.pid:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            delay = min(delay * 2, remaining, WAIT_POLL_MAX)
+            time.sleep(delay)
+
+        self.returncode = os.waitstatus_to_exitcode(status)
+        if self._measure_record is not None:
+            command = self.args[0] if isinstance(self.args, (list, tuple)) else str(self.args).split()[0]
+            self._measure_record['processes'].append({
+                'command': Path(str(command)).name,
+                'wall': round(time.perf_counter() - self._measure_start, 6),
+                'cpu': round(rusage.ru_utime + rusage.ru_stime, 6),
+                'max_rss_kb': rusage.ru_maxrss,
+                'spawn_rss_kb': self._spawn_rss_kb,
+                'returncode': self.returncode
+            })
+        return self.returncode
+
+
+def run_process(args, timeout=None, capture_output=False, **kwargs):
+    """
+    subprocess.run 대체 - 같은 인자/반환값, 자식 프로세스 rusage를 현재 단계에 기록
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        제한 시간 초과 (프로세스는 종료 후 회수됨)
+    """
+    if capture_output:
+        kwargs['stdout'] = kwargs['stderr'] = subprocess.PIPE
+    with MeasuredPopen(args, **kwargs) as proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+    return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+
+def format_metrics(metrics):
+    """단계 기록 → 한 줄씩 요약 문자열 리스트"""
+    lines = []
+    for record in metrics:
+        line = f"{record['stage']:<9} {record['wall']:7.2f}s (CPU {record['process_cpu']:.2f}s"
+        if record['child_cpu'] or record['child_max_rss_kb']:
+            commands = sorted({p['command'] for p in _all_processes(record)})
+            line += (f", 자식 {record['child_cpu']:.2f}s / 최대 RSS {record['child_max_rss_kb'] / 1024:.1f} MB"
+                     f" [{', '.join(commands)}]")
+        line += ")"
+        if record.get('resumed'):
+            line += " [재사용]"
+        if record.get('output_bytes'):
+            line += f" 출력 {record['output_bytes'] / 1024:.1f} KB"
+        lines.append(line)
+    return lines
+
+
+def write_metrics_jsonl(jsonl_file, metrics, **context):
+    """
+    단계 기록을 JSON lines 파일에 추가 (한 줄 = 한 단계)
+
+    한 구조의 모든 줄을 O_APPEND 한 번의 쓰기로 기록하므로 배치 워커 프로세스들이
+    같은 파일에 동시에 기록해도 줄이 섞이지 않습니다.
+
+    Parameters
+    ----------
+    jsonl_file : str
+        출력 파일 경로 (없으면 생성)
+    metrics : list of dict
+        measure() 기록
+    **context
+        모든 줄에 함께 기록할 값 (structure, pdb_file ...)
+    """
+    context.setdefault('time', round(time.time(), 3))
+    text = ''.join(json.dumps(dict(context, **record), ensure_ascii=False, default=str) + '\n'
+                   for record in metrics)
+    Path(jsonl_file).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(jsonl_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, text.encode('utf-8'))
+    finally:
+        os.close(fd)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+HOLE 다중 시작점 탐색
+====================
+시작점(cpoint) 격자와 축(cvect) 기울기 후보를 만들고, 후보별 HOLE 결과를
+경로 길이 / 중심성 / 연속성으로 점수화하여 가장 좋은 경로를 선택
+
+- 넓거나 비대칭인 기공에서 HOLE의 Monte Carlo 탐색이 측면 통로(fenestration)로
+  빠지는 경우를 여러 시작점 중 가장 길고 곧게 이어진 경로로 걸러냄
+- HOLE 실행은 hole_runner.run_hole_multistart에서 후보별 디렉토리로 동시에 수행
+
+사용 예시:
+---------
+from hole_multistart import start_candidates, score_path, select_best
+
+candidates = start_candidates([0, 0, 1], [0, 0, 0], n_starts=8)
+scores = [score_path(coord, centres, radii, [0, 0, 1], [0, 0, 0]) for coord, centres, radii in runs]
+best = select_best(scores)
+"""
+
+import numpy as np
+
+from hole_axis import _unit, _plane_basis
+
+
+# 시작점 이동 거리 (Angstrom) / 축 기울기 (도)
+START_SHIFT = 2.0
+AXIS_TILT = 10.0
+
+# 중심성: 기준 축에서 구 중심까지 거리를 구 반경(최소 CENTRALITY_SCALE Å)으로 나눈 평균이 1이면 0.5
+# 넓은 전정(vestibule)에서 중심이 흔들리는 것보다 좁은 측면 통로로 벗어나는 것을 크게 평가
+CENTRALITY_SCALE = 2.0
+
+# 연속성: 구 중심 간격이 중앙값의 JUMP_FACTOR배 (최소 MIN_JUMP Å)를 넘으면 끊긴 것으로 판단
+JUMP_FACTOR = 3.0
+MIN_JUMP = 1.0
+
+# 최고 점수와 이 차이 이내인 후보는 같은 점수로 보고 앞선 후보 선택 (HOLE Monte Carlo 잡음)
+SCORE_TOLERANCE = 0.02
+
+
+def start_candidates(cvect, cpoint, n_starts, shift=START_SHIFT, tilt=AXIS_TILT):
+    """
+    기준 축 / 시작점 주변의 (cvect, cpoint) 후보 목록
+
+    시작점은 축 방향 ±shift, 수직 방향 ±shift 이동, 축은 수직 방향 4곳으로 tilt도 기울이며,
+    바뀐 요소가 적은 후보부터 (첫 후보는 기준 그대로) n_starts개를 반환합니다.
+
+    Parameters
+    ----------
+    cvect : list of float
+        기준 채널 방향 벡터
+    cpoint : list of float
+        기준 시작점
+    n_starts : int
+        후보 수
+    shift : float
+        시작점 이동 거리 (Angstrom)
+    tilt : float
+        축 기울기 (도)
+
+    Returns
+    -------
+    list of tuple
+        (cvect, cpoint) - 각각 float 3개 리스트
+    """
+    axis = _unit(cvect)
+    point = np.asarray(cpoint, dtype=float)
+    u, v = _plane_basis(axis)
+
+    points = [point] + [point + sign * shift * direction
+                        for direction in (axis, u, v) for sign in (1, -1)]
+    angle = np.radians(tilt)
+    axes = [axis] + [_unit(np.cos(angle) * axis + sign * np.sin(angle) * direction)
+                     for direction in (u, v) for sign in (1, -1)]
+
+    # 시작점 이동 → 축 기울기 → 둘 다 바꾼 조합 순
+    pairs = [(0, 0)]
+    pairs += [(0, j) for j in range(1, len(points))]
+    pairs += [(i, 0) for i in range(1, len(axes))]
+    pairs += [(i, j) for i in range(1, len(axes)) for j in range(1, len(points))]
+
+    return [([round(float(x), 4) for x in axes[i]], [round(float(x), 4) for x in points[j]])
+            for i, j in pairs[:max(1, n_starts)]]
+
+
+def score_path(channel_coord, centres, radii, cvect, cpoint):
+    """
+    HOLE 경로 하나의 품질 지표
+
+    Parameters
+    ----------
+    channel_coord : np.ndarray
+        채널 좌표 (HoleOutput.channel_coord)
+    centres, radii : np.ndarray
+        경로 순서의 구 중심 (N, 3) / 반경 (N,) (hole_surface.read_sph_spheres)
+    cvect, cpoint : list of float
+        중심성을 잴 기준 축 / 시작점 (후보가 아닌 공통 기준)
+
+    Returns
+    -------
+    dict
+        - 'path_length': float - 채널 좌표 범위 (Å)
+        - 'centrality': float - 1 / (1 + 평균(기준 축에서 구 중심까지 거리 / 구 반경))
+        - 'continuity': float - 끊기지 않은 구 중심 간격의 비율 (0~1)
+    """
+    channel_coord = np.asarray(channel_coord, dtype=float)
+    if len(channel_coord) < 2 or len(centres) < 2:
+        return {'path_length': 0.0, 'centrality': 0.0, 'continuity': 0.0}
+
+    axis = _unit(cvect)
+    offset = np.asarray(centres, dtype=float) - np.asarray(cpoint, dtype=float)
+    lateral = offset - np.outer(offset @ axis, axis)
+    deviation = np.linalg.norm(lateral, axis=1) / np.maximum(radii, CENTRALITY_SCALE)
+
+    steps = np.linalg.norm(np.diff(centres, axis=0), axis=1)
+    jump = max(MIN_JUMP, JUMP_FACTOR * np.median(steps))
+
+    return {
+        'path_length': float(channel_coord.max() - channel_coord.min()),
+        'centrality': float(1.0 / (1.0 + deviation.mean())),
+        'continuity': float(np.mean(steps <= jump))
+    }
+
+
+def select_best(scores):
+    """
+    후보 점수 목록에서 최적 경로 선택
+
+    종합 점수 = (경로 길이 / 최대 경로 길이) × 중심성 × 연속성 을 각 dict의 'score'에 기록하고,
+    최고 점수와 SCORE_TOLERANCE 이내이면 앞선 후보(기준 시작점에 가까운 후보)를 선택합니다.
+
+    Parameters
+    ----------
+    scores : list of dict
+        score_path 결과 (실패한 후보는 None)
+
+    Returns
+    -------
+    int or None
+        최적 후보 번호 (성공한 후보가 없거나 모든 경로 길이가 0이면 None, 이때 점수는 모두 0)
+    """
+    longest = max((s['path_length'] for s in scores if s), default=0.0)
+    for s in scores:
+        if s:
+            s['score'] = s['path_length'] / longest * s['centrality'] * s['continuity'] if longest > 0 else 0.0
+    if longest <= 0:
+        return None
+
+    values = np.array([s['score'] if s else -1.0 for s in scores])
+    return int(np.argmax(values >= values.max() - SCORE_TOLERANCE))
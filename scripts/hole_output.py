@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+HOLE 출력 파일 파서
+==================
+HOLE 출력(_out.txt)을 한 줄씩 한 번만 읽어 구조화된 결과 객체로 변환
+
+hole_runner.py / hole_plot.py의 모든 결과 함수(최소 반경, 전도도, 프로파일,
+TSV, 그래프)는 이 객체를 공유하므로, 한 번 파싱한 결과를 그대로 넘기면
+같은 파일을 다시 읽지 않습니다.
+
+파싱 결과는 save_profile로 열 단위 바이너리 파일(.npz / .parquet / .h5)에 저장하고
+load_profile로 다시 읽을 수 있습니다 (비압축 .npz, .parquet은 메모리 매핑).
+
+사용 예시:
+---------
+from hole_output import parse_hole_file, save_profile, load_profile
+
+out = parse_hole_file("hole_out.txt")
+print(out.min_radius, out.conductance)
+print(out.channel_coord.shape, out.radius.min())
+
+save_profile(out, "hole_profile.npz", metadata={'structure': 'protein.pdb', 'endrad': 5.0})
+profile = load_profile("hole_profile.npz")
+print(profile.metadata['endrad'], profile.radius.min())
+"""
+
+import json
+import re
+import struct
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+
+# 프로파일 데이터 라인 (예: "  -31.44831     4.85048   -32.58166     0.00169   (sampled)")
+_PROFILE_PATTERN = re.compile(
+    r'^\s*(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+\((sampled|mid-point)\)')
+_MIN_RADIUS_PATTERN = re.compile(r'Minimum radius found:\s+([\d.]+)')
+_GEOMETRIC_FACTOR_PATTERN = re.compile(r'F=\s*sum\(ds/area\).*?is\s+([\d.]+)')
+_GMACRO_PATTERN = re.compile(r'Gmacro=\s+([\d.]+)')
+
+
+@dataclass
+class HoleOutput:
+    """
+    HOLE 출력 파일 파싱 결과
+
+    프로파일 배열은 채널 좌표 순으로 정렬되어 있습니다 (sampled + mid-point).
+
+    Attributes
+    ----------
+    output_file : str
+        파싱한 HOLE 출력 파일 경로
+    channel_coord : np.ndarray
+        채널 좌표 (cenxyz.cvec, Å)
+    radius : np.ndarray
+        기공 반경 (Å)
+    cen_line_d : np.ndarray
+        중심선을 따른 누적 거리 (Å)
+    sum_s_area : np.ndarray
+        sum{s/area} 누적값 (전도도 계산용)
+    sampled : np.ndarray
+        각 점이 'sampled'이면 True, 'mid-point'이면 False
+    min_radius : float or None
+        최소 기공 반경 (Å)
+    geometric_factor : float or None
+        F = sum(ds/area) (Å^-1)
+    conductance : float or None
+        거시적 예측 전도도 Gmacro (pS)
+    control_cards : list of str
+        HOLE이 읽은 입력 카드 (주석 제외)
+    has_header : bool
+        'cenxyz.cvec' 프로파일 헤더 존재 여부
+    completed : bool
+        'HOLE: normal completion' 확인 여부
+    metadata : dict
+        프로파일 파일에서 읽은 경우 저장된 메타데이터 (구조, 반지름 파일, endrad, cvect 등)
+    """
+    output_file: str
+    channel_coord: np.ndarray
+    radius: np.ndarray
+    cen_line_d: np.ndarray
+    sum_s_area: np.ndarray
+    sampled: np.ndarray
+    min_radius: float = None
+    geometric_factor: float = None
+    conductance: float = None
+    control_cards: list = field(default_factory=list)
+    has_header: bool = False
+    completed: bool = False
+    metadata: dict = field(default_factory=dict)
+
+    @property
+    def point_type(self):
+        """각 점의 종류 리스트 ('sampled' 또는 'mid-point')"""
+        return ['sampled' if s else 'mid-point' for s in self.sampled]
+
+    def __len__(self):
+        return len(self.channel_coord)
+
+
+def parse_hole_file(output_file):
+    """
+    HOLE 출력 파일을 한 번 읽어 HoleOutput 객체 생성
+
+    Parameters
+    ----------
+    output_file : str
+        HOLE 출력 텍스트 파일 경로
+
+    Returns
+    -------
+    HoleOutput
+        파싱 결과 (프로파일 데이터가 없으면 빈 배열)
+
+    Examples
+    --------
+    >>> out = parse_hole_file("hole_out.txt")
+    >>> print(f"Min radius: {out.min_radius:.2f} Å, Gmacro: {out.conductance} pS")
+    """
+    # (channel_coord, radius, cen_line_d, sum_s_area) 행 - sampled/mid-point 별도 수집
+    sampled_rows = []
+    midpoint_rows = []
+    control_cards = []
+    min_radius = None
+    geometric_factor = None
+    conductance = None
+    has_header = False
+    completed = False
+    in_cards = False
+
+    with open(output_file, 'r') as f:
+        for line in f:
+            stripped = line.strip()
+
+            # 프로파일 데이터 라인 (가장 많으므로 먼저 확인)
+            if stripped.endswith(('(sampled)', '(mid-point)')):
+                parts = stripped.split()
+                try:
+                    row = (float(parts[0]), float(parts[1]), float(parts[2]), float(parts[3]))
+                    is_sampled = parts[4] == '(sampled)'
+                except (ValueError, IndexError):
+                    # 숫자 열이 붙어 있는 경우 등 - 정규식으로 재시도
+                    match = _PROFILE_PATTERN.match(line)
+                    if not match:
+                        continue
+                    row = tuple(float(match.group(i)) for i in range(1, 5))
+                    is_sampled = match.group(5) == 'sampled'
+                (sampled_rows if is_sampled else midpoint_rows).append(row)
+                continue
+
+            # 입력 카드 에코 (" Control variables read:" 이후 빈 줄까지)
+            if in_cards:
+                if not stripped:
+                    in_cards = False
+                elif not stripped.startswith('!'):
+                    control_cards.append(stripped)
+                continue
+            if stripped.startswith('Control variables read'):
+                in_cards = True
+                continue
+
+            if stripped.startswith('cenxyz.cvec'):
+                has_header = True
+            elif min_radius is None and stripped.startswith('Minimum radius found'):
+                match = _MIN_RADIUS_PATTERN.search(stripped)
+                if match:
+                    min_radius = float(match.group(1))
+            elif geometric_factor is None and stripped.startswith('F='):
+                match = _GEOMETRIC_FACTOR_PATTERN.search(stripped)
+                if match:
+                    geometric_factor = float(match.group(1))
+            elif conductance is None and 'Gmacro=' in stripped:
+                match = _GMACRO_PATTERN.search(stripped)
+                if match:
+                    conductance = float(match.group(1))
+            elif stripped.startswith('HOLE: normal completion'):
+                completed = True
+
+    rows = np.array(sampled_rows + midpoint_rows, dtype=float).reshape(-1, 4)
+    sampled = np.zeros(len(rows), dtype=bool)
+    sampled[:len(sampled_rows)] = True
+
+    # 채널 좌표 순 정렬 (안정 정렬: 같은 좌표는 sampled 먼저)
+    order = np.argsort(rows[:, 0], kind='stable')
+    rows = rows[order]
+
+    return HoleOutput(
+        output_file=str(output_file),
+        channel_coord=rows[:, 0],
+        radius=rows[:, 1],
+        cen_line_d=rows[:, 2],
+        sum_s_area=rows[:, 3],
+        sampled=sampled[order],
+        min_radius=min_radius,
+        geometric_factor=geometric_factor,
+        conductance=conductance,
+        control_cards=control_cards,
+        has_header=has_header,
+        completed=completed
+    )
+
+
+def as_hole_output(output):
+    """
+    파일 경로 또는 이미 파싱된 HoleOutput을 HoleOutput으로 반환
+
+    이미 파싱된 객체는 그대로 반환하므로 파이프라인 내에서 파일을 다시 읽지 않습니다.
+    프로파일 파일(.npz / .parquet / .h5)은 load_profile로 읽습니다.
+    """
+    if isinstance(output, HoleOutput):
+        return output
+    if Path(output).suffix.lower() in PROFILE_FORMATS:
+        return load_profile(output)
+    return parse_hole_file(output)
+
+
+def output_name(output):
+    """파일 경로 또는 HoleOutput의 파일 이름(확장자 제외)"""
+    if isinstance(output, HoleOutput):
+        return Path(output.output_file).stem
+    return Path(output).stem
+
+
+# ---------------------------------------------------------------------------
+# 열 단위 프로파일 파일 (.npz / .parquet / .h5)
+# ---------------------------------------------------------------------------
+
+PROFILE_FORMAT_VERSION = 1
+
+# 확장자 → 형식
+PROFILE_FORMATS = {'.npz': 'npz', '.parquet': 'parquet', '.h5': 'hdf5', '.hdf5': 'hdf5'}
+
+# 저장하는 열 (HoleOutput 속성 이름)
+PROFILE_COLUMNS = ('channel_coord', 'radius', 'cen_line_d', 'sum_s_area', 'sampled')
+
+# 파일 메타데이터 키 (npz 배열 이름 / parquet 스키마 / hdf5 속성)
+_METADATA_KEY = 'hole_profile'
+
+
+def _json_default(value):
+    """NumPy 값/경로를 JSON으로 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _profile_metadata(parsed, metadata):
+    """HoleOutput 요약값 + 사용자 메타데이터"""
+    info = {
+        'format_version': PROFILE_FORMAT_VERSION,
+        'output_file': parsed.output_file,
+        'min_radius': parsed.min_radius,
+        'geometric_factor': parsed.geometric_factor,
+        'conductance': parsed.conductance,
+        'control_cards': list(parsed.control_cards),
+        'has_header': parsed.has_header,
+        'completed': parsed.completed,
+        'num_points': len(parsed)
+    }
+    info.update(parsed.metadata)
+    info.update(metadata or {})
+    return info
+
+
+def save_profile(output, profile_file, metadata=None, compress=True):
+    """
+    기공 반경 프로파일을 열 단위 바이너리 파일로 저장 (한 번에 기록)
+
+    형식은 확장자로 결정합니다:
+    - .npz: NumPy (추가 의존성 없음)
+    - .parquet: Apache Parquet (pyarrow 필요)
+    - .h5 / .hdf5: HDF5 (h5py 필요)
+
+    Parameters
+    ----------
+    output : str or HoleOutput
+        HOLE 출력 파일 경로 또는 파싱된 결과
+    profile_file : str
+        저장 경로
+    metadata : dict, optional
+        함께 저장할 정보 (예: structure, radius_file, endrad, cvect, cpoint)
+        최소 반경, 전도도, HOLE 입력 카드는 자동으로 포함
+    compress : bool
+        압축 여부 (.npz는 deflate, .parquet은 zstd, .h5는 gzip) -
+        load_profile은 비압축 .npz만 메모리 매핑하므로 다시 읽을 파일은 False 권장
+
+    Returns
+    -------
+    str
+        저장된 파일 경로
+
+    Raises
+    ------
+    ValueError
+        지원하지 않는 확장자
+    ImportError
+        .parquet / .h5 형식에 필요한 패키지가 없는 경우
+    """
+    parsed = as_hole_output(output)
+    profile_file = Path(profile_file)
+    fmt = PROFILE_FORMATS.get(profile_file.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"지원하지 않는 프로파일 형식: {profile_file.suffix} "
+                         f"(가능: {', '.join(PROFILE_FORMATS)})")
+
+    columns = {name: np.asarray(getattr(parsed, name)) for name in PROFILE_COLUMNS}
+    info = json.dumps(_profile_metadata(parsed, metadata), default=_json_default)
+
+    if fmt == 'npz':
+        save = np.savez_compressed if compress else np.savez
+        save(profile_file, **columns,
+             **{_METADATA_KEY: np.frombuffer(info.encode(), dtype=np.uint8)})
+
+    elif fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(columns).replace_schema_metadata({_METADATA_KEY: info})
+        pq.write_table(table, profile_file, compression='zstd' if compress else 'none')
+
+    else:
+        import h5py
+
+        with h5py.File(profile_file, 'w') as f:
+            for name, values in columns.items():
+                f.create_dataset(name, data=values, compression='gzip' if compress else None)
+            f.attrs[_METADATA_KEY] = info
+
+    return str(profile_file)
+
+
+def _memmap_npz(profile_file):
+    """
+    비압축 .npz의 각 배열을 메모리 매핑 (압축된 항목이 있으면 None)
+    """
+    arrays = {}
+    with zipfile.ZipFile(profile_file) as archive, open(profile_file, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                return None
+
+            # 로컬 파일 헤더(30바이트 + 이름 + extra) 다음이 .npy 데이터
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(profile_file, dtype=dtype, mode='r', shape=shape,
+                                         order='F' if fortran_order else 'C', offset=f.tell())
+    return arrays
+
+
+def load_profile(profile_file):
+    """
+    save_profile로 저장한 프로파일 파일 읽기
+
+    비압축 .npz는 배열을 메모리 매핑하므로 큰 파일도 필요한 부분만 디스크에서 읽힙니다.
+    압축된 .npz는 전체를 풀어 읽고, .parquet은 memory_map으로 파일을 복사하지 않고
+    열어도 열 페이지는 디코딩 (압축 시 해제)해서 배열을 만듭니다.
+
+    Parameters
+    ----------
+    profile_file : str
+        .npz / .parquet / .h5 프로파일 파일
+
+    Returns
+    -------
+    HoleOutput
+        프로파일 배열과 저장된 요약값, metadata에 저장된 전체 메타데이터
+        (output_file은 원래 HOLE 출력 파일 경로)
+
+    Examples
+    --------
+    >>> profile = load_profile("analysis_profile.npz")
+    >>> profile.radius.min(), profile.metadata['endrad']
+    """
+    profile_file = Path(profile_file)
+    fmt = PROFILE_FORMATS.get(profile_file.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"지원하지 않는 프로파일 형식: {profile_file.suffix}")
+
+    if fmt == 'npz':
+        arrays = _memmap_npz(profile_file)
+        if arrays is None:
+            with np.load(profile_file) as data:
+                arrays = {name: data[name] for name in data.files}
+        columns = {name: arrays[name] for name in PROFILE_COLUMNS}
+        info = bytes(arrays[_METADATA_KEY]).decode()
+
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(profile_file, memory_map=True)
+        columns = {name: table.column(name).to_numpy() for name in PROFILE_COLUMNS}
+        info = table.schema.metadata[_METADATA_KEY.encode()].decode()
+
+    else:
+        import h5py
+
+        with h5py.File(profile_file, 'r') as f:
+            columns = {name: f[name][()] for name in PROFILE_COLUMNS}
+            info = f.attrs[_METADATA_KEY]
+            if isinstance(info, bytes):
+                info = info.decode()
+
+    metadata = json.loads(info)
+    return HoleOutput(
+        output_file=metadata.get('output_file') or str(profile_file),
+        channel_coord=columns['channel_coord'],
+        radius=columns['radius'],
+        cen_line_d=columns['cen_line_d'],
+        sum_s_area=columns['sum_s_area'],
+        sampled=columns['sampled'].astype(bool, copy=False),
+        min_radius=metadata.get('min_radius'),
+        geometric_factor=metadata.get('geometric_factor'),
+        conductance=metadata.get('conductance'),
+        control_cards=metadata.get('control_cards', []),
+        has_header=metadata.get('has_header', True),
+        completed=metadata.get('completed', True),
+        metadata=metadata
+    )
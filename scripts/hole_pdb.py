@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+HOLE PDB 입력 계층
+=================
+PDB 파일을 한 번 읽어 배열 기반 원자 테이블(AtomTable)로 변환하고,
+ignore/HETATM 선택을 벡터화된 마스크로 적용한 뒤 한 번의 쓰기로 필터링된 PDB를 저장
+
+- 고정 폭 열(record, atom name, resName, chainID, x/y/z)을 라인별 반복 없이 바이트 배열에서 바로 잘라냄
+- 원본 라인은 그대로 보관하므로 필터링 결과는 기존 라인 단위 필터와 바이트 단위로 동일
+- 같은 테이블을 트라젝토리 프레임, 채널 축 탐지, PyMOL 단계에서 다시 사용
+
+사용 예시:
+---------
+from hole_pdb import read_pdb, selection_mask, write_pdb
+
+table = read_pdb("protein.pdb")
+keep, hetatm_lines, removed = selection_mask(table, {'HOH', 'DUM'})
+write_pdb(table, "filtered.pdb", keep)
+print(table.coords[keep[table.atom_index]].mean(axis=0))
+"""
+
+from dataclasses import dataclass
+from itertools import compress
+
+import numpy as np
+
+
+# HETATM 전체 제거 시 함께 제거할 헤더 레코드 (HET, HETNAM, HETSYN, FORMUL)
+HET_RECORD_PREFIXES = ('HET', 'FORMUL')
+
+NEWLINE = ord('\n')
+SPACE = ord(' ')
+
+# 고정 폭 열 범위 (0부터 시작, 끝 미포함)
+PDB_COLUMNS = {
+    'record': (0, 6),
+    'name': (12, 16),
+    'resname': (17, 20),
+    'chain': (21, 22),
+    'x': (30, 38),
+    'y': (38, 46),
+    'z': (46, 54)
+}
+
+
+@dataclass
+class AtomTable:
+    """
+    배열 기반 PDB 원자 테이블
+
+    Attributes
+    ----------
+    source : str
+        읽은 PDB 파일 경로 (라인에서 만든 경우 빈 문자열)
+    lines : list of str
+        원본 라인 (줄바꿈 포함) - 필터링된 PDB 쓰기에 그대로 사용
+    record : np.ndarray
+        라인별 레코드 이름 (L,) - 'ATOM', 'HETATM', 'REMARK' ...
+    atom_index : np.ndarray
+        원자별 라인 번호 (N,)
+    hetatm : np.ndarray
+        HETATM 원자 여부 (N,) bool
+    name : np.ndarray
+        원자 이름 (N,)
+    resname : np.ndarray
+        잔기 이름 (N,)
+    chain : np.ndarray
+        체인 ID (N,)
+    coords : np.ndarray
+        좌표 (N, 3) float - 읽을 수 없는 좌표는 NaN
+    """
+    source: str
+    lines: list
+    record: np.ndarray
+    atom_index: np.ndarray
+    hetatm: np.ndarray
+    name: np.ndarray
+    resname: np.ndarray
+    chain: np.ndarray
+    coords: np.ndarray
+
+    def __len__(self):
+        return len(self.atom_index)
+
+    @classmethod
+    def from_lines(cls, lines, source=''):
+        """PDB 라인 리스트(줄바꿈 포함)에서 테이블 생성"""
+        text = ''.join(lines).encode('latin-1', errors='replace')
+        data = np.frombuffer(text, dtype=np.uint8)
+
+        # 라인 시작 위치/길이 (줄바꿈 제외) - 문자 1개 = 1바이트, 줄바꿈은 라인 끝에만 있음
+        ends = np.flatnonzero(data == NEWLINE)
+        if len(ends) < len(lines):
+            ends = np.append(ends, data.size)
+        starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+        lengths = ends - starts
+
+        record = _column(data, starts, lengths, *PDB_COLUMNS['record'])
+        is_hetatm = np.all(record == np.frombuffer(b'HETATM', dtype=np.uint8), axis=1)
+        # run_hole의 기존 규칙과 같이 'ATOM'으로 시작하는 레코드는 모두 원자로 취급
+        is_atom = np.all(record[:, :4] == np.frombuffer(b'ATOM', dtype=np.uint8), axis=1) | is_hetatm
+        atom_index = np.flatnonzero(is_atom)
+
+        atom_starts = starts[atom_index]
+        atom_lengths = lengths[atom_index]
+
+        def field(key):
+            return _decode(_column(data, atom_starts, atom_lengths, *PDB_COLUMNS[key]))
+
+        begin, end = PDB_COLUMNS['x'][0], PDB_COLUMNS['z'][1]
+        xyz = _column(data, atom_starts, atom_lengths, begin, end).reshape(-1, 8)
+        coords = _parse_fixed(xyz).reshape(-1, 3)
+
+        return cls(
+            source=str(source),
+            lines=lines,
+            record=_decode(record),
+            atom_index=atom_index,
+            hetatm=is_hetatm[atom_index],
+            name=field('name'),
+            resname=field('resname'),
+            chain=field('chain'),
+            coords=coords
+        )
+
+    def line_mask(self, atom_mask):
+        """원자 마스크 (N,) → 라인 마스크 (L,) (원자가 아닌 라인은 유지)"""
+        keep = np.ones(len(self.lines), dtype=bool)
+        keep[self.atom_index] = atom_mask
+        return keep
+
+
+def _column(data, starts, lengths, begin, end):
+    """
+    라인마다 고정 폭 열 [begin, end)을 잘라 (라인 수, 폭) 바이트 배열로 변환
+
+    라인 길이를 넘는 열은 공백으로 채웁니다 (짧은 라인의 슬라이싱과 같은 결과).
+    """
+    offset = np.arange(begin, end)
+    if len(starts) == 0 or data.size == 0:
+        return np.full((len(starts), len(offset)), SPACE, dtype=np.uint8)
+    index = starts[:, None] + offset[None, :]
+    if lengths.min() >= end:
+        return data[index]
+    inside = offset[None, :] < lengths[:, None]
+    return np.where(inside, data[np.minimum(index, data.size - 1)], SPACE).astype(np.uint8)
+
+
+def _decode(grid):
+    """
+    고정 폭 바이트 열 (M, 폭) → 앞뒤 공백을 제거한 str 배열 (M,)
+
+    열을 8바이트 정수로 묶어 서로 다른 값만 찾은 뒤 그 값만 문자열로 변환합니다.
+    """
+    packed = np.zeros((len(grid), 8), dtype=np.uint8)
+    packed[:, :grid.shape[1]] = grid
+    unique, inverse = np.unique(packed.view(np.uint64).ravel(), return_inverse=True)
+    if len(unique) == 0:
+        return np.zeros(0, dtype=str)
+    names = np.array([value.tobytes().rstrip(b'\0').decode('latin-1').strip()
+                      for value in unique.view(np.uint8).reshape(-1, 8)], dtype=str)
+    return names[inverse.ravel()]
+
+
+def _parse_fixed(grid):
+    """
+    고정 폭 소수 열 (M, 폭) → float 배열 (M,)
+
+    '%8.3f' 형식은 정수 가수 / 10^소수 자릿수로 계산하므로 float(문자열)과 같은 값이 됩니다.
+    지수 표기 등 다른 형식이 섞여 있으면 문자열 변환으로 처리하고, 읽을 수 없는 값은 NaN입니다.
+    """
+    # 열 단위로 왼쪽부터 누적 (폭이 작으므로 열 반복 + 행 벡터 연산)
+    mantissa = np.zeros(len(grid), dtype=np.int64)
+    decimals = np.zeros(len(grid), dtype=np.int64)
+    after_dot = np.zeros(len(grid), dtype=bool)
+    negative = np.zeros(len(grid), dtype=bool)
+    digits = np.zeros(len(grid), dtype=np.int64)
+    invalid = np.zeros(len(grid), dtype=bool)
+    for column in np.ascontiguousarray(grid.T):
+        value = column.astype(np.int64) - ord('0')
+        is_digit = (value >= 0) & (value <= 9)
+        is_dot = column == ord('.')
+        is_minus = column == ord('-')
+        mantissa = np.where(is_digit, mantissa * 10 + value, mantissa)
+        decimals += is_digit & after_dot
+        digits += is_digit
+        # 점 두 개, 숫자 뒤의 부호, 그 밖의 문자는 일반 경로로 처리
+        invalid |= ~(is_digit | is_dot | is_minus | (column == SPACE)) | (is_dot & after_dot) \
+            | (is_minus & ((digits > 0) | after_dot | negative))
+        after_dot |= is_dot
+        negative |= is_minus
+
+    if not (invalid | (digits == 0) | (digits > 15)).any():
+        value = mantissa / 10.0 ** decimals
+        return np.where(negative, -value, value)
+
+    values = grid.view(f'S{grid.shape[1]}').ravel()
+    result = np.full(len(values), np.nan)
+    for i, value in enumerate(values.tolist()):
+        try:
+            result[i] = float(value)
+        except ValueError:
+            pass
+    return result
+
+
+def read_pdb(pdb_file):
+    """
+    PDB 파일을 한 번 읽어 AtomTable 생성
+
+    Parameters
+    ----------
+    pdb_file : str
+        PDB 파일 경로
+
+    Returns
+    -------
+    AtomTable
+        원본 라인 + 원자 배열 (record, name, resname, chain, coords)
+    """
+    with open(pdb_file, 'r') as f:
+        lines = f.readlines()
+    return AtomTable.from_lines(lines, source=pdb_file)
+
+
+def selection_mask(table, remove_set, remove_all_hetatm=False):
+    """
+    ignore/HETATM 선택 규칙을 라인 마스크로 계산
+
+    Parameters
+    ----------
+    table : AtomTable
+        PDB 원자 테이블
+    remove_set : set of str
+        제거할 잔기 이름 (residue name만 비교 - 원자 이름 CA 등과 충돌 방지)
+    remove_all_hetatm : bool
+        HETATM 원자와 HET/HETNAM/HETSYN/FORMUL 헤더 라인 전체 제거
+
+    Returns
+    -------
+    keep : np.ndarray
+        유지할 라인이면 True (L,)
+    hetatm_lines : int
+        HETATM 전체 제거 규칙으로 제거된 라인 수
+    removed_types : set of str
+        잔기 이름으로 제거된 잔기 종류
+    """
+    keep = np.ones(len(table.lines), dtype=bool)
+
+    hetatm_lines = 0
+    if remove_all_hetatm:
+        het = np.char.startswith(table.record, HET_RECORD_PREFIXES[0]) | \
+            np.char.startswith(table.record, HET_RECORD_PREFIXES[1])
+        hetatm_lines = int(het.sum())
+        keep &= ~het
+
+    removed = np.isin(table.resname, list(remove_set)) & keep[table.atom_index]
+    keep[table.atom_index[removed]] = False
+
+    return keep, hetatm_lines, set(table.resname[removed].tolist())
+
+
+def write_pdb(table, pdb_file, keep=None, trailer=''):
+    """
+    선택된 라인을 한 번의 버퍼 쓰기로 저장
+
+    Parameters
+    ----------
+    table : AtomTable
+        PDB 원자 테이블
+    pdb_file : str
+        출력 PDB 파일 경로
+    keep : np.ndarray, optional
+        라인 마스크 (None이면 모든 라인)
+    trailer : str
+        마지막에 덧붙일 내용 (예: "END\\n")
+    """
+    lines = table.lines if keep is None else compress(table.lines, keep)
+    with open(pdb_file, 'w') as f:
+        f.write(''.join(lines) + trailer)
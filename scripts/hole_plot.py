@@ -20,13 +20,22 @@ plot_hole_profile("hole_out.txt",
                   xlabel="Channel Coordinate (Å)",
                   ylabel="Pore Radius (Å)",
                   save_as="gramicidin.png")
+
+# 배치: Agg 캔버스 템플릿 그래프를 재사용하여 선 데이터만 바꿔 저장 (pyplot 상태 / 메모리 누적 없음)
+plot_profiles(["a_out.txt", "b_out.txt"], output_dir="plots")
 """
 
-import re
+import threading
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.layout_engine import TightLayoutEngine
 from pathlib import Path
 
+from hole_output import as_hole_output, output_name
+
 
 def extract_hole_data(output_file):
     """
@@ -34,8 +43,8 @@ def extract_hole_data(output_file):
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 텍스트 파일 경로
+    output_file : str or HoleOutput
+        HOLE 출력 텍스트 파일 경로 또는 이미 파싱된 결과 (hole_output.parse_hole_file)
 
     Returns
     -------
@@ -43,9 +52,10 @@ def extract_hole_data(output_file):
         데이터 딕셔너리:
         - 'channel_coord': 채널 좌표 (cvec과 내적)
         - 'radius': 기공 반경
-        - 'x', 'y', 'z': 3D 좌표
+        - 'cen_line_d', 'sum_s_area': 중심선 거리, sum{s/area}
         - 'type': 'sampled' 또는 'mid-point'
         - 'all_data': 전체 데이터 리스트
+        - 'hole_output': HoleOutput 파싱 결과
 
     Examples
     --------
@@ -54,60 +64,41 @@ def extract_hole_data(output_file):
     >>> print(f"Min radius: {min(data['radius']):.2f} Å")
     """
 
-    sampled_data = []
-    midpoint_data = []
+    parsed = as_hole_output(output_file)
 
-    with open(output_file, 'r') as f:
-        content = f.read()
-
-    # 데이터 섹션 시작 찾기
-    # "cenxyz.cvec" 이후부터 데이터 시작
-    if 'cenxyz.cvec' not in content:
+    # 데이터 섹션 헤더 ("cenxyz.cvec") 확인
+    if not parsed.has_header:
         print("Warning: 'cenxyz.cvec' 헤더를 찾을 수 없습니다.")
         print("전체 파일에서 (sampled)/(mid-point) 패턴을 검색합니다.")
 
-    # sampled와 mid-point 데이터 추출
-    # 형식: channel_coord   cen_x   cen_y   radius   (sampled/mid-point)
-    # 실제 HOLE 출력: cenxyz.cvec(채널좌표)  radius  cen_line_D  sum{s/area}
-    pattern = r'^\s*(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+\((sampled|mid-point)\)'
-
-    for match in re.finditer(pattern, content, re.MULTILINE):
-        channel_coord = float(match.group(1))
-        radius = float(match.group(2))
-        cen_line_d = float(match.group(3))
-        sum_s_area = float(match.group(4))
-        point_type = match.group(5)
+    if len(parsed) == 0:
+        raise ValueError(f"데이터를 찾을 수 없습니다: {parsed.output_file}")
 
-        data_point = {
-            'channel_coord': channel_coord,
+    # 전체 데이터 (채널 좌표로 정렬됨)
+    point_type = parsed.point_type
+    all_data = [
+        {
+            'channel_coord': coord,
             'radius': radius,
             'cen_line_d': cen_line_d,
             'sum_s_area': sum_s_area,
-            'type': point_type
+            'type': kind
         }
+        for coord, radius, cen_line_d, sum_s_area, kind in zip(
+            parsed.channel_coord.tolist(), parsed.radius.tolist(),
+            parsed.cen_line_d.tolist(), parsed.sum_s_area.tolist(), point_type)
+    ]
 
-        if point_type == 'sampled':
-            sampled_data.append(data_point)
-        else:  # mid-point
-            midpoint_data.append(data_point)
-
-    # 전체 데이터 (sampled + mid-point) 채널 좌표로 정렬
-    all_data = sampled_data + midpoint_data
-    all_data.sort(key=lambda x: x['channel_coord'])
-
-    if not all_data:
-        raise ValueError(f"데이터를 찾을 수 없습니다: {output_file}")
-
-    # 배열로 변환
     result = {
-        'channel_coord': np.array([d['channel_coord'] for d in all_data]),
-        'radius': np.array([d['radius'] for d in all_data]),
-        'cen_line_d': np.array([d['cen_line_d'] for d in all_data]),
-        'sum_s_area': np.array([d['sum_s_area'] for d in all_data]),
-        'type': [d['type'] for d in all_data],
+        'channel_coord': parsed.channel_coord,
+        'radius': parsed.radius,
+        'cen_line_d': parsed.cen_line_d,
+        'sum_s_area': parsed.sum_s_area,
+        'type': point_type,
         'all_data': all_data,
-        'sampled_only': sampled_data,
-        'midpoint_only': midpoint_data
+        'sampled_only': [d for d in all_data if d['type'] == 'sampled'],
+        'midpoint_only': [d for d in all_data if d['type'] == 'mid-point'],
+        'hole_output': parsed
     }
 
     return result
@@ -119,8 +110,8 @@ def save_tsv(output_file, tsv_file=None):
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 파일
+    output_file : str or HoleOutput
+        HOLE 출력 파일, 프로파일 파일(.npz 등) 또는 파싱된 결과
     tsv_file : str, optional
         TSV 파일 저장 경로 (기본: output_file에서 _out.txt를 .tsv로 변경)
 
@@ -130,22 +121,24 @@ def save_tsv(output_file, tsv_file=None):
         생성된 TSV 파일 경로
     """
 
-    data = extract_hole_data(output_file)
+    parsed = as_hole_output(output_file)
+    if len(parsed) == 0:
+        raise ValueError(f"데이터를 찾을 수 없습니다: {parsed.output_file}")
 
     if tsv_file is None:
-        tsv_file = str(output_file).replace('_out.txt', '.tsv').replace('.txt', '.tsv')
+        tsv_file = parsed.output_file.replace('_out.txt', '.tsv').replace('.txt', '.tsv')
+        if tsv_file == parsed.output_file:
+            tsv_file = str(Path(tsv_file).with_suffix('.tsv'))
+
+    # 배열에서 전체 행을 만들어 한 번에 기록
+    rows = zip(parsed.channel_coord.tolist(), parsed.radius.tolist(),
+               parsed.cen_line_d.tolist(), parsed.sum_s_area.tolist(), parsed.point_type)
+    lines = [f"{coord:.5f}\t{radius:.5f}\t{cen_line_d:.5f}\t{sum_s_area:.5f}\t{kind}\n"
+             for coord, radius, cen_line_d, sum_s_area, kind in rows]
 
     with open(tsv_file, 'w') as f:
-        # 헤더
         f.write("channel_coord\tradius\tcen_line_d\tsum_s_area\ttype\n")
-
-        # 데이터
-        for point in data['all_data']:
-            f.write(f"{point['channel_coord']:.5f}\t")
-            f.write(f"{point['radius']:.5f}\t")
-            f.write(f"{point['cen_line_d']:.5f}\t")
-            f.write(f"{point['sum_s_area']:.5f}\t")
-            f.write(f"{point['type']}\n")
+        f.writelines(lines)
 
     print(f"TSV 파일 생성: {tsv_file}")
     return tsv_file
@@ -160,14 +153,15 @@ def plot_hole_profile(output_file,
                       save_as=None,
                       show_grid=True,
                       show_points=False,
-                      highlight_minimum=True):
+                      highlight_minimum=True,
+                      close=False):
     """
     HOLE 기공 반경 프로파일 그래프 그리기
 
     Parameters
     ----------
-    output_file : str
-        HOLE 출력 파일 경로
+    output_file : str or HoleOutput
+        HOLE 출력 파일 경로 또는 파싱된 결과
     title : str, optional
         그래프 제목 (기본: "HOLE Pore Radius Profile")
     xlabel : str, optional
@@ -186,6 +180,9 @@ def plot_hole_profile(output_file,
         데이터 포인트 표시 여부 (기본: True)
     highlight_minimum : bool, optional
         최소 반경 위치 강조 표시 (기본: True)
+    close : bool, optional
+        저장 후 pyplot에서 그래프 닫기 (반복 호출 시 메모리 누적 방지, 기본: False -
+        많은 프로파일은 ProfilePlotter / plot_profiles 사용)
 
     Returns
     -------
@@ -231,7 +228,7 @@ def plot_hole_profile(output_file,
 
     # 제목
     if title is None:
-        title = f"HOLE Pore Radius Profile\n{Path(output_file).stem}"
+        title = f"HOLE Pore Radius Profile\n{output_name(output_file)}"
     ax.set_title(title, fontsize=14, fontweight='bold')
 
     # 그리드
@@ -249,23 +246,202 @@ def plot_hole_profile(output_file,
         plt.savefig(save_as, dpi=dpi, bbox_inches='tight')
         print(f"그래프 저장: {save_as}")
 
+    if close:
+        plt.close(fig)
+
     return fig
 
 
+class ProfilePlotter:
+    """
+    배치용 프로파일 그래프 템플릿
+
+    pyplot을 거치지 않고 Agg 캔버스에 Figure / Axes / 선을 한 번 만든 뒤 프로파일마다
+    선 데이터, 최소 반경 표시, 제목만 바꿔 저장합니다. 레이아웃(tight_layout)은 눈금 글자 폭 / 제목 줄 수가
+    바뀔 때만 다시 계산하고 bbox_inches='tight'를 쓰지 않으므로 대부분의 그래프는 저장할 때 한 번만 그리고,
+    pyplot 그래프 목록에 등록되지 않아 수천 개를 그려도 메모리가 늘지 않습니다.
+    (인스턴스마다 독립이므로 스레드별로 하나씩 쓰면 동시에 그려도 안전 - profile_plotter)
+
+    Parameters
+    ----------
+    figsize, dpi, xlabel, ylabel, show_grid, show_points, highlight_minimum
+        plot_hole_profile과 같음
+
+    Examples
+    --------
+    >>> with ProfilePlotter() as plotter:
+    ...     for output_file in output_files:
+    ...         plotter.plot(output_file, save_as=output_file.replace("_out.txt", "_profile.png"))
+    """
+
+    def __init__(self, figsize=(10, 6), dpi=150, xlabel="Channel Coordinate (Å)",
+                 ylabel="Pore Radius (Å)", show_grid=True, show_points=False, highlight_minimum=True):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.add_subplot()
+
+        self.line, = ax.plot([], [], 'b-', linewidth=2.5, label='Pore radius', alpha=0.8)
+        self.points = None
+        if show_points:
+            self.points, = ax.plot([], [], 'o', color='blue', markersize=2, alpha=0.3)
+        self.minimum = self.min_line = None
+        if highlight_minimum:
+            self.minimum, = ax.plot([], [], 'r*', markersize=15, label='Minimum')
+            self.min_line = ax.axhline(y=0, color='r', linestyle='--', alpha=0.3, linewidth=1)
+
+        ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+        self.title = ax.set_title('', fontsize=14, fontweight='bold')
+        if show_grid:
+            ax.grid(True, alpha=0.3, linestyle='--')
+        self.legend = ax.legend(loc='best', fontsize=10)
+        self._layout_key = None
+
+    def plot(self, output_file, save_as, title=None):
+        """
+        프로파일 하나를 템플릿에 그려 저장
+
+        Parameters
+        ----------
+        output_file : str or HoleOutput
+            HOLE 출력 파일 / 프로파일 파일 경로 또는 파싱된 결과
+        save_as : str
+            저장할 파일 이름
+        title : str, optional
+            그래프 제목 (기본: "HOLE Pore Radius Profile\n{파일 이름}")
+
+        Returns
+        -------
+        str
+            저장한 파일 경로
+        """
+        parsed = as_hole_output(output_file)
+        if len(parsed) == 0:
+            raise ValueError(f"데이터를 찾을 수 없습니다: {parsed.output_file}")
+        coord, radius = parsed.channel_coord, parsed.radius
+
+        self.line.set_data(coord, radius)
+        if self.points is not None:
+            self.points.set_data(coord, radius)
+        if self.minimum is not None:
+            min_idx = int(np.argmin(radius))
+            self.minimum.set_data([coord[min_idx]], [radius[min_idx]])
+            self.min_line.set_ydata([radius[min_idx], radius[min_idx]])
+            self.legend.get_texts()[1].set_text(f'Minimum: {radius[min_idx]:.2f} Å')
+
+        if title is None:
+            title = f"HOLE Pore Radius Profile\n{output_name(output_file)}"
+        self.title.set_text(title)
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        layout_key = self._tick_layout_key()
+        if layout_key != self._layout_key:
+            # fig.tight_layout()은 레이아웃 엔진을 등록하여 저장할 때마다 그리기를 한 번 더 하므로
+            # 여백(subplots_adjust)을 직접 계산하고, 눈금 글자 폭이 같은 동안 재사용
+            TightLayoutEngine().execute(self.fig)
+            self._layout_key = layout_key
+
+        self.fig.savefig(save_as, dpi=self.fig.dpi)
+        return str(save_as)
+
+    def _tick_layout_key(self):
+        """여백을 바꾸는 값: 축별 가장 긴 눈금 글자 수 + 오프셋 표기, 제목 줄 수 (그리기 없이 계산)"""
+        key = [self.title.get_text().count('\n')]
+        for axis in (self.ax.xaxis, self.ax.yaxis):
+            formatter = axis.get_major_formatter()
+            labels = formatter.format_ticks(axis.get_major_locator()())
+            key += [max((len(label) for label in labels), default=0), formatter.get_offset()]
+        return tuple(key)
+
+    def close(self):
+        """그래프 자원 해제"""
+        self.fig.clear()
+        self.fig = self.ax = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# 스레드별 템플릿 (비동기 파이프라인의 plot 단계는 executor 스레드에서 실행)
+_PLOTTERS = threading.local()
+
+
+def profile_plotter(**options):
+    """
+    현재 스레드의 ProfilePlotter (같은 옵션이면 재사용)
+
+    Parameters
+    ----------
+    **options
+        ProfilePlotter 옵션
+    """
+    if not hasattr(_PLOTTERS, 'cache'):
+        _PLOTTERS.cache = {}
+    key = tuple(sorted(options.items()))
+    if key not in _PLOTTERS.cache:
+        _PLOTTERS.cache[key] = ProfilePlotter(**options)
+    return _PLOTTERS.cache[key]
+
+
+def plot_profiles(output_files, output_dir=None, suffix="_profile.png", **options):
+    """
+    여러 프로파일 그래프를 템플릿 하나로 저장 (배치용)
+
+    Parameters
+    ----------
+    output_files : list of str or HoleOutput
+        HOLE 출력 파일 / 프로파일 파일 또는 파싱된 결과
+    output_dir : str, optional
+        저장 디렉토리 (기본: 각 입력 파일과 같은 디렉토리)
+    suffix : str
+        그래프 파일 이름 접미사 ({이름}{suffix}, 이름은 _out / _profile 제외)
+    **options
+        ProfilePlotter 옵션
+
+    Returns
+    -------
+    list of str
+        저장한 그래프 파일 (읽지 못한 항목은 None)
+    """
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    plot_files = []
+    with ProfilePlotter(**options) as plotter:
+        for output_file in output_files:
+            name = output_name(output_file)
+            for trailing in ('_out', '_profile'):
+                if name.endswith(trailing):
+                    name = name[:-len(trailing)]
+            source = output_file.output_file if hasattr(output_file, 'output_file') else output_file
+            directory = Path(output_dir) if output_dir else Path(source).parent
+            try:
+                plot_files.append(plotter.plot(output_file, directory / f"{name}{suffix}"))
+            except (OSError, ValueError) as e:
+                print(f"  Warning: 그래프 생성 실패: {output_name(output_file)} ({e})")
+                plot_files.append(None)
+    return plot_files
+
+
 def plot_multiple_profiles(output_files, labels=None,
                           title="HOLE Pore Radius Comparison",
                           xlabel="Channel Coordinate (Å)",
                           ylabel="Pore Radius (Å)",
                           figsize=(12, 7),
                           dpi=150,
-                          save_as=None):
+                          save_as=None,
+                          align=None):
     """
     여러 HOLE 결과를 한 그래프에 비교
 
     Parameters
     ----------
-    output_files : list of str
-        HOLE 출력 파일 경로 리스트
+    output_files : list of str or HoleOutput
+        HOLE 출력 파일 경로 (또는 파싱된 결과) 리스트
     labels : list of str, optional
         각 파일의 레이블 (기본: 파일명)
     title : str, optional
@@ -278,6 +454,9 @@ def plot_multiple_profiles(output_files, labels=None,
         해상도
     save_as : str, optional
         저장할 파일 이름
+    align : str, optional
+        채널 좌표 정렬 방법 ('xcorr' 또는 'constriction', hole_align.align_profiles) -
+        구조마다 다른 좌표 원점 / 축 방향을 맞춰서 겹쳐 그림 (기본: HOLE 좌표 그대로)
 
     Returns
     -------
@@ -285,21 +464,31 @@ def plot_multiple_profiles(output_files, labels=None,
         생성된 그래프 객체
     """
 
+    parsed = [as_hole_output(f) for f in output_files]
+    shifts, signs = np.zeros(len(parsed)), np.ones(len(parsed))
+    if align:
+        from hole_align import align_profiles
+
+        alignment = align_profiles(parsed, method=align)
+        shifts, signs = alignment['shifts'], alignment['signs']
+        xlabel = f"{xlabel} [aligned: {align}]"
+
     fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
 
     colors = plt.cm.tab10(np.linspace(0, 1, len(output_files)))
 
     if labels is None:
-        labels = [Path(f).stem for f in output_files]
+        labels = [output_name(f) for f in output_files]
 
-    for i, (output_file, label) in enumerate(zip(output_files, labels)):
+    for i, (output_file, label) in enumerate(zip(parsed, labels)):
         data = extract_hole_data(output_file)
-        ax.plot(data['channel_coord'], data['radius'],
+        channel_coord = signs[i] * np.asarray(data['channel_coord']) + shifts[i]
+        ax.plot(channel_coord, data['radius'],
                color=colors[i], linewidth=2, label=label)
 
         # 최소값 표시
         min_idx = np.argmin(data['radius'])
-        min_coord = data['channel_coord'][min_idx]
+        min_coord = channel_coord[min_idx]
         min_radius = data['radius'][min_idx]
         ax.plot(min_coord, min_radius, '*',
                color=colors[i], markersize=12)
@@ -328,6 +517,12 @@ if __name__ == "__main__":
     print("HOLE 결과 시각화 스크립트")
     print("=" * 60)
 
+    # 파일이 여러 개면 배치 모드 (템플릿 그래프 재사용, 각 파일 옆에 {이름}_profile.png)
+    if len(sys.argv) > 2:
+        plot_files = plot_profiles(sys.argv[1:])
+        print(f"✓ 그래프 {sum(f is not None for f in plot_files)}/{len(plot_files)}개 저장")
+        sys.exit(0 if all(plot_files) else 1)
+
     # 테스트 파일 확인
     if len(sys.argv) > 1:
         output_file = sys.argv[1]
@@ -342,6 +537,7 @@ if __name__ == "__main__":
         print(f"파일을 찾을 수 없습니다: {output_file}")
         print("\n사용법:")
         print("  python hole_plot.py <hole_output_file>")
+        print("  python hole_plot.py <file1> <file2> ...   (배치: 각 파일 옆에 _profile.png)")
         print("\n또는 Python에서 직접:")
         print("  from hole_plot import plot_hole_profile")
         print("  plot_hole_profile('hole_out.txt', save_as='profile.png')")
@@ -361,14 +557,14 @@ if __name__ == "__main__":
 
     # 2. TSV 파일 저장
     print("\n2. TSV 파일 생성 중...")
-    tsv_file = save_tsv(output_file)
+    tsv_file = save_tsv(data['hole_output'])
 
     # 3. 그래프 생성
     print("\n3. 그래프 생성 중...")
     output_png = str(output_file).replace('_out.txt', '_profile.png').replace('.txt', '_profile.png')
 
     fig = plot_hole_profile(
-        output_file,
+        data['hole_output'],
         title=f"HOLE Pore Radius Profile\n{Path(output_file).stem}",
         save_as=output_png,
         highlight_minimum=True
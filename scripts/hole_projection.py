@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+HOLE 투영 렌더러 (PyMOL 없이 NumPy / Matplotlib)
+=============================================
+hole_pymol.py가 생성한 PyMOL 스크립트(.pml)가 로드하는 단백질 PDB와 기공 표면 PDB를 읽어
+단백질 CA trace와 색상별 기공 표면 점을 채널 축이 세로가 되도록 투영하여 PyMOL과 같은 레이어 PNG로 저장
+
+- 기공 표면 점은 구(sphere) splat으로 그리고 NumPy z-buffer로 가장 가까운 조각만 남김 (Lambert 음영 + 깊이 안개)
+- 같은 중심 픽셀의 점 중 가장 가까운 점만 남기면 splat 오프셋마다 픽셀이 겹치지 않으므로
+  오프셋 수만큼의 벡터 연산으로 z-buffer를 채움 (점 × 오프셋 반복 없음)
+- 레이어: surface_pore (흰 배경 + 기공), cartoon (투명 배경 + CA trace) - hole_render.RENDER_LAYERS와 같은 이름
+
+PyMOL이 없거나 시간 초과인 노드에서 썸네일을 빠르게 만들기 위한 대체 경로입니다 (hole_render.render_layers 'projection').
+
+사용 예시:
+---------
+from hole_projection import render_projection, projection_layers
+
+render_projection("analysis_pymol.pml", {'surface_pore': 'surface.png', 'cartoon': 'cartoon.png'})
+layers = projection_layers("analysis_pymol.pml")   # 파일 없이 {레이어 이름: RGBA 배열}
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+
+from hole_pdb import read_pdb
+from hole_pymol import PORE_RESNAMES, read_pore_points
+
+
+# PyMOL 스크립트와 같은 색상 (RGB 0-1)
+PORE_RGB = {'red': (1.0, 0.0, 0.0), 'green': (0.0, 1.0, 0.0), 'blue': (0.0, 0.0, 1.0),
+            'yellow': (1.0, 1.0, 0.0)}
+PORE_RGB_DEFAULT = (0.0, 1.0, 1.0)      # cyan (색상 정보 없음)
+TRACE_RGB = (1.0, 0.5, 0.0)             # orange
+BACKGROUND_RGB = (1.0, 1.0, 1.0)
+
+# 크기 (Å) / 픽셀 splat 반경 상한
+PORE_DOT_RADIUS = 0.5
+TRACE_RADIUS = 0.35
+MAX_SPLAT_RADIUS = 12
+FRAME_MARGIN = 5.0
+
+# CA trace: 이어진 잔기로 볼 최대 CA-CA 거리 (Å), 선분 샘플 간격 (픽셀)
+TRACE_MAX_BOND = 4.3
+TRACE_STEP = 0.5
+
+# 음영 / 깊이 안개 / cartoon 불투명도 (PyMOL cartoon transparency 0.4)
+AMBIENT = 0.35
+FOG = 0.5
+TRACE_ALPHA = 0.6
+
+# load {경로}, {객체} - 경로에 공백이 있을 수 있으므로 마지막 쉼표까지를 경로로 사용
+_LOAD_PATTERN = re.compile(r'^load\s+(.+?)\s*,\s*(\w+)\s*$', re.MULTILINE)
+
+
+def pml_inputs(pml_script):
+    """
+    PyMOL 스크립트의 load 명령에서 입력 파일 찾기
+
+    Returns
+    -------
+    dict
+        {'protein': 단백질 PDB, 'pore': 기공 표면 PDB} (없는 항목은 생략)
+    """
+    objects = {name: path for path, name in _LOAD_PATTERN.findall(Path(pml_script).read_text())}
+    inputs = {}
+    if 'protein_cartoon' in objects:
+        inputs['protein'] = objects['protein_cartoon']
+    if 'pore' in objects:
+        inputs['pore'] = objects['pore']
+    return inputs
+
+
+def load_scene(protein_pdb=None, pore_pdb=None):
+    """
+    투영할 좌표 읽기 (기공 표면 사이드카 {base}.npz가 있으면 PDB 대신 사용)
+
+    Returns
+    -------
+    dict
+        - 'ca': CA 좌표 (M, 3)
+        - 'ca_chain': CA 체인 ID (M,)
+        - 'pore': 기공 표면 점 좌표 (N, 3)
+        - 'pore_rgb': 점 색상 (N, 3)
+    """
+    scene = {'ca': np.zeros((0, 3)), 'ca_chain': np.zeros(0, dtype=str),
+             'pore': np.zeros((0, 3)), 'pore_rgb': np.zeros((0, 3))}
+
+    if protein_pdb and Path(protein_pdb).exists():
+        table = read_pdb(protein_pdb)
+        ca = (table.name == 'CA') & ~table.hetatm & np.isfinite(table.coords).all(axis=1)
+        scene['ca'], scene['ca_chain'] = table.coords[ca], table.chain[ca]
+
+    if pore_pdb:
+        points_file = Path(pore_pdb).with_suffix('.npz')
+        if points_file.exists():
+            coords, names = read_pore_points(points_file)
+        elif Path(pore_pdb).exists():
+            table = read_pdb(pore_pdb)
+            resname_colour = {resname: name for name, resname in PORE_RESNAMES.items()}
+            coords = table.coords
+            names = np.array([resname_colour.get(resname, '') for resname in table.resname], dtype=str)
+        else:
+            coords, names = np.zeros((0, 3)), np.zeros(0, dtype=str)
+
+        palette = np.array(list(PORE_RGB.values()) + [PORE_RGB_DEFAULT])
+        index = np.full(len(names), len(PORE_RGB))
+        for i, name in enumerate(PORE_RGB):
+            index[names == name] = i
+        scene['pore'] = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        scene['pore_rgb'] = palette[index]
+
+    return scene
+
+
+def view_basis(points, axis=None):
+    """
+    투영 기준 축 (가로, 세로 = 채널 축, 깊이)
+
+    Parameters
+    ----------
+    points : np.ndarray
+        채널 축을 추정할 점 (기공 표면 점) - axis가 없으면 첫 번째 주성분
+    axis : array-like, optional
+        채널 축 방향 (예: HOLE cvect)
+
+    Returns
+    -------
+    np.ndarray
+        (3, 3) 행 = 가로 / 세로 / 깊이 단위 벡터 (오른손 좌표계)
+    """
+    if axis is None:
+        if len(points) >= 3:
+            centred = points - points.mean(axis=0)
+            axis = np.linalg.svd(centred, full_matrices=False)[2][0]
+        else:
+            axis = (0.0, 0.0, 1.0)
+    vertical = np.asarray(axis, dtype=np.float64)
+    vertical /= np.linalg.norm(vertical)
+    # PyMOL 카메라와 같이 +Z가 아래로 향하도록 부호 고정 (Z축과 수직이면 +Y)
+    if vertical[2] < 0 or (vertical[2] == 0 and vertical[1] < 0):
+        vertical = -vertical
+
+    reference = np.array([1.0, 0.0, 0.0]) if abs(vertical[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    horizontal = reference - reference.dot(vertical) * vertical
+    horizontal /= np.linalg.norm(horizontal)
+    depth = np.cross(horizontal, vertical)
+    return np.array([horizontal, vertical, depth])
+
+
+def _trace_samples(ca, chain, scale):
+    """연속 CA 선분을 TRACE_STEP 픽셀 간격 점으로 샘플링 (체인이 바뀌거나 끊긴 곳 제외)"""
+    if len(ca) < 2:
+        return np.zeros((0, 3))
+    start, end = ca[:-1], ca[1:]
+    length = np.linalg.norm(end - start, axis=1)
+    bonded = (chain[:-1] == chain[1:]) & (length < TRACE_MAX_BOND)
+    start, end, length = start[bonded], end[bonded], length[bonded]
+
+    count = np.maximum(np.ceil(length * scale / TRACE_STEP).astype(int), 1) + 1
+    segment = np.repeat(np.arange(len(start)), count)
+    first = np.cumsum(count) - count
+    fraction = (np.arange(count.sum()) - first[segment]) / (count[segment] - 1)
+    return start[segment] + fraction[:, None] * (end[segment] - start[segment])
+
+
+def rasterize_spheres(pixels, depth, radius_px, radius, width, height):
+    """
+    구 splat z-buffer
+
+    Parameters
+    ----------
+    pixels : np.ndarray
+        투영된 중심 픽셀 좌표 (N, 2) float - (열, 행)
+    depth : np.ndarray
+        중심 깊이 (N,) Å - 클수록 멀리
+    radius_px : float
+        splat 반경 (픽셀)
+    radius : float
+        구 반경 (Å) - 조각 깊이 = 중심 깊이 - 구 표면 높이
+    width, height : int
+        이미지 크기
+
+    Returns
+    -------
+    tuple
+        (점 번호 (H, W) int - 비어 있으면 -1, 표면 법선 z (H, W), 조각 깊이 (H, W))
+    """
+    source = np.full(height * width, -1, dtype=np.int64)
+    normal = np.zeros(height * width)
+    zbuffer = np.full(height * width, np.inf)
+    if len(pixels) == 0:
+        return source.reshape(height, width), normal.reshape(height, width), zbuffer.reshape(height, width)
+
+    col = np.rint(pixels[:, 0]).astype(np.int64)
+    row = np.rint(pixels[:, 1]).astype(np.int64)
+
+    # 같은 중심 픽셀의 점 중 가장 가까운 점만 (먼 점의 splat은 항상 가려짐)
+    centre = row * width + col
+    order = np.lexsort((depth, centre))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = centre[order][1:] != centre[order][:-1]
+    index = order[first]
+    col, row, depth = col[index], row[index], depth[index]
+
+    r = int(np.ceil(radius_px))
+    offsets = [(dx, dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)
+               if dx * dx + dy * dy <= radius_px * radius_px]
+    for dx, dy in offsets:
+        nz = np.sqrt(max(0.0, 1.0 - (dx * dx + dy * dy) / (radius_px * radius_px)))
+        x, y = col + dx, row + dy
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        pixel = y[inside] * width + x[inside]
+        fragment = depth[inside] - nz * radius
+        nearer = fragment < zbuffer[pixel]
+        pixel = pixel[nearer]
+        zbuffer[pixel] = fragment[nearer]
+        source[pixel] = index[inside][nearer]
+        normal[pixel] = nz
+
+    return source.reshape(height, width), normal.reshape(height, width), zbuffer.reshape(height, width)
+
+
+def project_layers(scene, width=800, height=800, axis=None):
+    """
+    장면을 투영하여 레이어별 RGBA 이미지 생성
+
+    Parameters
+    ----------
+    scene : dict
+        load_scene 결과
+    width, height : int
+        이미지 크기 (픽셀)
+    axis : array-like, optional
+        채널 축 (없으면 기공 표면 점의 주축)
+
+    Returns
+    -------
+    dict
+        {'surface_pore': (H, W, 4) uint8 (불투명), 'cartoon': (H, W, 4) uint8 (투명 배경)}
+    """
+    pore, ca = scene['pore'], scene['ca']
+    basis = view_basis(pore if len(pore) >= 3 else ca, axis)
+    pore_view, ca_view = pore @ basis.T, ca @ basis.T
+
+    # zoom all: 전체 점을 여백 FRAME_MARGIN Å과 함께 화면 가운데 배치
+    every = np.vstack([pore_view, ca_view])
+    if len(every) == 0:
+        every = np.zeros((1, 3))
+    low, high = every.min(axis=0), every.max(axis=0)
+    span = np.maximum(high[:2] - low[:2], 1.0) + 2 * FRAME_MARGIN
+    scale = min(width / span[0], height / span[1])   # 픽셀 / Å
+    centre = (low + high) / 2
+    depth_range = (low[2], max(high[2] - low[2], 1e-6))
+
+    def to_pixels(view):
+        return np.column_stack([(view[:, 0] - centre[0]) * scale + width / 2,
+                                (view[:, 1] - centre[1]) * scale + height / 2])
+
+    def shade(rgb, normal, zbuffer, covered):
+        fog = FOG * np.clip((zbuffer[covered] - depth_range[0]) / depth_range[1], 0, 1)
+        lit = rgb * (AMBIENT + (1 - AMBIENT) * normal[covered])[:, None]
+        return lit * (1 - fog)[:, None] + np.array(BACKGROUND_RGB) * fog[:, None]
+
+    layers = {}
+
+    # surface_pore: 흰 배경 + 기공 표면 점
+    image = np.empty((height, width, 4))
+    image[..., :3] = BACKGROUND_RGB
+    image[..., 3] = 1.0
+    radius_px = min(max(PORE_DOT_RADIUS * scale, 1.0), MAX_SPLAT_RADIUS)
+    source, normal, zbuffer = rasterize_spheres(to_pixels(pore_view), pore_view[:, 2],
+                                                radius_px, PORE_DOT_RADIUS, width, height)
+    covered = source >= 0
+    image[covered, :3] = shade(scene['pore_rgb'][source[covered]], normal, zbuffer, covered)
+    layers['surface_pore'] = (image * 255 + 0.5).astype(np.uint8)
+
+    # cartoon: 투명 배경 + CA trace
+    image = np.zeros((height, width, 4))
+    trace = _trace_samples(ca_view, scene['ca_chain'], scale)
+    radius_px = min(max(TRACE_RADIUS * scale, 1.0), MAX_SPLAT_RADIUS)
+    source, normal, zbuffer = rasterize_spheres(to_pixels(trace), trace[:, 2],
+                                                radius_px, TRACE_RADIUS, width, height)
+    covered = source >= 0
+    image[covered, :3] = shade(np.array(TRACE_RGB), normal, zbuffer, covered)
+    image[covered, 3] = TRACE_ALPHA
+    layers['cartoon'] = (image * 255 + 0.5).astype(np.uint8)
+
+    return layers
+
+
+def projection_layers(pml_script, width=800, height=800, axis=None):
+    """
+    PyMOL 스크립트의 입력을 투영하여 레이어 RGBA 배열 생성 (파일 쓰기 없음)
+
+    Returns
+    -------
+    dict
+        {레이어 이름: (H, W, 4) uint8} (project_layers 참고)
+
+    Raises
+    ------
+    FileNotFoundError
+        스크립트가 로드하는 기공 표면 PDB가 없는 경우
+    """
+    inputs = pml_inputs(pml_script)
+    if not inputs.get('pore') or not Path(inputs['pore']).exists():
+        raise FileNotFoundError(f"기공 표면 PDB를 찾을 수 없습니다: {inputs.get('pore')}")
+    return project_layers(load_scene(inputs.get('protein'), inputs['pore']),
+                          width=width, height=height, axis=axis)
+
+
+def render_projection(pml_script, outputs, width=800, height=800, dpi=200, axis=None):
+    """
+    PyMOL 스크립트의 입력을 투영하여 레이어 PNG 저장 (hole_render.render_layers 'projection' 엔진)
+
+    Parameters
+    ----------
+    pml_script : str
+        hole_pymol.py가 생성한 PyMOL 스크립트 (load 명령에서 입력 파일을 찾음)
+    outputs : dict
+        {레이어 이름: 출력 PNG 경로} - 'surface_pore', 'cartoon'
+    width, height : int
+        이미지 크기 (픽셀)
+    dpi : int
+        PNG DPI
+    axis : array-like, optional
+        채널 축 (없으면 기공 표면 점의 주축)
+
+    Returns
+    -------
+    dict
+        {레이어 이름: 출력 PNG 경로}
+
+    Raises
+    ------
+    FileNotFoundError
+        스크립트가 로드하는 기공 표면 PDB가 없는 경우
+    """
+    import matplotlib.image as mpimg
+
+    layers = projection_layers(pml_script, width=width, height=height, axis=axis)
+    rendered = {}
+    for name, path in outputs.items():
+        mpimg.imsave(str(path), layers[name], dpi=dpi)
+        rendered[name] = str(path)
+    return rendered
@@ -2,14 +2,21 @@
 """
 HOLE to PyMOL Visualization (공식 HOLE sph_process 사용)
 
-HOLE의 공식 도구인 sph_process와 qpt_conv를 사용하여
-표면 점을 생성하고 PyMOL 형식으로 변환합니다.
+HOLE의 공식 도구인 sph_process를 사용하여 표면 점을 생성하고
+.qpt 바이너리를 직접 읽어(hole_qpt.py) PyMOL 형식으로 변환합니다.
+표면 점 PDB는 NumPy 바이트 행렬로 한 번에 작성하며 (10만 점 이상은 hybrid-36 번호),
+선택적으로 np.load로 바로 읽는 바이너리 사이드카(.npz)를 함께 저장합니다.
 """
 
-import subprocess
 import re
 from pathlib import Path
-import pexpect
+
+import numpy as np
+
+from hole_metrics import measure, run_process
+from hole_qpt import read_qpt, QptPlot
+from hole_lod import lod_settings, decimate_surface
+from hole_surface import surface_from_sph
 
 
 # HOLE 실행 파일 경로
@@ -17,6 +24,9 @@ HOLE_EXE_DIR = Path(__file__).parent.parent / "exe"
 SPH_PROCESS = HOLE_EXE_DIR / "sph_process"
 QPT_CONV = HOLE_EXE_DIR / "qpt_conv"
 
+# 표면 점 생성 엔진: HOLE sph_process 또는 NumPy 구현 (hole_surface.py)
+SURFACE_ENGINES = ('sph_process', 'numpy')
+
 
 def run_sph_process(sph_file, qpt_file, dotden=15):
     """
@@ -38,7 +48,7 @@ def run_sph_process(sph_file, qpt_file, dotden=15):
     """
     cmd = [str(SPH_PROCESS), "-dotden", str(dotden), "-color", str(sph_file), str(qpt_file)]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = run_process(cmd, capture_output=True, text=True)
 
     if result.returncode != 0:
         print(f"Error: sph_process 실행 실패")
@@ -53,6 +63,9 @@ def convert_qpt_to_vmd(qpt_file, vmd_file):
     """
     qpt_conv로 VMD 형식 변환 (pexpect 사용)
 
+    파이프라인은 read_qpt로 .qpt를 직접 읽으므로 이 함수는 VMD에서
+    표면을 보고 싶을 때만 사용합니다.
+
     Parameters
     ----------
     qpt_file : str
@@ -72,6 +85,8 @@ def convert_qpt_to_vmd(qpt_file, vmd_file):
     default_output = work_dir / f"{qpt_path.stem}.vmd_plot"
 
     try:
+        import pexpect
+
         # pexpect로 대화형 프로그램 실행
         child = pexpect.spawn(str(QPT_CONV), cwd=str(work_dir), timeout=60, encoding='utf-8')
 
@@ -214,6 +229,27 @@ def create_uniform_cylinder_points(channel_points, num_points_per_slice=20):
     return cylinder_points
 
 
+def read_qpt_points(qpt_file):
+    """
+    .qpt 바이너리 파일에서 표면 점 좌표와 색상 추출 (qpt_conv 불필요)
+
+    Returns
+    -------
+    list of dict
+        각 점: {'coords': (x, y, z), 'color': 'red'/'green'/'blue'/...}
+    """
+    return qpt_to_points(read_qpt(qpt_file))
+
+
+def qpt_to_points(qpt):
+    """QptPlot(.qpt 또는 hole_surface 결과)의 표면 점을 점 딕셔너리 리스트로 변환"""
+    colors = QptPlot.colour_names(qpt.dot_colour)
+    return [
+        {'coords': tuple(coords), 'color': color}
+        for coords, color in zip(qpt.dots.tolist(), colors.tolist())
+    ]
+
+
 def parse_vmd_plot(vmd_file):
     """
     VMD plot 파일에서 좌표와 색상 추출
@@ -254,80 +290,260 @@ def parse_vmd_plot(vmd_file):
     return points
 
 
-def create_pdb_from_points(points, output_pdb):
+# 표면 점 색상 → PDB residue 이름 (PyMOL 스크립트가 resn으로 색상 지정)
+PORE_RESNAMES = {'red': 'POR', 'green': 'POG', 'blue': 'POB', 'yellow': 'CEN'}
+PORE_RESNAME_DEFAULT = 'UNK'
+
+# 기공 표면 PDB 헤더
+PORE_PDB_HEADER = (
+    "REMARK   Generated by hole_pymol.py\n"
+    "REMARK   Using HOLE sph_process (official tool)\n"
+    "REMARK   All atoms are independent (no CONECT records)\n"
+    "REMARK   Color scheme (HOLE standard):\n"
+    "REMARK     RED    - radius < 1.15 A (too narrow)\n"
+    "REMARK     GREEN  - radius 1.15-2.30 A (single water)\n"
+    "REMARK     BLUE   - radius > 2.30 A (multiple waters)\n"
+    "REMARK     YELLOW - channel center line\n"
+)
+
+# ATOM 레코드 틀 (80열 + 줄바꿈) - 일련번호 6-10, resname 17-19, resseq 22-25, x/y/z 30-53
+PORE_ATOM_TEMPLATE = b"ATOM  00000 10PS UNK P0000    " + b" " * 24 + b"  0.00  0.00      PSDOPS  \n"
+
+# hybrid-36 숫자 (일련번호 99,999 / residue 번호 9,999 초과 시)
+_HY36_UPPER = np.frombuffer(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+_HY36_LOWER = np.frombuffer(b"0123456789abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+
+
+def hybrid36_columns(values, width):
+    """
+    정수 배열 → 고정 폭 PDB 숫자 열 (N, width) 바이트
+
+    10**width 미만은 오른쪽 정렬 10진수, 이상은 hybrid-36 (대문자 → 소문자 36진수,
+    예: width=5에서 100000 → 'A0000', width=4에서 10000 → 'A000')
+
+    Raises
+    ------
+    ValueError
+        음수 또는 hybrid-36 범위 초과
+    """
+    values = np.asarray(values, dtype=np.int64)
+    decimal = 10 ** width
+    block = 26 * 36 ** (width - 1)
+    if values.size and (values.min() < 0 or values.max() >= decimal + 2 * block):
+        raise ValueError(f"hybrid-36 범위를 벗어난 번호 (폭 {width})")
+
+    columns = np.full((len(values), width), ord(' '), dtype=np.uint8)
+    for k in range(width):
+        show = values >= 10 ** k if k else np.ones(len(values), dtype=bool)
+        columns[show, width - 1 - k] = ord('0') + (values[show] // 10 ** k) % 10
+
+    # 10진수 폭을 넘는 번호: 대문자 블록 다음 소문자 블록 ('A000...'은 36진수 10·36^(w-1))
+    offset = 10 * 36 ** (width - 1)
+    blocks = [((values >= decimal) & (values < decimal + block), _HY36_UPPER, decimal),
+              (values >= decimal + block, _HY36_LOWER, decimal + block)]
+    for mask, alphabet, base in blocks:
+        if mask.any():
+            rest = values[mask] - base + offset
+            encoded = np.empty((len(rest), width), dtype=np.uint8)
+            for k in range(width):
+                encoded[:, width - 1 - k] = alphabet[rest % 36]
+                rest //= 36
+            columns[mask] = encoded
+    return columns
+
+
+def fixed_float_columns(values, width=8, decimals=3):
+    """
+    실수 배열 → '%{width}.{decimals}f'와 같은 고정 폭 열 (N, width) 바이트
+
+    Raises
+    ------
+    ValueError
+        정수부가 폭을 넘는 값 (PDB 좌표 범위 -999.999 ~ 9999.999)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values) * 10 ** decimals
+    scaled = np.rint(magnitude).astype(np.int64)
+    # 반올림 경계(x.5) 근처는 이진 표현에 따라 달라지므로 Python 형식화 결과 사용 (드묾)
+    for i in np.flatnonzero(np.abs(magnitude - np.floor(magnitude) - 0.5) < 1e-6):
+        scaled[i] = int(f"{abs(values[i]):.{decimals}f}".replace('.', ''))
+    integer, fraction = np.divmod(scaled, 10 ** decimals)
+    negative = np.signbit(values)
+    int_width = width - decimals - 1
+
+    n_digits = np.ones(len(values), dtype=np.int64)
+    for k in range(1, int_width + 1):
+        n_digits += integer >= 10 ** k
+    if np.any(n_digits + negative > int_width):
+        raise ValueError(f"고정 폭 {width}열 범위를 벗어난 값: {values[n_digits + negative > int_width][0]}")
+
+    columns = np.full((len(values), width), ord(' '), dtype=np.uint8)
+    columns[:, int_width] = ord('.')
+    for k in range(decimals):
+        columns[:, width - 1 - k] = ord('0') + (fraction // 10 ** k) % 10
+    for k in range(int_width):
+        show = n_digits > k
+        columns[show, int_width - 1 - k] = ord('0') + (integer[show] // 10 ** k) % 10
+    rows = np.flatnonzero(negative)
+    columns[rows, int_width - 1 - n_digits[rows]] = ord('-')
+    return columns
+
+
+def point_arrays(points):
+    """
+    표면 점 → (좌표 (N, 3) float64, 색상 이름 (N,) object) 배열
+
+    Parameters
+    ----------
+    points : QptPlot, tuple or list of dict
+        QptPlot (.qpt / hole_surface 결과), (좌표, 색상 이름) 튜플, 또는
+        점 딕셔너리 리스트 ({'coords': (x, y, z), 'color': str})
+    """
+    if isinstance(points, QptPlot):
+        return np.asarray(points.dots, dtype=np.float64).reshape(-1, 3), QptPlot.colour_names(points.dot_colour)
+    if isinstance(points, tuple):
+        coords, colors = points
+        return np.asarray(coords, dtype=np.float64).reshape(-1, 3), np.asarray(colors, dtype=object)
+    coords = np.array([point['coords'] for point in points], dtype=np.float64).reshape(-1, 3)
+    colors = np.array([point['color'] or '' for point in points], dtype=object)
+    return coords, colors
+
+
+def write_pore_points(points_file, coords, colors):
+    """
+    표면 점 바이너리 사이드카 저장 (.npz: coords (N, 3) float32, colour (N,) uint8, colour_names)
+
+    텍스트 PDB를 파싱하지 않고 np.load 한 번으로 좌표/색상을 읽을 수 있습니다 (read_pore_points).
+    """
+    names, colour = np.unique(np.asarray(colors, dtype=str), return_inverse=True)
+    tmp_file = Path(points_file).with_name(f".{Path(points_file).stem}.tmp.npz")
+    np.savez(tmp_file, coords=np.asarray(coords, dtype=np.float32), colour=colour.astype(np.uint8),
+             colour_names=names)
+    tmp_file.replace(points_file)
+    return str(points_file)
+
+
+def read_pore_points(points_file):
+    """
+    표면 점 바이너리 사이드카 읽기
+
+    Returns
+    -------
+    tuple
+        (좌표 (N, 3) float32, 색상 이름 (N,) str 배열)
+    """
+    with np.load(points_file) as data:
+        return data['coords'], data['colour_names'][data['colour']]
+
+
+def create_pdb_from_points(points, output_pdb, points_file=None):
     """
     추출한 점들을 PDB 파일로 저장
 
+    모든 ATOM 레코드를 NumPy 바이트 행렬로 한 번에 만들어 한 번에 씁니다.
+    일련번호(5열) / residue 번호(4열)가 넘치면 hybrid-36으로 표기합니다.
+
     Parameters
     ----------
-    points : list of dict
-        점 정보
+    points : QptPlot, tuple or list of dict
+        표면 점 (point_arrays 참고)
     output_pdb : str
         출력 PDB 파일
+    points_file : str, optional
+        같은 점을 바이너리 사이드카(.npz)로도 저장 (write_pore_points)
+
+    Returns
+    -------
+    dict
+        색상별 점 개수 {색상 이름: 개수}
     """
-    with open(output_pdb, 'w') as f:
-        # 헤더
-        f.write("REMARK   Generated by hole_pymol.py\n")
-        f.write("REMARK   Using HOLE sph_process (official tool)\n")
-        f.write("REMARK   All atoms are independent (no CONECT records)\n")
-        f.write("REMARK   Color scheme (HOLE standard):\n")
-        f.write("REMARK     RED    - radius < 1.15 A (too narrow)\n")
-        f.write("REMARK     GREEN  - radius 1.15-2.30 A (single water)\n")
-        f.write("REMARK     BLUE   - radius > 2.30 A (multiple waters)\n")
-        f.write("REMARK     YELLOW - channel center line\n")
-
-        atom_num = 1
-        for point in points:
-            x, y, z = point['coords']
-            color = point['color']
-
-            # 색상별 residue 이름만 사용 (chain은 P로 통일)
-            if color == 'red':
-                resname = 'POR'
-            elif color == 'green':
-                resname = 'POG'
-            elif color == 'blue':
-                resname = 'POB'
-            elif color == 'yellow':
-                resname = 'CEN'
-            else:
-                resname = 'UNK'
-
-            # ATOM 레코드 - 각 원자마다 다른 residue 번호 사용
-            # chain P, residue 번호 = atom 번호 (각각 독립적)
-            f.write(f"ATOM  {atom_num:5d} 10PS {resname} P{atom_num:4d}    "
-                   f"{x:8.3f}{y:8.3f}{z:8.3f}  0.00  0.00      PSDOPS  \n")
-
-            atom_num += 1
-
-        f.write("END\n")
+    coords, colors = point_arrays(points)
+    n = len(coords)
+    names, inverse, counts = np.unique(colors.astype(str), return_inverse=True, return_counts=True)
+
+    # 색상별 residue 이름만 사용 (chain은 P로 통일), residue 번호 = atom 번호 (각각 독립적)
+    resnames = np.frombuffer(''.join(PORE_RESNAMES.get(name, PORE_RESNAME_DEFAULT) for name in names).encode(),
+                             dtype=np.uint8).reshape(-1, 3)
+    serial = np.arange(1, n + 1)
+    records = np.tile(np.frombuffer(PORE_ATOM_TEMPLATE, dtype=np.uint8), (n, 1))
+    records[:, 6:11] = hybrid36_columns(serial, 5)
+    records[:, 17:20] = resnames[inverse.reshape(-1)]
+    records[:, 22:26] = hybrid36_columns(serial, 4)
+    for axis in range(3):
+        records[:, 30 + 8 * axis:38 + 8 * axis] = fixed_float_columns(coords[:, axis])
+
+    with open(output_pdb, 'wb') as f:
+        f.write(PORE_PDB_HEADER.encode() + records.tobytes() + b"END\n")
+    if points_file:
+        write_pore_points(points_file, coords, colors)
 
     # 통계
-    colors_count = {}
-    for point in points:
-        color = point['color']
-        colors_count[color] = colors_count.get(color, 0) + 1
-
+    colors_count = dict(zip(names.tolist(), counts.tolist()))
     print(f"✓ PDB 파일 생성: {output_pdb}")
-    print(f"   총 {atom_num-1}개 원자")
+    print(f"   총 {n}개 원자")
+    if points_file:
+        print(f"   바이너리 사이드카: {points_file}")
     print(f"\n색상 분포:")
     for color in ['red', 'green', 'blue', 'yellow']:
         if color in colors_count:
             count = colors_count[color]
-            pct = count / len(points) * 100
+            pct = count / n * 100
             print(f"  {color:8s}: {count:5d} ({pct:5.1f}%)")
+    return colors_count
+
 
+# 개별 sphere 스크립트 모드: 'cgo' (CGO sphere 목록 객체 하나) 또는 'atoms' (원자 객체 하나)
+SPHERE_SCRIPT_MODES = ('cgo', 'atoms')
 
-def create_pymol_script_individual(points, protein_pdb, output_script, sphere_radius=0.3):
-    """PyMOL 스크립트 생성 (각 점을 개별 객체로)"""
+# 표면 점 색상 순서 (CGO 색상 번호, PyMOL 색상 이름)
+SPHERE_COLORS = ('red', 'green', 'blue', 'yellow', 'gray')
 
-    script = f"""# PyMOL Visualization Script (Individual Spheres)
+# PyMOL pseudoatom 기본 vdw 반경 (Å) - sphere 크기 = sphere_scale × vdw (기존 pseudoatom 스크립트와 같은 크기)
+PSEUDOATOM_VDW = 0.5
+
+
+def create_pymol_script_individual(points, protein_pdb, output_script, sphere_radius=0.3,
+                                   mode='cgo', points_file=None, pore_pdb=None):
+    """
+    PyMOL Python 스크립트 생성 (각 점을 sphere로, 점 전체가 객체 하나)
+
+    점마다 pseudoatom 객체를 만들지 않으므로 스크립트 크기와 로드/렌더링 시간이
+    객체 수가 아니라 점 수에 비례합니다.
+
+    Parameters
+    ----------
+    points : QptPlot, tuple or list of dict
+        표면 점 (point_arrays 참고)
+    protein_pdb : str
+        단백질 PDB
+    output_script : str
+        출력 스크립트 (PyMOL `run`으로 실행하는 Python 파일)
+    sphere_radius : float
+        sphere 크기 배율 (PyMOL sphere_scale) - 실제 반경은 sphere_radius × PSEUDOATOM_VDW
+        (기본 0.3 → 0.15 Å, 기존 pseudoatom 스크립트와 같은 크기)
+    mode : str
+        'cgo' - 색상 + sphere CGO 목록을 NumPy로 만들어 cmd.load_cgo 한 번 (가장 가벼움)
+        'atoms' - 기공 PDB를 원자 객체 하나로 로드하고 resn별 색상 / vdw / sphere_scale 일괄 지정
+        (선택, 숨기기 등 원자 선택 명령 사용 가능)
+    points_file : str, optional
+        'cgo': 표면 점 바이너리 사이드카 (write_pore_points) - 주면 스크립트가 np.load로 읽고,
+        없으면 좌표 / 색상 번호를 스크립트에 배열로 기록
+    pore_pdb : str, optional
+        'atoms': 기공 표면 PDB (없으면 {스크립트 이름}_points.pdb로 생성)
+    """
+    if mode not in SPHERE_SCRIPT_MODES:
+        raise ValueError(f"알 수 없는 sphere 스크립트 방식: {mode} (가능: {', '.join(SPHERE_SCRIPT_MODES)})")
+
+    coords, colors = point_arrays(points)
+    protein_pdb_abs = str(Path(protein_pdb).resolve())
+    script = f"""# PyMOL Visualization Script (Individual Spheres, single object: {mode})
 # Generated by hole_pymol.py (using official HOLE sph_process)
+# 실행: pymol {Path(output_script).name}  또는 PyMOL에서 run {Path(output_script).name}
 
 from pymol import cmd
 
 # 1. 단백질 로드
-cmd.load("{protein_pdb}", "protein")
+cmd.load("{protein_pdb_abs}", "protein")
 
 # 2. 단백질 표현
 cmd.hide("everything", "protein")
@@ -335,46 +551,71 @@ cmd.show("cartoon", "protein")
 cmd.color("grey70", "protein")
 cmd.set("cartoon_transparency", 0.3, "protein")
 
-# 3. 개별 sphere 생성
 """
 
-    # 색상 매핑
-    color_map = {
-        'red': 'red',
-        'green': 'green',
-        'blue': 'blue',
-        'yellow': 'yellow'
-    }
-
-    # 각 점을 개별 pseudoatom으로 생성
-    for i, point in enumerate(points, 1):
-        x, y, z = point['coords']
-        color = point['color']
-        pymol_color = color_map.get(color, 'gray')
-
-        obj_name = f"pore_sphere_{i}"
-        script += f'cmd.pseudoatom("{obj_name}", pos=({x:.3f}, {y:.3f}, {z:.3f}))\n'
-        script += f'cmd.show("spheres", "{obj_name}")\n'
-        script += f'cmd.set("sphere_scale", {sphere_radius}, "{obj_name}")\n'
-        script += f'cmd.color("{pymol_color}", "{obj_name}")\n\n'
-
-    # 그룹화 및 추가 설정
-    script += f"""
-# 4. 모든 sphere를 하나의 그룹으로
-cmd.group("pore_spheres", "pore_sphere_*")
+    if mode == 'cgo':
+        if points_file:
+            data = f"""with np.load("{Path(points_file).resolve()}") as data:
+    coords = data['coords'].astype(float)
+    names = [str(name) for name in data['colour_names']]
+    colour = np.array([SPHERE_COLORS.index(name) if name in SPHERE_COLORS else len(SPHERE_COLORS) - 1
+                       for name in names])[data['colour']]
+"""
+        else:
+            index = {name: i for i, name in enumerate(SPHERE_COLORS)}
+            colour = np.array([index.get(name, len(SPHERE_COLORS) - 1) for name in colors.tolist()], dtype=int)
+            data = (f"coords = np.array([{','.join(f'{v:.3f}' for v in coords.ravel().tolist())}]).reshape(-1, 3)\n"
+                    f"colour = np.array([{','.join(map(str, colour.tolist()))}], dtype=int)\n")
+        script += f"""# 3. 표면 점 전체를 CGO sphere 객체 하나로 ([COLOR, r, g, b, SPHERE, x, y, z, 반경] × 점)
+import numpy as np
+from pymol.cgo import COLOR, SPHERE
+
+SPHERE_COLORS = {SPHERE_COLORS!r}
+{data}
+rgb = np.array([cmd.get_color_tuple(name) for name in SPHERE_COLORS])
+cgo = np.empty((len(coords), 9))
+cgo[:, 0] = COLOR
+cgo[:, 1:4] = rgb[colour]
+cgo[:, 4] = SPHERE
+cgo[:, 5:8] = coords
+cgo[:, 8] = {sphere_radius * PSEUDOATOM_VDW:g}  # sphere 반경 (Å) = sphere_scale {sphere_radius} × vdw {PSEUDOATOM_VDW}
+cmd.load_cgo(cgo.ravel().tolist(), "pore_spheres")
+"""
+        commands = """print("  cmd.disable('pore_spheres')  # 모든 sphere 숨기기")
+print("  cmd.enable('pore_spheres')   # 모든 sphere 표시")
+print("  cmd.set('cgo_sphere_quality', 2)  # sphere 품질")
+print("  (CGO sphere 크기는 sphere_scale로 바뀌지 않음 - sphere_radius를 바꿔 스크립트를 다시 생성)")"""
+    else:
+        if pore_pdb is None:
+            pore_pdb = Path(output_script).with_name(f"{Path(output_script).stem}_points.pdb")
+            create_pdb_from_points((coords, colors), pore_pdb)
+        colour_lines = ''.join(f'cmd.color("{color}", "pore_spheres and resn {resname}")\n'
+                               for color, resname in PORE_RESNAMES.items())
+        script += f"""# 3. 표면 점 전체를 원자 객체 하나로 (resn별 색상, sphere 크기 일괄 지정)
+cmd.load("{Path(pore_pdb).resolve()}", "pore_spheres")
+cmd.hide("everything", "pore_spheres")
+cmd.show("spheres", "pore_spheres")
+cmd.alter("pore_spheres", "vdw={PSEUDOATOM_VDW}")
+cmd.set("sphere_scale", {sphere_radius}, "pore_spheres")
+cmd.color("gray", "pore_spheres")
+{colour_lines}"""
+        commands = """print("  cmd.hide('spheres', 'pore_spheres')  # 모든 sphere 숨기기")
+print("  cmd.show('spheres', 'pore_spheres')  # 모든 sphere 표시")
+print("  cmd.set('sphere_scale', 0.5, 'pore_spheres')  # 크기 조절")"""
 
-# 5. 시각화 설정
+    script += f"""
+# 4. 시각화 설정
 cmd.bg_color("white")
 cmd.set("ray_shadows", 1)
 cmd.set("antialias", 2)
 
-# 6. 뷰 조정
+# 5. 뷰 조정
 cmd.zoom("protein")
 cmd.center("protein")
 
 print("=== HOLE Visualization (Individual Spheres) ===")
-print("Protein: {protein_pdb}")
-print("Total spheres: {len(points)}")
+print("Protein: {protein_pdb_abs}")
+print("Total spheres: {len(coords)} (1 object: pore_spheres)")
 print("")
 print("Color scheme:")
 print("  RED    - Too narrow for water (< 1.15 Å)")
@@ -383,20 +624,19 @@ print("  BLUE   - Multiple water molecules (> 2.30 Å)")
 print("  YELLOW - Channel center line")
 print("")
 print("Commands:")
-print("  cmd.hide('spheres', 'pore_spheres')  # 모든 sphere 숨기기")
-print("  cmd.show('spheres', 'pore_spheres')  # 모든 sphere 표시")
-print("  cmd.set('sphere_scale', 0.5, 'pore_spheres')  # 크기 조절")
+{commands}
 """
 
     with open(output_script, 'w') as f:
         f.write(script)
 
-    print(f"✓ PyMOL 스크립트 (개별 객체): {output_script}")
-    print(f"   총 {len(points)}개 개별 sphere 생성")
+    print(f"✓ PyMOL 스크립트 (개별 sphere, 객체 1개 - {mode}): {output_script}")
+    print(f"   총 {len(coords)}개 sphere")
+    return str(output_script)
 
 
-def create_pymol_script(protein_pdb, pore_pdb, output_script, sph_file=None):
-    """PyMOL 시각화 스크립트 생성 (PDB 파일 사용 + .sph 반경 기반 색상)"""
+def create_pymol_script(protein_pdb, pore_pdb, output_script, sph_file=None, surface_quality=1):
+    """PyMOL 시각화 스크립트 생성 (PDB 파일 사용 + .sph 반경 기반 색상, surface_quality는 LOD 프리셋 값)"""
 
     # Path 객체를 절대 경로 문자열로 변환
     from pathlib import Path
@@ -461,11 +701,11 @@ color yellow, resn CEN   # 중심선
     else:
         script += "# 4. 기공 색상 (기본)\ncolor cyan, pore\n\n"
 
-    script += """# 5. 시각화 설정
+    script += f"""# 5. 시각화 설정
 set ray_shadows, 1
 set antialias, 2
 set cartoon_transparency, 0.6, protein_cartoon
-set surface_quality, 1
+set surface_quality, {surface_quality}
 
 # 6. 렌더링 순서 명시 (아래부터: Cartoon -> Surface -> Pore)
 order protein_cartoon protein_surface pore
@@ -496,38 +736,20 @@ print("  YELLOW - Center line")
     print(f"✓ PyMOL 스크립트: {output_script}")
 
 
-if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python hole_pymol.py <sph_file>")
-        sys.exit(1)
-
-    sph_file = Path(sys.argv[1])
-
-    if not sph_file.exists():
-        print(f"Error: {sph_file} not found")
-        sys.exit(1)
-
-    print("=" * 60)
-    print("HOLE to PyMOL (Official sph_process)")
-    print("=" * 60)
-    print(f"\n입력 파일: {sph_file}")
+def find_protein_pdb(sph_file):
+    """
+    .sph 파일과 같은 디렉토리에서 단백질 PDB 파일 찾기
 
-    # 출력 파일 경로
+    1. 같은 이름의 PDB 파일
+    2. _analysis, _test 등의 접미사를 제거한 이름
+    3. 디렉토리의 첫 번째 PDB 파일 (pore_surface.pdb 제외)
+    """
+    sph_file = Path(sph_file)
     work_dir = sph_file.parent
     base_name = sph_file.stem
 
-    qpt_file = work_dir / f"{base_name}_surface.qpt"
-    vmd_file = work_dir / f"{base_name}_surface.vmd_plot"
-    pore_pdb = work_dir / f"{base_name}_pore_surface.pdb"
-    pymol_script = work_dir / f"{base_name}_pymol.pml"
-
-    # 단백질 PDB 파일 찾기
-    # 1. 같은 이름의 PDB 파일
     protein_pdb = work_dir / f"{base_name}.pdb"
 
-    # 2. _analysis, _test 등의 접미사 제거
     if not protein_pdb.exists():
         for suffix in ['_analysis', '_test', '_out']:
             candidate = work_dir / f"{base_name.replace(suffix, '')}.pdb"
@@ -535,43 +757,165 @@ if __name__ == "__main__":
                 protein_pdb = candidate
                 break
 
-    # 3. work_dir에서 PDB 파일 검색
     if not protein_pdb.exists():
-        pdb_files = list(work_dir.glob("*.pdb"))
-        # pore_surface.pdb 제외
-        pdb_files = [f for f in pdb_files if 'pore_surface' not in f.name]
+        pdb_files = [f for f in work_dir.glob("*.pdb") if 'pore_surface' not in f.name]
         if pdb_files:
             protein_pdb = pdb_files[0]  # 첫 번째 PDB 사용
 
-    print("\n1. sph_process 실행 (표면 점 생성)")
-    if not run_sph_process(sph_file, qpt_file, dotden=15):
-        sys.exit(1)
+    return protein_pdb
 
-    print("\n2. qpt to VMD 변환")
-    if not convert_qpt_to_vmd(qpt_file, vmd_file):
-        sys.exit(1)
 
-    print("\n3. VMD 파일 파싱 (좌표 추출)")
-    points = parse_vmd_plot(vmd_file)
-    print(f"✓ {len(points)}개 표면 점 추출")
+def generate_pymol_files(sph_file, dotden=15, surface_engine="sph_process", sidecar=False, lod=None):
+    """
+    .sph 파일에서 기공 표면 PDB와 PyMOL 스크립트 생성
 
-    print("\n4. PDB 파일 생성")
-    create_pdb_from_points(points, pore_pdb)
+    표면 점 생성 → 표면 점 PDB → PyMOL 스크립트 순으로 실행합니다.
+    hole_runner.py에서 별도 Python 프로세스 없이 직접 호출할 수 있습니다.
 
-    print("\n5. PyMOL 스크립트 생성")
+    Parameters
+    ----------
+    sph_file : str
+        HOLE이 생성한 .sph 파일
+    dotden : int
+        표면 점 밀도 (5-30)
+    surface_engine : str
+        'sph_process' (HOLE sph_process 실행 후 .qpt 읽기) 또는
+        'numpy' (hole_surface.py로 직접 생성, 외부 실행 파일 불필요)
+        sph_process 실행 파일이 없으면 'numpy'로 대체
+    sidecar : bool
+        표면 점 바이너리 사이드카 {base}_pore_surface.npz도 저장 (read_pore_points)
+        False이면 이전 실행의 사이드카를 삭제
+    lod : str or dict, optional
+        LOD 프리셋 (hole_lod.lod_settings) - 지정하면 dotden 대신 프리셋의 점 밀도 /
+        voxel 솎아내기 / surface_quality 사용
+
+    Returns
+    -------
+    dict
+        - 'success': 성공 여부
+        - 'pore_pdb': 기공 표면 PDB 경로
+        - 'pymol_script': PyMOL 스크립트 경로 (단백질 PDB가 없으면 None)
+        - 'pore_points': 표면 점 사이드카 경로 (sidecar=True인 경우)
+        - 'num_points': 표면 점 개수 (솎아낸 뒤)
+        - 'lod': 사용한 LOD 프리셋 이름 (lod 지정 시)
+        - 'error': 실패 시 오류 메시지
+    """
+    sph_file = Path(sph_file)
+    result = {'success': False, 'pore_pdb': None, 'pymol_script': None, 'num_points': 0}
+
+    if not sph_file.exists():
+        result['error'] = f"{sph_file} not found"
+        return result
+
+    # 출력 파일 경로
+    work_dir = sph_file.parent
+    base_name = sph_file.stem
+
+    qpt_file = work_dir / f"{base_name}_surface.qpt"
+    pore_pdb = work_dir / f"{base_name}_pore_surface.pdb"
+    pymol_script = work_dir / f"{base_name}_pymol.pml"
+    points_file = work_dir / f"{base_name}_pore_surface.npz" if sidecar else None
+
+    protein_pdb = find_protein_pdb(sph_file)
+
+    if surface_engine not in SURFACE_ENGINES:
+        result['error'] = f"unknown surface engine: {surface_engine}"
+        return result
+    if surface_engine == 'sph_process' and not SPH_PROCESS.exists():
+        print(f"Warning: sph_process를 찾을 수 없어 NumPy 표면 생성 사용: {SPH_PROCESS}")
+        surface_engine = 'numpy'
+    result['surface_engine'] = surface_engine
+
+    surface_quality = 1
+    if lod is not None:
+        settings = lod_settings(lod)
+        dotden, surface_quality = settings['dotden'], settings['surface_quality']
+        result['lod'] = settings['name']
+
+    if surface_engine == 'numpy':
+        print("\n1-2. 표면 점 생성 (NumPy)")
+        with measure('surface'):
+            surface = surface_from_sph(sph_file, dotden=dotden)
+    else:
+        print("\n1. sph_process 실행 (표면 점 생성)")
+        with measure('surface'):
+            surface_ok = run_sph_process(sph_file, qpt_file, dotden=dotden)
+        if not surface_ok:
+            result['error'] = "sph_process failed"
+            return result
+
+        print("\n2. qpt 파일 읽기 (좌표 추출)")
+        try:
+            with measure('qpt'):
+                surface = read_qpt(qpt_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: qpt 파일 읽기 실패: {e}")
+            result['error'] = f"qpt read failed: {e}"
+            return result
+    # 점 딕셔너리 리스트로 바꾸지 않고 QptPlot 배열 그대로 PDB 작성
+    print(f"✓ {len(surface.dots)}개 표면 점 추출")
+    if lod is not None and settings['voxel']:
+        total = len(surface.dots)
+        with measure('decimate'):
+            surface = decimate_surface(surface, settings['voxel'])
+        print(f"✓ LOD {settings['name']}: {settings['voxel']} Å voxel 솎아내기 {total} → {len(surface.dots)}개")
+    result['num_points'] = len(surface.dots)
+
+    print("\n3. PDB 파일 생성")
+    if not sidecar:
+        # 이전 실행의 사이드카는 새로 쓰는 PDB와 점이 달라지므로 삭제 (hole_projection이 우선 사용)
+        (work_dir / f"{base_name}_pore_surface.npz").unlink(missing_ok=True)
+    with measure('pdb'):
+        create_pdb_from_points(surface, pore_pdb, points_file=points_file)
+    result['pore_pdb'] = str(pore_pdb)
+    if points_file:
+        result['pore_points'] = str(points_file)
+
+    print("\n4. PyMOL 스크립트 생성")
 
     if protein_pdb.exists():
         # .sph 파일 반경 정보를 사용한 스크립트 생성
-        create_pymol_script(protein_pdb, pore_pdb, pymol_script, sph_file=sph_file)
+        with measure('pml'):
+            create_pymol_script(protein_pdb, pore_pdb, pymol_script, sph_file=sph_file,
+                                surface_quality=surface_quality)
+        result['pymol_script'] = str(pymol_script)
     else:
         print(f"Warning: 단백질 PDB를 찾을 수 없습니다: {protein_pdb}")
 
+    result['success'] = True
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python hole_pymol.py <sph_file> [sph_process|numpy] [preview|report|publication]")
+        sys.exit(1)
+
+    sph_file = Path(sys.argv[1])
+
+    if not sph_file.exists():
+        print(f"Error: {sph_file} not found")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("HOLE to PyMOL (Official sph_process)")
+    print("=" * 60)
+    print(f"\n입력 파일: {sph_file}")
+
+    engine = sys.argv[2] if len(sys.argv) > 2 else "sph_process"
+    lod = sys.argv[3] if len(sys.argv) > 3 else None
+    files = generate_pymol_files(sph_file, dotden=15, surface_engine=engine, lod=lod)
+    if not files['success']:
+        sys.exit(1)
+
     print("\n" + "=" * 60)
     print("완료!")
     print("=" * 60)
     print(f"생성된 파일:")
-    print(f"  1. {pore_pdb}")
-    if protein_pdb.exists():
-        print(f"  2. {pymol_script}")
+    print(f"  1. {files['pore_pdb']}")
+    if files['pymol_script']:
+        print(f"  2. {files['pymol_script']}")
         print(f"\nPyMOL 실행:")
-        print(f"  pymol {pymol_script}")
+        print(f"  pymol {files['pymol_script']}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+HOLE .qpt 바이너리 파일 리더
+============================
+sph_process / HOLE이 쓰는 hydra/quanta 3D 바이너리 플롯(.qpt)을 직접 읽어
+NumPy 좌표/색상 배열로 변환 (qpt_conv + .vmd_plot 텍스트 변환 불필요)
+
+.qpt 형식 (Fortran unformatted sequential):
+  각 레코드 = [4바이트 길이(16)] + float32 4개 + [4바이트 길이(16)]
+  float32 4개 = (명령, x, y, z)
+  - 명령 1: 색상 변경 (z = quanta 색상 번호)
+  - 명령 2: 펜 이동 (move)
+  - 명령 3: 현재 위치에서 선 그리기 (draw)
+  - 명령 4: 점 (dot)
+  길이가 16이 아닌 레코드는 텍스트 레코드로 qpt_conv와 같이 무시합니다.
+
+사용 예시:
+---------
+from hole_qpt import read_qpt
+
+qpt = read_qpt("hole_surface.qpt")
+print(qpt.dots.shape, qpt.colour_names(qpt.dot_colour)[:5])
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+QPT_RECORD_BYTES = 16
+
+# qpt 명령 코드
+QPT_COLOUR = 1
+QPT_MOVE = 2
+QPT_DRAW = 3
+QPT_DOT = 4
+
+# quanta 색상 번호 → 색상 이름 (qpt_conv 변환 표와 동일, 1-14는 purple)
+QPT_COLOUR_NAMES = {
+    15: 'yellow',   # 채널 중심선
+    16: 'red',      # 좁은 반경 (< 1.15 Å)
+    17: 'green',    # 중간 반경 (1.15-2.30 Å)
+    18: 'blue',     # 넓은 반경 (> 2.30 Å)
+    19: 'purple',   # capsule 벡터
+    20: 'gray'      # spike
+}
+QPT_DEFAULT_COLOUR_NAME = 'purple'
+
+
+@dataclass
+class QptPlot:
+    """
+    .qpt 파일 내용
+
+    Attributes
+    ----------
+    qpt_file : str
+        읽은 .qpt 파일 경로
+    dots : np.ndarray
+        점 좌표 (N, 3) float32
+    dot_colour : np.ndarray
+        각 점의 quanta 색상 번호 (N,) int16
+    lines : np.ndarray
+        선분 양 끝 좌표 (M, 2, 3) float32 - [시작점, 끝점]
+    line_colour : np.ndarray
+        각 선분의 quanta 색상 번호 (M,) int16
+    """
+    qpt_file: str
+    dots: np.ndarray
+    dot_colour: np.ndarray
+    lines: np.ndarray
+    line_colour: np.ndarray
+
+    @staticmethod
+    def colour_names(colour):
+        """quanta 색상 번호 배열 → 색상 이름 배열"""
+        colour = np.asarray(colour)
+        names = np.full(colour.shape, QPT_DEFAULT_COLOUR_NAME, dtype=object)
+        for index, name in QPT_COLOUR_NAMES.items():
+            names[colour == index] = name
+        return names
+
+
+def _read_records(qpt_file):
+    """
+    .qpt 파일의 16바이트 레코드를 (N, 4) float32 배열로 읽기
+
+    모든 레코드가 16바이트이면 한 번에 변환하고,
+    텍스트 레코드가 섞여 있으면 레코드 단위로 건너뜁니다.
+    """
+    raw = np.fromfile(qpt_file, dtype=np.uint8)
+    if raw.size == 0:
+        return np.zeros((0, 4), dtype=np.float32)
+
+    # 첫 레코드 길이 표시로 엔디안 판별 (빅 엔디안 기계에서 생성된 파일 지원)
+    order = '<' if 0 < int.from_bytes(raw[:4].tobytes(), 'little') < 65536 else '>'
+    marker = np.dtype(f'{order}i4')
+    value = np.dtype(f'{order}f4')
+
+    # 빠른 경로: 고정 길이 레코드만 있는 경우
+    record_size = QPT_RECORD_BYTES + 8
+    if raw.size % record_size == 0:
+        words = raw.view(marker).reshape(-1, record_size // 4)
+        if np.all(words[:, 0] == QPT_RECORD_BYTES) and np.all(words[:, -1] == QPT_RECORD_BYTES):
+            return raw.view(value).reshape(-1, record_size // 4)[:, 1:5].astype(np.float32)
+
+    # 일반 경로: 가변 길이 레코드 (텍스트 레코드 무시)
+    records = []
+    offset = 0
+    while offset + 4 <= raw.size:
+        length = int(raw[offset:offset + 4].view(marker)[0])
+        start = offset + 4
+        end = start + length
+        if length < 0 or end + 4 > raw.size:
+            raise ValueError(f"손상된 .qpt 레코드 (offset {offset}): {qpt_file}")
+        if length == QPT_RECORD_BYTES:
+            records.append(raw[start:end].view(value))
+        offset = end + 4
+
+    if not records:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.vstack(records).astype(np.float32)
+
+
+def read_qpt(qpt_file):
+    """
+    .qpt 바이너리 파일을 읽어 점/선 좌표와 색상 배열로 변환
+
+    Parameters
+    ----------
+    qpt_file : str
+        sph_process 또는 HOLE이 생성한 .qpt 파일
+
+    Returns
+    -------
+    QptPlot
+        점 좌표 (N, 3), 점 색상 (N,), 선분 (M, 2, 3), 선분 색상 (M,)
+
+    Raises
+    ------
+    ValueError
+        레코드 구조가 손상된 경우
+
+    Examples
+    --------
+    >>> qpt = read_qpt("hole_surface.qpt")
+    >>> red = qpt.dots[qpt.dot_colour == 16]
+    """
+    records = _read_records(qpt_file)
+    code = np.rint(records[:, 0]).astype(np.int16)
+    xyz = records[:, 1:4]
+
+    # 각 레코드 시점의 현재 색상: 마지막 색상 변경 레코드의 z 값 (전진 채우기)
+    is_colour = code == QPT_COLOUR
+    colour_at = np.zeros(len(records), dtype=np.int16)
+    last = np.where(is_colour, np.arange(len(records)), -1)
+    last = np.maximum.accumulate(last) if len(records) else last
+    has_colour = last >= 0
+    colour_at[has_colour] = np.rint(records[last[has_colour], 3]).astype(np.int16)
+
+    # 점
+    is_dot = code == QPT_DOT
+    dots = xyz[is_dot]
+    dot_colour = colour_at[is_dot]
+
+    # 선분: draw 레코드의 시작점 = 직전 move/draw 레코드의 위치
+    is_pen = (code == QPT_MOVE) | (code == QPT_DRAW)
+    pen_index = np.flatnonzero(is_pen)
+    pen_code = code[pen_index]
+    draw = np.flatnonzero(pen_code[1:] == QPT_DRAW) + 1  # 첫 레코드가 draw이면 시작점이 없으므로 제외
+    lines = np.stack([xyz[pen_index[draw - 1]], xyz[pen_index[draw]]], axis=1) if draw.size \
+        else np.zeros((0, 2, 3), dtype=np.float32)
+    line_colour = colour_at[pen_index[draw]]
+
+    return QptPlot(
+        qpt_file=str(qpt_file),
+        dots=dots,
+        dot_colour=dot_colour,
+        lines=lines,
+        line_colour=line_colour
+    )
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+HOLE PyMOL 렌더링 엔진
+=====================
+hole_pymol.py가 생성한 PyMOL 스크립트(.pml)를 레이어별 PNG로 렌더링
+
+세 가지 엔진을 지원합니다:
+- 'inprocess': pymol2.PyMOL 인스턴스를 프로세스 안에서 재사용 (구조 로드 1회, 레이어 연속 렌더링)
+- 'subprocess': 레이어마다 `pymol -c` 프로세스를 동시에 실행 (PyMOL 모듈이 없을 때 대체 경로)
+- 'projection': PyMOL 없이 CA trace + 기공 표면 점을 NumPy로 투영 (hole_projection.py)
+  'auto'에서 pymol 명령이 없거나 시간 초과 / 레이어를 만들지 못하면 이 엔진으로 대체
+
+render_layer_images는 레이어를 작업 디렉토리에 쓰지 않고 RGBA 배열로 넘기며
+(PyMOL 엔진은 공유 메모리 /dev/shm 임시 디렉토리 경유, projection은 파일 없음),
+composite_layers / save_image로 메모리에서 합성하여 최종 이미지만 PNG / WebP / JPEG로 저장합니다.
+
+사용 예시:
+---------
+from hole_render import render_layers, render_layer_images, composite_layers, save_image
+
+outputs = {'surface_pore': 'surface.png', 'cartoon': 'cartoon.png'}
+render_layers("analysis_pymol.pml", outputs, work_dir="output")
+
+images, engine = render_layer_images("analysis_pymol.pml", work_dir="output")
+save_image(composite_layers(images), "output/analysis_visualization.webp", image_format='webp')
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from hole_metrics import MeasuredPopen
+from hole_projection import render_projection, projection_layers
+
+try:
+    import pymol2
+    HAS_PYMOL_MODULE = True
+except ImportError:
+    pymol2 = None
+    HAS_PYMOL_MODULE = False
+
+
+RENDER_ENGINES = ('auto', 'inprocess', 'subprocess', 'projection')
+
+# 최종 이미지 형식: PIL 형식 이름, 확장자
+IMAGE_FORMATS = {'png': ('PNG', '.png'), 'webp': ('WEBP', '.webp'), 'jpeg': ('JPEG', '.jpg')}
+PNG_COMPRESS_LEVEL = 6      # zlib 0-9 (PIL 기본값과 같음)
+IMAGE_QUALITY = 85          # WebP / JPEG 품질 1-100
+
+# PyMOL 레이어 PNG를 넘겨받을 임시 디렉토리 위치 (메모리 파일 시스템, 없으면 시스템 임시 디렉토리)
+SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+# 렌더링 카메라 (Z축 수직: +Z=아래, -Z=위)
+PYMOL_VIEW = (1.000, 0.000, 0.000, 0.000, 0.000, -1.000, 0.000, 1.000, 0.000,
+              0.000, 0.000, 0.000, 0.000, 0.000, 0.000, -100.0, 100.0, -20.0)
+PYMOL_VIEW_MATRIX = "set_view (" + ", ".join(f"{v:.3f}" if abs(v) < 10 else f"{v:.1f}"
+                                              for v in PYMOL_VIEW) + ")"
+
+# 레이어 정의 (렌더링 순서대로): 이름, 숨길 표현, 보일 표현, 설정
+# - surface_pore: 단백질 Surface + 기공 Surface (불투명 배경)
+# - cartoon: 단백질 Cartoon만 (투명 배경) - surface_pore 위에 합성
+RENDER_LAYERS = [
+    {
+        'name': 'surface_pore',
+        'hide': [('everything', 'protein_cartoon'), ('spheres', 'pore')],
+        'show': [('surface', 'pore')],
+        'set': [('surface_quality', 1, 'pore'), ('transparency', 0.6, 'protein_surface')]
+    },
+    {
+        'name': 'cartoon',
+        'hide': [('everything', 'protein_surface'), ('everything', 'pore')],
+        'show': [],
+        'set': [('ray_opaque_background', 0, None), ('transparency', 0.4, 'protein_cartoon'),
+                ('cartoon_transparency', 0.4, 'protein_cartoon')]
+    }
+]
+
+
+def _layer_settings(layer, surface_quality=1):
+    """레이어 set 목록 (surface_quality는 LOD 프리셋 값으로 교체)"""
+    return [(name, surface_quality if name == 'surface_quality' else value, selection)
+            for name, value, selection in layer['set']]
+
+
+def _layer_command_list(layer, png_file, width, height, dpi, surface_quality=1):
+    """레이어 정의를 PyMOL 명령 문자열 리스트로 변환"""
+    commands = [f"hide {rep}, {selection}" for rep, selection in layer['hide']]
+    commands += [f"show {rep}, {selection}" for rep, selection in layer['show']]
+    for name, value, selection in _layer_settings(layer, surface_quality):
+        commands.append(f"set {name}, {value}, {selection}" if selection else f"set {name}, {value}")
+    commands += [PYMOL_VIEW_MATRIX, "zoom all, 20", f"ray {width}, {height}",
+                 f"png {png_file}, dpi={dpi}"]
+    return commands
+
+
+def pymol_layer_commands(pml_script, surface_png, cartoon_png, width=800, height=800, dpi=200,
+                         surface_quality=1):
+    """
+    레이어별 `pymol -c -d` 명령 문자열 생성 (subprocess 엔진용)
+
+    Parameters
+    ----------
+    pml_script : str
+        hole_pymol.py가 생성한 PyMOL 스크립트 (절대 경로)
+    surface_png, cartoon_png : str
+        Surface + Pore 레이어 / Cartoon 레이어 (투명 배경) 출력 PNG
+    width, height : int
+        ray 해상도
+    dpi : int
+        PNG DPI
+    surface_quality : int
+        기공 Surface 품질 (hole_lod 프리셋, 0 = 빠름)
+
+    Returns
+    -------
+    dict
+        {레이어 이름: pymol -d 명령 문자열}
+    """
+    outputs = {'surface_pore': surface_png, 'cartoon': cartoon_png}
+    return {
+        layer['name']: "; ".join([f"@{pml_script}"]
+                                 + _layer_command_list(layer, outputs[layer['name']], width, height, dpi,
+                                                       surface_quality)
+                                 + ["quit"])
+        for layer in RENDER_LAYERS
+    }
+
+
+def render_pymol_layers(layers, work_dir, timeout=180):
+    """
+    여러 PyMOL 레이어를 별도 프로세스로 동시에 렌더링 (subprocess 엔진)
+
+    각 레이어는 독립적인 `pymol -c` 프로세스로 동시에 시작되며,
+    완료는 고정 대기 없이 프로세스 종료로 판단합니다.
+
+    Parameters
+    ----------
+    layers : dict
+        {레이어 이름: pymol -d 명령 문자열} (pymol_layer_commands 참고)
+    work_dir : str
+        PyMOL 실행 디렉토리
+    timeout : float
+        전체 렌더링 제한 시간 (초)
+
+    Returns
+    -------
+    dict
+        {레이어 이름: (종료 코드, 표준 에러)}
+
+    Raises
+    ------
+    FileNotFoundError
+        pymol 명령을 찾을 수 없는 경우
+    subprocess.TimeoutExpired
+        제한 시간 초과 (실행 중인 프로세스는 모두 종료됨)
+    """
+    procs = {}
+    try:
+        for name, command in layers.items():
+            procs[name] = MeasuredPopen(
+                ['pymol', '-c', '-d', command],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=str(work_dir)
+            )
+
+        deadline = time.monotonic() + timeout
+        results = {}
+        for name, proc in procs.items():
+            remaining = max(0.0, deadline - time.monotonic())
+            _, stderr = proc.communicate(timeout=remaining)
+            results[name] = (proc.returncode, stderr)
+        return results
+
+    finally:
+        # 시간 초과/오류 시 남은 프로세스 정리
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+class PyMOLSession:
+    """
+    프로세스 안에서 재사용하는 PyMOL 렌더링 세션 (inprocess 엔진)
+
+    pymol2.PyMOL 인스턴스를 한 번 시작한 뒤 구조마다 reinitialize만 하므로
+    PyMOL 시작 비용 없이 여러 구조를 연속으로 렌더링할 수 있습니다.
+    각 구조의 .pml은 한 번만 로드하고, 레이어 사이에는 scene으로 표현 상태를 복원합니다.
+
+    Examples
+    --------
+    >>> with PyMOLSession() as session:
+    ...     for pml in pml_files:
+    ...         session.render_layers(pml, {'surface_pore': ..., 'cartoon': ...})
+    """
+
+    def __init__(self):
+        if not HAS_PYMOL_MODULE:
+            raise ImportError("pymol2 모듈을 찾을 수 없습니다 (conda install -c conda-forge pymol-open-source)")
+        self._pymol = pymol2.PyMOL()
+        self._pymol.start()
+        self.cmd = self._pymol.cmd
+
+    def close(self):
+        """PyMOL 인스턴스 종료"""
+        if self._pymol is not None:
+            self._pymol.stop()
+            self._pymol = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def render_layers(self, pml_script, outputs, width=800, height=800, dpi=200, surface_quality=1):
+        """
+        하나의 구조를 로드하여 RENDER_LAYERS 순서대로 PNG 렌더링
+
+        Parameters
+        ----------
+        pml_script : str
+            hole_pymol.py가 생성한 PyMOL 스크립트
+        outputs : dict
+            {레이어 이름: 출력 PNG 경로} - 지정한 레이어만 렌더링
+        width, height : int
+            ray 해상도
+        dpi : int
+            PNG DPI
+        surface_quality : int
+            기공 Surface 품질 (hole_lod 프리셋)
+
+        Returns
+        -------
+        dict
+            {레이어 이름: 출력 PNG 경로}
+        """
+        cmd = self.cmd
+        cmd.reinitialize()
+        cmd.do(f"@{Path(pml_script).resolve()}")
+        cmd.scene('hole_base', 'store')
+
+        rendered = {}
+        for layer in RENDER_LAYERS:
+            if layer['name'] not in outputs:
+                continue
+
+            cmd.scene('hole_base', 'recall', animate=0)
+            for rep, selection in layer['hide']:
+                cmd.hide(rep, selection)
+            for rep, selection in layer['show']:
+                cmd.show(rep, selection)
+            for name, value, selection in _layer_settings(layer, surface_quality):
+                if selection:
+                    cmd.set(name, value, selection)
+                else:
+                    cmd.set(name, value)
+
+            cmd.set_view(PYMOL_VIEW)
+            cmd.zoom('all', 20)
+            cmd.ray(width, height)
+            cmd.png(str(outputs[layer['name']]), dpi=dpi)
+            rendered[layer['name']] = str(outputs[layer['name']])
+
+        cmd.delete('all')
+        return rendered
+
+
+# 프로세스별 재사용 세션 (배치 워커에서 구조 간 공유)
+# 비동기 파이프라인(run_batch_async)에서는 여러 스레드가 세션 하나를 번갈아 사용
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session():
+    """현재 프로세스의 PyMOLSession (처음 호출 시 생성)"""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = PyMOLSession()
+    return _SESSION
+
+
+def render_layers(pml_script, outputs, work_dir=".", engine="auto",
+                  width=800, height=800, dpi=200, timeout=180, surface_quality=1):
+    """
+    레이어별 PNG 렌더링 (엔진 자동 선택)
+
+    Parameters
+    ----------
+    pml_script : str
+        hole_pymol.py가 생성한 PyMOL 스크립트
+    outputs : dict
+        {'surface_pore': PNG 경로, 'cartoon': PNG 경로}
+    work_dir : str
+        PyMOL 실행 디렉토리 (subprocess 엔진)
+    engine : str
+        'auto' (pymol2 모듈이 있으면 inprocess, 실패 시 subprocess, pymol 명령도 없거나
+        시간 초과 / 레이어 PNG가 없으면 projection), 'inprocess', 'subprocess' 또는 'projection'
+    width, height, dpi : int
+        렌더링 해상도 / PNG DPI
+    timeout : float
+        subprocess 엔진 제한 시간 (초)
+    surface_quality : int
+        기공 Surface 품질 (hole_lod 프리셋, 기본 1)
+
+    Returns
+    -------
+    str
+        실제 사용한 엔진 ('inprocess', 'subprocess' 또는 'projection')
+
+    Raises
+    ------
+    ValueError
+        알 수 없는 엔진 이름
+    FileNotFoundError
+        subprocess 엔진에서 pymol 명령을 찾을 수 없는 경우
+    subprocess.TimeoutExpired
+        subprocess 엔진 제한 시간 초과
+    """
+    if engine not in RENDER_ENGINES:
+        raise ValueError(f"알 수 없는 렌더링 엔진: {engine} (가능: {', '.join(RENDER_ENGINES)})")
+
+    pml_script = Path(pml_script).resolve()
+
+    used = 'projection'
+    if engine != 'projection':
+        used = _render_pymol(pml_script, outputs, work_dir, engine, width, height, dpi, timeout, surface_quality)
+    if used == 'projection':
+        render_projection(pml_script, outputs, width=width, height=height, dpi=dpi)
+    return used
+
+
+def _render_pymol(pml_script, outputs, work_dir, engine, width, height, dpi, timeout, surface_quality):
+    """
+    PyMOL 엔진으로 레이어 PNG 렌더링 (render_layers 참고)
+
+    Returns
+    -------
+    str
+        사용한 엔진 - 'projection'이면 auto 대체가 필요하다는 뜻 (PNG를 쓰지 않음)
+    """
+    if engine in ('auto', 'inprocess') and (HAS_PYMOL_MODULE or engine == 'inprocess'):
+        try:
+            with _SESSION_LOCK:
+                get_session().render_layers(pml_script, outputs, width=width, height=height, dpi=dpi,
+                                            surface_quality=surface_quality)
+            return 'inprocess'
+        except Exception as e:
+            if engine == 'inprocess':
+                raise
+            print(f"  Warning: in-process PyMOL 렌더링 실패, pymol 프로세스로 재시도: {e}")
+
+    layers = pymol_layer_commands(pml_script, outputs.get('surface_pore'), outputs.get('cartoon'),
+                                  width=width, height=height, dpi=dpi, surface_quality=surface_quality)
+    try:
+        render_pymol_layers({name: layers[name] for name in outputs}, work_dir, timeout=timeout)
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        if engine != 'auto':
+            raise
+        reason = "pymol 명령 없음" if isinstance(e, FileNotFoundError) else f"시간 초과 (>{timeout:.0f}초)"
+        print(f"  Warning: PyMOL 렌더링 불가 ({reason}), NumPy 투영 렌더링으로 대체")
+        return 'projection'
+
+    missing = [name for name, path in outputs.items()
+               if not Path(path).exists() or Path(path).stat().st_size == 0]
+    if missing and engine == 'auto':
+        print(f"  Warning: PyMOL 레이어 생성 실패 ({', '.join(missing)}), NumPy 투영 렌더링으로 대체")
+        return 'projection'
+    return 'subprocess'
+
+
+def render_layer_images(pml_script, names=('surface_pore', 'cartoon'), work_dir=".", engine="auto",
+                        width=800, height=800, dpi=200, timeout=180, surface_quality=1):
+    """
+    레이어를 작업 디렉토리에 쓰지 않고 RGBA 배열로 렌더링
+
+    PyMOL 엔진은 메모리 파일 시스템(SCRATCH_DIR)의 임시 디렉토리에 레이어를 쓰고 바로 읽어 지우며,
+    projection 엔진은 파일 없이 배열을 그대로 반환합니다.
+
+    Parameters
+    ----------
+    pml_script : str
+        hole_pymol.py가 생성한 PyMOL 스크립트
+    names : tuple of str
+        렌더링할 레이어 이름 (RENDER_LAYERS)
+    work_dir, engine, width, height, dpi, timeout, surface_quality
+        render_layers와 같음
+
+    Returns
+    -------
+    tuple
+        ({레이어 이름: (H, W, 4) uint8} - 만들지 못한 레이어는 빠짐, 사용한 엔진)
+    """
+    if engine not in RENDER_ENGINES:
+        raise ValueError(f"알 수 없는 렌더링 엔진: {engine} (가능: {', '.join(RENDER_ENGINES)})")
+
+    pml_script = Path(pml_script).resolve()
+
+    used = 'projection'
+    if engine != 'projection':
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory(prefix='hole_render_', dir=SCRATCH_DIR) as scratch:
+            outputs = {name: Path(scratch) / f"{name}.png" for name in names}
+            used = _render_pymol(pml_script, outputs, work_dir, engine, width, height, dpi,
+                                 timeout, surface_quality)
+            if used != 'projection':
+                images = {}
+                for name, path in outputs.items():
+                    if path.exists() and path.stat().st_size > 0:
+                        with Image.open(path) as image:
+                            images[name] = np.asarray(image.convert('RGBA'))
+                return images, used
+
+    layers = projection_layers(pml_script, width=width, height=height)
+    return {name: layers[name] for name in names}, used
+
+
+def composite_layers(images):
+    """
+    레이어 RGBA 배열을 RENDER_LAYERS 순서대로 메모리에서 alpha composite
+
+    Parameters
+    ----------
+    images : dict
+        {레이어 이름: (H, W, 4) uint8}
+
+    Returns
+    -------
+    PIL.Image.Image
+        합성된 RGBA 이미지
+    """
+    from PIL import Image
+
+    result = None
+    for layer in RENDER_LAYERS:
+        if layer['name'] not in images:
+            continue
+        image = Image.fromarray(np.ascontiguousarray(images[layer['name']]), 'RGBA')
+        result = image if result is None else Image.alpha_composite(result, image)
+    return result
+
+
+def save_image(image, output, image_format='png', dpi=200, compress_level=PNG_COMPRESS_LEVEL,
+               quality=IMAGE_QUALITY):
+    """
+    최종 이미지 인코딩 (한 번만)
+
+    Parameters
+    ----------
+    image : PIL.Image.Image
+        composite_layers 결과
+    output : str
+        출력 파일 경로
+    image_format : str
+        'png' (무손실, RGBA), 'webp' / 'jpeg' (손실, 미리보기용 RGB)
+    dpi : int
+        기록할 DPI
+    compress_level : int
+        PNG zlib 압축 수준 (0 = 가장 빠름, 9 = 가장 작음)
+    quality : int
+        WebP / JPEG 품질 (1-100)
+
+    Raises
+    ------
+    ValueError
+        알 수 없는 형식, 또는 Pillow에 WebP 지원이 없는 경우
+    """
+    from PIL import features
+
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"알 수 없는 이미지 형식: {image_format} (가능: {', '.join(IMAGE_FORMATS)})")
+    if image_format == 'webp' and not features.check('webp'):
+        raise ValueError("Pillow가 WebP를 지원하지 않습니다 (libwebp 포함 Pillow 설치 필요)")
+
+    pil_format = IMAGE_FORMATS[image_format][0]
+    if image_format == 'png':
+        image.save(output, pil_format, dpi=(dpi, dpi), compress_level=compress_level)
+    else:
+        image.convert('RGB').save(output, pil_format, dpi=(dpi, dpi), quality=quality)
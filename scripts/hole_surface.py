@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+HOLE 기공 표면 점 생성 (NumPy)
+=============================
+.sph 파일의 채널 구(sphere)로부터 점 표면을 직접 생성 (sph_process 대체 엔진)
+
+1. 각 구 표면에 dotden² 개의 점 배치 (Fibonacci 격자, sph_process와 같은 척도)
+2. 이웃 구 내부에 묻힌 점 제거 (경로상 인접 구로 먼저 거른 뒤,
+   반경 구간별 채널 축 정렬 인덱스로 남은 점의 이웃 후보 탐색)
+3. 구 반경으로 HOLE 표준 색상 분류 (red < 1.15 Å ≤ green < 2.30 Å ≤ blue)
+
+결과는 hole_qpt.read_qpt와 같은 QptPlot 형식이므로 sph_process 결과와 같은 방식으로 사용합니다.
+
+사용 예시:
+---------
+from hole_surface import surface_from_sph
+
+surface = surface_from_sph("hole.sph", dotden=15)
+print(surface.dots.shape)
+"""
+
+import numpy as np
+
+from hole_qpt import QptPlot
+
+
+# HOLE 표준 반경 구간 (sph_process -colour 기본값)
+RADIUS_LOW = 1.15
+RADIUS_MID = 2.30
+
+# quanta 색상 번호 (hole_qpt.QPT_COLOUR_NAMES)
+COLOUR_CENTRE = 15
+COLOUR_LOW = 16
+COLOUR_MID = 17
+COLOUR_HIGH = 18
+
+# 구 하나당 최소 점 개수
+MIN_DOTS_PER_SPHERE = 12
+
+# 1차 판정에 사용할 경로상 인접 구 범위 (±PATH_NEIGHBOURS)
+PATH_NEIGHBOURS = 4
+
+# 이웃 구 내부 판정 여유 (Å) - 접한 구 경계의 점은 남김
+BURIED_TOLERANCE = 1e-3
+
+# 묻힌 점 판정 시 한 번에 비교할 (점, 이웃 구) 쌍의 최대 개수 (메모리 제한)
+PAIR_CHUNK = 2_000_000
+
+_GOLDEN_ANGLE = np.pi * (3.0 - np.sqrt(5.0))
+
+
+def read_sph_spheres(sph_file):
+    """
+    .sph 파일에서 채널 구 중심/반경 배열 읽기
+
+    HOLE이 채널 밖 탐색에 사용한 구(resSeq -888)는 제외하고,
+    채널 경로 순서(resSeq 순)로 정렬합니다.
+
+    Returns
+    -------
+    centres : np.ndarray
+        구 중심 (N, 3)
+    radii : np.ndarray
+        구 반경 (N,)
+    """
+    seq = []
+    rows = []
+    with open(sph_file, 'r') as f:
+        for line in f:
+            if not line.startswith('ATOM'):
+                continue
+            try:
+                resseq = int(line[22:26])
+                row = (float(line[30:38]), float(line[38:46]), float(line[46:54]), float(line[54:60]))
+            except ValueError:
+                continue
+            if resseq == -888 or not 0 < row[3] < 50:
+                continue
+            seq.append(resseq)
+            rows.append(row)
+
+    rows = np.array(rows, dtype=float).reshape(-1, 4)
+    order = np.argsort(np.array(seq, dtype=int), kind='stable')
+    rows = rows[order]
+    return rows[:, :3], rows[:, 3]
+
+
+def sphere_dot_shells(centres, radii, dotden=15):
+    """
+    모든 구 표면에 점 배치 (반복문 없이 한 번에 생성)
+
+    sph_process와 같이 구 하나당 약 dotden² 개의 점을 반경과 무관하게 배치합니다.
+
+    Parameters
+    ----------
+    centres : np.ndarray
+        구 중심 (N, 3)
+    radii : np.ndarray
+        구 반경 (N,)
+    dotden : float
+        점 밀도 (sph_process -dotden과 같은 척도, 5-30)
+
+    Returns
+    -------
+    dots : np.ndarray
+        점 좌표 (M, 3)
+    owner : np.ndarray
+        각 점이 속한 구 번호 (M,)
+    """
+    radii = np.asarray(radii, dtype=float)
+    counts = np.full(len(radii), max(int(round(dotden ** 2)), MIN_DOTS_PER_SPHERE))
+
+    owner = np.repeat(np.arange(len(radii)), counts)
+    starts = np.cumsum(counts) - counts
+    k = np.arange(counts.sum()) - starts[owner]
+    n = counts[owner]
+
+    # Fibonacci 격자: 구 표면에 거의 균일한 점
+    z = 1.0 - (2.0 * k + 1.0) / n
+    rho = np.sqrt(1.0 - z ** 2)
+    phi = k * _GOLDEN_ANGLE
+    unit = np.column_stack([rho * np.cos(phi), rho * np.sin(phi), z])
+
+    dots = np.asarray(centres, dtype=float)[owner] + unit * radii[owner, None]
+    return dots, owner
+
+
+def _radius_buckets(centres, radii):
+    """
+    구를 반경 구간(2의 거듭제곱)별로 나누어 채널 축 방향으로 정렬한 공간 인덱스
+
+    점이 구 j 안에 있으려면 축 좌표 차이가 r_j보다 작아야 하므로,
+    구간별 최대 반경만큼의 창(window)만 확인하면 됩니다.
+    작은 구가 대부분인 좁은 채널에서 큰 구 때문에 창이 넓어지는 것을 막습니다.
+
+    Returns
+    -------
+    axis : int
+        축 번호 (좌표 범위가 가장 큰 축)
+    buckets : list of tuple
+        (구 번호 정렬 배열, 정렬된 축 좌표, 구간 최대 반경)
+    """
+    axis = int(np.argmax(np.ptp(centres, axis=0))) if len(centres) else 2
+    level = np.ceil(np.log2(np.maximum(radii, 1e-6))).astype(int)
+
+    buckets = []
+    for value in np.unique(level):
+        members = np.flatnonzero(level == value)
+        members = members[np.argsort(centres[members, axis], kind='stable')]
+        buckets.append((members, centres[members, axis], radii[members].max()))
+    return axis, buckets
+
+
+def _inside_path_neighbours(dots, owner, centres, inner_sq):
+    """경로상 인접 구(±PATH_NEIGHBOURS) 내부에 있는 점 (대부분의 묻힌 점을 빠르게 제거)"""
+    buried = np.zeros(len(dots), dtype=bool)
+    for step in range(1, PATH_NEIGHBOURS + 1):
+        for neighbour in (owner - step, owner + step):
+            valid = (neighbour >= 0) & (neighbour < len(centres))
+            index = np.flatnonzero(valid & ~buried)
+            delta = dots[index] - centres[neighbour[index]]
+            buried[index[np.einsum('ij,ij->i', delta, delta) < inner_sq[neighbour[index]]]] = True
+    return buried
+
+
+def remove_buried_dots(dots, owner, centres, radii):
+    """
+    다른 구 내부에 있는 점 제거
+
+    Parameters
+    ----------
+    dots : np.ndarray
+        점 좌표 (M, 3)
+    owner : np.ndarray
+        각 점이 속한 구 번호 (M,) - 구는 채널 경로 순서
+    centres, radii : np.ndarray
+        구 중심 (N, 3), 반경 (N,)
+
+    Returns
+    -------
+    np.ndarray
+        노출된 점이면 True인 마스크 (M,)
+    """
+    centres = np.asarray(centres, dtype=float)
+    radii = np.asarray(radii, dtype=float)
+    inner_sq = np.maximum(radii - BURIED_TOLERANCE, 0.0) ** 2
+
+    # 1차: 경로상 인접 구
+    buried = _inside_path_neighbours(dots, owner, centres, inner_sq)
+
+    # 2차: 남은 점을 반경 구간별로 축 방향 ±구간 최대 반경 안의 구와 비교
+    axis, buckets = _radius_buckets(centres, radii)
+    remaining = np.flatnonzero(~buried)
+    dot_key = dots[remaining, axis]
+
+    for members, sorted_key, bucket_radius in buckets:
+        lo = np.searchsorted(sorted_key, dot_key - bucket_radius, side='left')
+        candidates = np.searchsorted(sorted_key, dot_key + bucket_radius, side='right') - lo
+
+        # (점, 이웃 후보) 쌍이 PAIR_CHUNK를 넘지 않도록 점을 나누어 처리
+        bounds = np.searchsorted(np.cumsum(candidates), np.arange(PAIR_CHUNK, candidates.sum(), PAIR_CHUNK))
+        for block, start, count in zip(np.split(remaining, bounds), np.split(lo, bounds),
+                                       np.split(candidates, bounds)):
+            if block.size == 0:
+                continue
+            dot_index = np.repeat(block, count)
+            offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+            neighbour = members[np.repeat(start, count) + offset]
+
+            delta = dots[dot_index] - centres[neighbour]
+            inside = (np.einsum('ij,ij->i', delta, delta) < inner_sq[neighbour]) & (neighbour != owner[dot_index])
+            buried[dot_index[inside]] = True
+
+    return ~buried
+
+
+def radius_colour(radii, low=RADIUS_LOW, mid=RADIUS_MID):
+    """구 반경 → quanta 색상 번호 (red/green/blue)"""
+    radii = np.asarray(radii, dtype=float)
+    return np.where(radii < low, COLOUR_LOW,
+                    np.where(radii < mid, COLOUR_MID, COLOUR_HIGH)).astype(np.int16)
+
+
+def generate_surface(centres, radii, dotden=15, centre_line=True):
+    """
+    채널 구 배열에서 색상별 점 표면 생성
+
+    Parameters
+    ----------
+    centres : np.ndarray
+        구 중심 (N, 3) - 채널 경로 순서
+    radii : np.ndarray
+        구 반경 (N,)
+    dotden : float
+        점 밀도 (sph_process -dotden과 같은 척도)
+    centre_line : bool
+        구 중심을 잇는 중심선 선분 포함 여부 (sph_process 기본 동작)
+
+    Returns
+    -------
+    QptPlot
+        dots/dot_colour: 표면 점과 반경 색상, lines/line_colour: 중심선
+    """
+    centres = np.asarray(centres, dtype=float).reshape(-1, 3)
+    radii = np.asarray(radii, dtype=float)
+
+    dots, owner = sphere_dot_shells(centres, radii, dotden=dotden)
+    exposed = remove_buried_dots(dots, owner, centres, radii)
+    dots = dots[exposed]
+    owner = owner[exposed]
+
+    if centre_line and len(centres) > 1:
+        lines = np.stack([centres[:-1], centres[1:]], axis=1).astype(np.float32)
+    else:
+        lines = np.zeros((0, 2, 3), dtype=np.float32)
+
+    return QptPlot(
+        qpt_file='',
+        dots=dots.astype(np.float32),
+        dot_colour=radius_colour(radii)[owner],
+        lines=lines,
+        line_colour=np.full(len(lines), COLOUR_CENTRE, dtype=np.int16)
+    )
+
+
+def surface_from_sph(sph_file, dotden=15, centre_line=True):
+    """
+    .sph 파일에서 점 표면 생성 (sph_process -dotden D -colour 대체)
+
+    Parameters
+    ----------
+    sph_file : str
+        HOLE sphpdb 출력 파일
+    dotden : float
+        점 밀도
+    centre_line : bool
+        중심선 포함 여부
+
+    Returns
+    -------
+    QptPlot
+        점 표면 (qpt_file에는 .sph 경로 기록)
+    """
+    centres, radii = read_sph_spheres(sph_file)
+    surface = generate_surface(centres, radii, dotden=dotden, centre_line=centre_line)
+    surface.qpt_file = str(sph_file)
+    return surface